@@ -0,0 +1,31 @@
+"""add extracted_text_cache
+
+Revision ID: 0003_extracted_text_cache
+Revises: 524c8b2a7cd4
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0003_extracted_text_cache"
+down_revision = "524c8b2a7cd4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "extracted_text_cache",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("extractor_version", sa.String(length=64), nullable=False),
+        sa.Column("page_texts", postgresql.JSONB(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("sha256", "extractor_version"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("extracted_text_cache")
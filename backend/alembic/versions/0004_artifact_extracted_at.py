@@ -0,0 +1,28 @@
+"""add artifacts.extracted_at
+
+Revision ID: 0004_artifact_extracted_at
+Revises: 0003_extracted_text_cache
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_artifact_extracted_at"
+down_revision = "0003_extracted_text_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("artifacts", sa.Column("extracted_at", sa.DateTime(timezone=True), nullable=True))
+    # Existing summaries were built from every artifact on the verification.
+    op.execute(
+        "UPDATE artifacts SET extracted_at = now() "
+        "WHERE verification_id IN (SELECT DISTINCT verification_id FROM summary_fields)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("artifacts", "extracted_at")
@@ -0,0 +1,35 @@
+"""add metric_rollups
+
+Revision ID: 0005_metric_rollups
+Revises: 0004_artifact_extracted_at
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0005_metric_rollups"
+down_revision = "0004_artifact_extracted_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "metric_rollups",
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("metric", sa.String(length=64), nullable=False),
+        sa.Column("dimension", sa.String(length=128), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.PrimaryKeyConstraint("tenant_id", "day", "metric", "dimension"),
+    )
+    # Populate from existing history with `rebuild_metric_rollups` after upgrading.
+
+
+def downgrade() -> None:
+    op.drop_table("metric_rollups")
@@ -0,0 +1,28 @@
+"""add verifications (tenant_id, created_at, id) index
+
+Revision ID: 0006_verifications_keyset_index
+Revises: 0005_metric_rollups
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0006_verifications_keyset_index"
+down_revision = "0005_metric_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_verifications_tenant_created_id",
+            "verifications",
+            ["tenant_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_verifications_tenant_created_id", table_name="verifications")
@@ -0,0 +1,37 @@
+"""add (tenant_id, created_at, id) indexes for list endpoints
+
+Revision ID: 0007_list_keyset_indexes
+Revises: 0006_verifications_keyset_index
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0007_list_keyset_indexes"
+down_revision = "0006_verifications_keyset_index"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_cases_tenant_created_id", "cases"),
+    ("ix_intake_items_tenant_created_id", "intake_items"),
+    ("ix_prior_auth_tenant_created_id", "prior_authorizations"),
+    ("ix_referrals_tenant_created_id", "referrals"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.create_index(
+                name,
+                table,
+                ["tenant_id", "created_at", "id"],
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    for name, table in INDEXES:
+        op.drop_index(name, table_name=table)
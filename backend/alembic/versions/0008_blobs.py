@@ -0,0 +1,56 @@
+"""add content-addressed blobs
+
+Revision ID: 0008_blobs
+Revises: 0007_list_keyset_indexes
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0008_blobs"
+down_revision = "0007_list_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "blobs",
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("storage_key", sa.String(length=512), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=True),
+        sa.Column("content_type", sa.String(length=255), nullable=True),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.PrimaryKeyConstraint("tenant_id", "sha256"),
+    )
+    op.create_index("ix_artifacts_tenant_sha256", "artifacts", ["tenant_id", "sha256"])
+    # Existing duplicates keep their own objects; the earliest key becomes the
+    # shared blob and the rest are dropped as their artifacts are deleted.
+    # Connector responses are written per artifact and never share a blob.
+    op.execute(
+        """
+        INSERT INTO blobs (tenant_id, sha256, storage_key, ref_count, created_at)
+        SELECT DISTINCT ON (tenant_id, sha256)
+            tenant_id,
+            sha256,
+            storage_key,
+            count(*) OVER (PARTITION BY tenant_id, sha256),
+            created_at
+        FROM artifacts
+        WHERE storage_key IS NOT NULL AND source <> 'connector'
+        ORDER BY tenant_id, sha256, created_at
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_artifacts_tenant_sha256", table_name="artifacts")
+    op.drop_table("blobs")
@@ -0,0 +1,25 @@
+"""add artifacts.text_content_zstd
+
+Revision ID: 0009_artifact_text_zstd
+Revises: 0008_blobs
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0009_artifact_text_zstd"
+down_revision = "0008_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("artifacts", sa.Column("text_content_zstd", sa.LargeBinary(), nullable=True))
+    # Existing text is compressed in batches by the `compress_artifact_text` task.
+
+
+def downgrade() -> None:
+    # Run `compress_artifact_text` with decompress=True first or compressed text is lost.
+    op.drop_column("artifacts", "text_content_zstd")
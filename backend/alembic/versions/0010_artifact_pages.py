@@ -0,0 +1,34 @@
+"""add per-page artifact text and page offset index
+
+Revision ID: 0010_artifact_pages
+Revises: 0009_artifact_text_zstd
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0010_artifact_pages"
+down_revision = "0009_artifact_text_zstd"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("artifacts", sa.Column("page_offsets", postgresql.JSONB(), nullable=True))
+    op.create_table(
+        "artifact_pages",
+        sa.Column("artifact_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("page_number", sa.Integer(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["artifact_id"], ["artifacts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("artifact_id", "page_number"),
+    )
+    # Existing artifacts are indexed the next time extract_summary reads them.
+
+
+def downgrade() -> None:
+    op.drop_table("artifact_pages")
+    op.drop_column("artifacts", "page_offsets")
@@ -0,0 +1,33 @@
+"""record eligibility cache use on verifications
+
+Revision ID: 0011_eligibility_cache
+Revises: 0010_artifact_pages
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0011_eligibility_cache"
+down_revision = "0010_artifact_pages"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "verifications",
+        sa.Column("eligibility_fetched_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "verifications",
+        sa.Column(
+            "eligibility_from_cache", sa.Boolean(), server_default=sa.false(), nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("verifications", "eligibility_from_cache")
+    op.drop_column("verifications", "eligibility_fetched_at")
@@ -0,0 +1,69 @@
+"""add eligibility batches for bulk 270 submission
+
+Revision ID: 0012_eligibility_batches
+Revises: 0011_eligibility_cache
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0012_eligibility_batches"
+down_revision = "0011_eligibility_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "eligibility_batches",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("payer_name", sa.String(length=255), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("succeeded", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("from_cache", sa.Integer(), nullable=False),
+        sa.Column("failure_reason", sa.Text(), nullable=True),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"]),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_eligibility_batches_tenant_created_id",
+        "eligibility_batches",
+        ["tenant_id", "created_at", "id"],
+    )
+    op.add_column(
+        "verifications",
+        sa.Column("eligibility_batch_id", postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_foreign_key(
+        "fk_verifications_eligibility_batch_id",
+        "verifications",
+        "eligibility_batches",
+        ["eligibility_batch_id"],
+        ["id"],
+    )
+    op.create_index(
+        "ix_verifications_batch_status", "verifications", ["eligibility_batch_id", "status"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_verifications_batch_status", table_name="verifications")
+    op.drop_constraint(
+        "fk_verifications_eligibility_batch_id", "verifications", type_="foreignkey"
+    )
+    op.drop_column("verifications", "eligibility_batch_id")
+    op.drop_index("ix_eligibility_batches_tenant_created_id", table_name="eligibility_batches")
+    op.drop_table("eligibility_batches")
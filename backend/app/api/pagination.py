@@ -0,0 +1,243 @@
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Literal, Optional
+
+from fastapi import Depends, HTTPException, Query as QueryParam, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query, Session, load_only
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_ESTIMATE_HEADER = "X-Total-Estimate"
+PAGE_HEADERS = [NEXT_CURSOR_HEADER, TOTAL_ESTIMATE_HEADER]
+
+MAX_PAGE_SIZE = 200
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is uuid.UUID:
+        return uuid.UUID(value)
+    return value
+
+
+def encode_cursor(values: list[Any]) -> str:
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: list) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor shape")
+        return [_decode_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset_page(
+    query: Query,
+    columns: list,
+    cursor: Optional[str],
+    page_size: int,
+    descending: bool = True,
+    offset: int = 0,
+) -> tuple[list[Any], Optional[str]]:
+    """Return one page ordered by ``columns`` plus the cursor for the next one.
+
+    ``query`` must select the mapped entity first; cursor values are read from
+    it using each column's key. ``offset`` skips rows after the cursor for
+    legacy page-numbered callers. Routes validate ``page_size`` against
+    ``MAX_PAGE_SIZE``; it is clamped here as well for internal callers.
+    """
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+    key = tuple_(*columns)
+    if cursor:
+        after = tuple_(*decode_cursor(cursor, columns))
+        query = query.filter(key < after if descending else key > after)
+    ordering = [column.desc() if descending else column.asc() for column in columns]
+    query = query.order_by(*ordering)
+    if offset:
+        query = query.offset(offset)
+    rows = query.limit(page_size + 1).all()
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        entity = last[0] if isinstance(last, Row) else last
+        next_cursor = encode_cursor([getattr(entity, column.key) for column in columns])
+    return rows, next_cursor
+
+
+def estimate_count(db: Session, query: Query) -> Optional[int]:
+    """Planner row estimate for ``query``; avoids a count(*) over the tenant."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    compiled = query.statement.compile(dialect=bind.dialect)
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    return plan_rows(plan)
+
+
+def plan_rows(plan: Any) -> int:
+    """Top-level row estimate from ``EXPLAIN (FORMAT JSON)`` output.
+
+    psycopg2 returns the plan already decoded; other drivers hand back text.
+    """
+    if isinstance(plan, (str, bytes)):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def set_page_headers(
+    response: Response, next_cursor: Optional[str], total_estimate: Optional[int]
+) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total_estimate is not None:
+        response.headers[TOTAL_ESTIMATE_HEADER] = str(total_estimate)
+
+
+def parse_fields(
+    fields: Optional[str] = QueryParam(
+        default=None, description="Comma-separated subset of response fields"
+    ),
+) -> Optional[list[str]]:
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()]
+
+
+def project(
+    query: Query, model, schema: type[BaseModel], fields: Optional[list[str]], always: tuple = ()
+) -> Query:
+    """Restrict ``query`` to the columns behind ``fields`` (plus ``always``)."""
+    if fields is None:
+        return query
+    unknown = [field for field in fields if field not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+    columns = model.__table__.columns
+    return query.options(
+        load_only(*always, *[getattr(model, field) for field in fields if field in columns])
+    )
+
+
+def projected(rows: list, fields: list[str]) -> list[dict[str, Any]]:
+    return jsonable_encoder([{field: getattr(row, field) for field in fields} for row in rows])
+
+
+@dataclass
+class ListParams:
+    cursor: Optional[str]
+    page_size: int
+    descending: bool
+    fields: Optional[list[str]]
+
+    def wants(self, field: str) -> bool:
+        return self.fields is None or field in self.fields
+
+
+def list_params(
+    cursor: Optional[str] = None,
+    page_size: int = QueryParam(default=50, ge=1, le=MAX_PAGE_SIZE),
+    order: Literal["asc", "desc"] = "desc",
+    fields: Optional[list[str]] = Depends(parse_fields),
+) -> ListParams:
+    return ListParams(
+        cursor=cursor, page_size=page_size, descending=order == "desc", fields=fields
+    )
+
+
+def apply_filters(query: Query, model, **filters: Any) -> Query:
+    for name, value in filters.items():
+        if value is not None:
+            query = query.filter(getattr(model, name) == value)
+    return query
+
+
+def paginate(
+    db: Session,
+    query: Query,
+    model,
+    schema: type[BaseModel],
+    params: ListParams,
+    response: Response,
+    load_columns: tuple = (),
+):
+    """Keyset-page ``query`` on (created_at, id) and apply field projection.
+
+    Without ``fields`` the ORM rows are returned for the route's
+    response_model; with it only the named columns are loaded and a
+    JSONResponse carrying just those keys is returned.
+    """
+    query = project(
+        query, model, schema, params.fields, always=(model.created_at, *load_columns)
+    )
+    rows, next_cursor = keyset_page(
+        query, [model.created_at, model.id], params.cursor, params.page_size, params.descending
+    )
+    set_page_headers(response, next_cursor, estimate_count(db, query))
+    if params.fields is None:
+        return rows
+
+    content = projected(rows, params.fields)
+    headers = {name: response.headers[name] for name in PAGE_HEADERS if name in response.headers}
+    return JSONResponse(content=content, headers=headers)
+
+
+@dataclass
+class TextRange:
+    offset: int
+    length: int
+
+
+def text_range(
+    offset: int = QueryParam(default=0, ge=0, description="First character to return"),
+    length: int = QueryParam(
+        default=settings.text_range_max_length,
+        ge=1,
+        le=settings.text_range_max_length,
+        description="Maximum number of characters to return",
+    ),
+) -> TextRange:
+    return TextRange(offset=offset, length=length)
+
+
+def slice_text(text: str, window: TextRange) -> dict[str, Any]:
+    """One window of ``text`` plus where the next window starts, if any."""
+    chunk = text[window.offset : window.offset + window.length]
+    end = window.offset + len(chunk)
+    return {
+        "offset": window.offset,
+        "length": len(chunk),
+        "total_length": len(text),
+        "next_offset": end if end < len(text) else None,
+        "text": chunk,
+    }
@@ -8,10 +8,12 @@ from app.api.routes import (
     reports,
     metrics,
     audit,
+    files,
     cases,
     intake,
     prior_auth,
     referrals,
+    eligibility_batches,
 )
 
 api_router = APIRouter()
@@ -19,10 +21,14 @@ api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(verifications.router, prefix="/verifications", tags=["verifications"])
 api_router.include_router(artifacts.router, tags=["artifacts"])
+api_router.include_router(
+    eligibility_batches.router, prefix="/eligibility-batches", tags=["eligibility-batches"]
+)
 api_router.include_router(summary.router, prefix="/verifications", tags=["summary"])
 api_router.include_router(reports.router, prefix="/verifications", tags=["reports"])
 api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 api_router.include_router(audit.router, prefix="/audit", tags=["audit"])
+api_router.include_router(files.router, prefix="/files", tags=["files"])
 
 # New Platform Modules
 api_router.include_router(cases.router, prefix="/cases", tags=["cases"])
@@ -1,20 +1,132 @@
+import asyncio
+import time
 import uuid
+from datetime import datetime, timezone
+from pathlib import PurePosixPath
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session, undefer, undefer_group
+from starlette.concurrency import run_in_threadpool
 
 from app.api.deps import get_current_user, require_roles
+from app.api.pagination import (
+    ListParams,
+    TextRange,
+    list_params,
+    paginate,
+    slice_text,
+    text_range,
+)
+from app.api.uploads import StreamedUpload, stream_upload
+from app.core.config import settings
 from app.db.session import get_db
 from app.db import models
-from app.schemas.artifact import ArtifactOut
-from app.services import audit
-from app.services.storage import ensure_bucket_exists, generate_presigned_url, upload_bytes, upload_text
-from app.utils.hashing import sha256_bytes, sha256_text
-from app.utils.text_extraction import detect_file_type
+from app.schemas.artifact import ArtifactOut, EvidenceSnippetOut, TextSliceOut
+from app.services import audit, blobs, text_cache
+from app.services.storage import (
+    content_disposition,
+    delete_object,
+    download_bytes,
+    generate_presigned_url,
+    sign_key,
+    verify_signed_key,
+)
+from app.utils.compression import decompress_text
+from app.utils.hashing import sha256_text
+from app.utils.page_index import page_for_offset
+from app.utils.text_extraction import detect_file_type, extractor_version
+from app.workers import coalesce
 from app.workers.tasks import extract_summary
 
 router = APIRouter()
 
+DOWNLOAD_URL_SECONDS = 900
+
+# Caps uploads in flight per worker process so a burst of large files cannot
+# hold every request body in memory or queue unboundedly on the storage pool.
+_upload_slots = asyncio.Semaphore(settings.artifact_upload_concurrency)
+
+
+def _get_verification(
+    db: Session, verification_id: str, tenant_id: uuid.UUID
+) -> Optional[models.Verification]:
+    return (
+        db.query(models.Verification)
+        .filter(
+            models.Verification.id == verification_id,
+            models.Verification.tenant_id == tenant_id,
+        )
+        .first()
+    )
+
+
+def _save_artifact(
+    db: Session,
+    verification: models.Verification,
+    artifact: models.Artifact,
+    upload: Optional[StreamedUpload] = None,
+) -> models.Artifact:
+    # Runs in the threadpool: the audit row joins the artifact's transaction so
+    # nothing touches the session (or expired attributes) on the event loop.
+    verification_status = verification.status
+    duplicate_key = None
+    if upload is not None:
+        blob_key, ref_count = blobs.acquire(
+            db,
+            tenant_id=artifact.tenant_id,
+            sha256=artifact.sha256,
+            storage_key=upload.storage_key,
+            size=upload.size,
+            content_type=upload.content_type,
+        )
+        if not upload.written and ref_count == 1:
+            # The blob this upload matched was deleted before we referenced it.
+            db.rollback()
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Retry upload")
+        artifact.storage_key = blob_key
+        if upload.written and blob_key != upload.storage_key:
+            # Same content landed concurrently or was too large to check
+            # before streaming; keep the shared blob and drop this copy.
+            duplicate_key = upload.storage_key
+        if not upload.written or duplicate_key:
+            already_extracted = (
+                db.query(models.Artifact.id)
+                .filter(
+                    models.Artifact.verification_id == artifact.verification_id,
+                    models.Artifact.sha256 == artifact.sha256,
+                    models.Artifact.extracted_at.isnot(None),
+                )
+                .first()
+            )
+            if already_extracted:
+                artifact.extracted_at = datetime.now(timezone.utc)
+    db.add(artifact)
+    db.flush()
+    audit.log_event(
+        db,
+        tenant_id=artifact.tenant_id,
+        actor_type="user",
+        actor_id=artifact.created_by,
+        event_type="evidence_uploaded",
+        entity_type="artifact",
+        entity_id=artifact.id,
+        diff_json={"source": artifact.source, "verification_id": str(verification.id)},
+        sync=True,
+    )
+    db.commit()
+    db.refresh(artifact)
+    if duplicate_key:
+        delete_object(duplicate_key)
+
+    if artifact.extracted_at is None and verification_status in [
+        "blocked_needs_evidence",
+        "pending",
+        "running",
+    ]:
+        coalesce.trigger(extract_summary, str(artifact.verification_id))
+    return artifact
+
 
 @router.post("/verifications/{verification_id}/artifacts", response_model=ArtifactOut)
 async def create_artifact(
@@ -23,14 +135,8 @@ async def create_artifact(
     db: Session = Depends(get_db),
     user: models.User = Depends(require_roles("admin", "reviewer", "scheduler")),
 ) -> ArtifactOut:
-    verification = (
-        db.query(models.Verification)
-        .filter(
-            models.Verification.id == verification_id,
-            models.Verification.tenant_id == user.tenant_id,
-        )
-        .first()
-    )
+    tenant_id, user_id = user.tenant_id, user.id
+    verification = await run_in_threadpool(_get_verification, db, verification_id, tenant_id)
     if not verification:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
@@ -41,7 +147,7 @@ async def create_artifact(
         if not text_content:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing text")
         artifact = models.Artifact(
-            tenant_id=user.tenant_id,
+            tenant_id=tenant_id,
             verification_id=verification.id,
             type="text",
             source="manual_entry",
@@ -49,79 +155,156 @@ async def create_artifact(
             storage_key=None,
             text_content=text_content,
             sha256=sha256_text(text_content),
-            created_by=user.id,
+            created_by=user_id,
         )
-        db.add(artifact)
-        db.commit()
-        db.refresh(artifact)
     else:
-        form = await request.form()
-        upload_file = form.get("file")
-        if upload_file is None:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing file")
-        filename = upload_file.filename
-        file_type = detect_file_type(filename)
-        if file_type not in ["pdf", "image"]:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported file")
-        data = await upload_file.read()
-        ensure_bucket_exists()
         artifact_id = uuid.uuid4()
-        storage_key = f"artifacts/{user.tenant_id}/{verification.id}/{artifact_id}-{filename}"
-        upload_bytes(storage_key, data, content_type=upload_file.content_type)
+
+        def storage_key_for(filename: str) -> str:
+            if detect_file_type(filename) not in ["pdf", "image"]:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported file"
+                )
+            return blobs.new_storage_key(tenant_id)
+
+        async with _upload_slots:
+            upload = await stream_upload(
+                request,
+                storage_key_for,
+                existing_key_for=lambda sha256: blobs.existing_key(db, tenant_id, sha256),
+            )
         artifact = models.Artifact(
             id=artifact_id,
-            tenant_id=user.tenant_id,
+            tenant_id=tenant_id,
             verification_id=verification.id,
-            type=file_type,
+            type=detect_file_type(upload.filename),
             source="upload",
-            filename=filename,
-            storage_key=storage_key,
+            filename=upload.filename,
+            storage_key=upload.storage_key,
             text_content=None,
-            sha256=sha256_bytes(data),
-            created_by=user.id,
+            sha256=upload.sha256,
+            created_by=user_id,
         )
-        db.add(artifact)
-        db.commit()
-        db.refresh(artifact)
-
-    audit.log_event(
-        db,
-        tenant_id=user.tenant_id,
-        actor_type="user",
-        actor_id=user.id,
-        event_type="evidence_uploaded",
-        entity_type="artifact",
-        entity_id=artifact.id,
-        diff_json={"source": artifact.source, "verification_id": str(verification.id)},
-    )
 
-    if verification.status in ["blocked_needs_evidence", "pending", "running"]:
-        extract_summary.delay(str(verification.id))
+        return await run_in_threadpool(_save_artifact, db, verification, artifact, upload)
 
-    return artifact
+    return await run_in_threadpool(_save_artifact, db, verification, artifact)
 
 
 @router.get("/verifications/{verification_id}/artifacts", response_model=list[ArtifactOut])
 def list_artifacts(
     verification_id: str,
+    response: Response,
+    params: ListParams = Depends(list_params),
     db: Session = Depends(get_db),
     user: models.User = Depends(get_current_user),
 ) -> list[ArtifactOut]:
-    artifacts = (
+    # Text is deferred on the model; read it through /artifacts/{id}/text.
+    query = db.query(models.Artifact).filter(
+        models.Artifact.verification_id == verification_id,
+        models.Artifact.tenant_id == user.tenant_id,
+    )
+    return paginate(db, query, models.Artifact, ArtifactOut, params, response)
+
+
+@router.get("/artifacts/{artifact_id}/text", response_model=TextSliceOut)
+def get_artifact_text(
+    artifact_id: str,
+    window: TextRange = Depends(text_range),
+    db: Session = Depends(get_db),
+    user: models.User = Depends(get_current_user),
+) -> TextSliceOut:
+    artifact = (
+        db.query(models.Artifact)
+        .options(undefer_group("text"))
+        .filter(
+            models.Artifact.id == artifact_id,
+            models.Artifact.tenant_id == user.tenant_id,
+        )
+        .first()
+    )
+    if not artifact:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    text = artifact.text_content
+    version = extractor_version(artifact.type)
+    if text is None and version:
+        # Uploaded files: serve what the extractor cached for this content.
+        # Reads here are not extraction lookups, so they stay out of the stats.
+        pages = text_cache.lookup(db, [(artifact.sha256, version)], count=False).get(
+            (artifact.sha256, version)
+        )
+        text = "".join(pages) if pages is not None else None
+    if text is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Text not available")
+    return slice_text(text, window)
+
+
+@router.get("/artifacts/{artifact_id}/evidence", response_model=EvidenceSnippetOut)
+def get_artifact_evidence(
+    artifact_id: str,
+    span: str = Query(description="Evidence text_span as start,end"),
+    context: int = Query(default=settings.evidence_context_chars, ge=0, le=10_000),
+    db: Session = Depends(get_db),
+    user: models.User = Depends(get_current_user),
+) -> EvidenceSnippetOut:
+    try:
+        start, end = (int(part) for part in span.split(","))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid span")
+    if start < 0 or end < start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid span")
+
+    artifact = (
         db.query(models.Artifact)
+        .options(undefer(models.Artifact.page_offsets))
         .filter(
-            models.Artifact.verification_id == verification_id,
+            models.Artifact.id == artifact_id,
             models.Artifact.tenant_id == user.tenant_id,
         )
-        .order_by(models.Artifact.created_at.desc())
-        .all()
+        .first()
+    )
+    if not artifact:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if artifact.type != "text" and artifact.page_offsets is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Evidence not indexed yet"
+        )
+
+    offsets = artifact.page_offsets or [0]
+    window_start = max(0, start - context)
+    window_end = end + context
+    first = page_for_offset(offsets, window_start)
+    last = page_for_offset(offsets, max(window_start, window_end - 1))
+    if artifact.type == "text":
+        text = artifact.text_content or ""
+    else:
+        # Only the pages the window touches, usually one.
+        text = "".join(
+            page.text
+            for page in db.query(models.ArtifactPage.text)
+            .filter(
+                models.ArtifactPage.artifact_id == artifact.id,
+                models.ArtifactPage.page_number.between(first, last),
+            )
+            .order_by(models.ArtifactPage.page_number)
+        )
+    base = offsets[first - 1]
+    if end > base + len(text):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Span out of range")
+    return EvidenceSnippetOut(
+        artifact_id=artifact.id,
+        page=page_for_offset(offsets, start),
+        text_span=[start, end],
+        offset=window_start,
+        text=text[window_start - base : window_end - base],
     )
-    return artifacts
 
 
 @router.get("/artifacts/{artifact_id}/download")
 def download_artifact(
     artifact_id: str,
+    request: Request,
     db: Session = Depends(get_db),
     user: models.User = Depends(get_current_user),
 ) -> dict:
@@ -135,5 +318,88 @@ def download_artifact(
     )
     if not artifact or not artifact.storage_key:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-    url = generate_presigned_url(artifact.storage_key)
+    if artifact.storage_key.endswith(".zst"):
+        # Compressed with the trained dictionary, which only the server has;
+        # hand out a signed link to the decoded text instead of the raw object.
+        expires = int(time.time()) + DOWNLOAD_URL_SECONDS
+        url = request.url_for("read_compressed_artifact", artifact_id=str(artifact.id))
+        url = url.include_query_params(
+            expires=expires, signature=sign_key(artifact.storage_key, expires)
+        )
+        return {"download_url": str(url)}
+    url = generate_presigned_url(
+        artifact.storage_key, DOWNLOAD_URL_SECONDS, filename=artifact.filename
+    )
     return {"download_url": url}
+
+
+@router.get("/artifacts/{artifact_id}/text-file", name="read_compressed_artifact")
+def read_compressed_artifact(
+    artifact_id: str,
+    expires: int,
+    signature: str,
+    db: Session = Depends(get_db),
+) -> Response:
+    """Serve a ``.zst`` artifact object decompressed, behind the link from download_artifact."""
+    artifact = db.query(models.Artifact).filter(models.Artifact.id == artifact_id).first()
+    if not artifact or not artifact.storage_key or not artifact.storage_key.endswith(".zst"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if not verify_signed_key(artifact.storage_key, expires, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid signature")
+    text = decompress_text(download_bytes(artifact.storage_key))
+    filename = artifact.filename or PurePosixPath(artifact.storage_key).stem
+    return Response(
+        content=text,
+        media_type="text/plain; charset=utf-8",
+        headers={"Content-Disposition": content_disposition(filename)},
+    )
+
+
+@router.delete("/artifacts/{artifact_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_artifact(
+    artifact_id: str,
+    db: Session = Depends(get_db),
+    user: models.User = Depends(require_roles("admin", "reviewer")),
+) -> Response:
+    artifact = (
+        db.query(models.Artifact)
+        .filter(
+            models.Artifact.id == artifact_id,
+            models.Artifact.tenant_id == user.tenant_id,
+        )
+        .first()
+    )
+    if not artifact:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    orphaned = []
+    if artifact.storage_key and artifact.source == "connector":
+        # Connector responses are stored per artifact, not as shared blobs.
+        orphaned.append(artifact.storage_key)
+    elif artifact.storage_key:
+        blob_key = blobs.release(db, artifact.tenant_id, artifact.sha256)
+        if blob_key:
+            orphaned.append(blob_key)
+        if artifact.storage_key != blob_key and not (
+            db.query(models.Blob.sha256)
+            .filter(models.Blob.storage_key == artifact.storage_key)
+            .first()
+        ):
+            # Copy written before blobs existed; nothing else references it.
+            orphaned.append(artifact.storage_key)
+    audit.log_event(
+        db,
+        tenant_id=user.tenant_id,
+        actor_type="user",
+        actor_id=user.id,
+        event_type="evidence_deleted",
+        entity_type="artifact",
+        entity_id=artifact.id,
+        diff_json={"verification_id": str(artifact.verification_id), "sha256": artifact.sha256},
+        sync=True,
+    )
+    db.delete(artifact)
+    db.commit()
+    for key in orphaned:
+        delete_object(key)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
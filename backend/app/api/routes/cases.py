@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 from app.api.deps import require_roles, get_current_user
+from app.api.pagination import ListParams, apply_filters, list_params, paginate
 from app.db.session import get_db
 from app.db import models
 from app.schemas.case import CaseCreate, CaseOut, CaseUpdate
@@ -12,12 +13,16 @@ router = APIRouter()
 
 @router.get("/", response_model=List[CaseOut])
 def list_cases(
+    response: Response,
+    status_filter: Optional[str] = Query(default=None, alias="status"),
+    type: Optional[str] = None,
+    params: ListParams = Depends(list_params),
     db: Session = Depends(get_db),
     user: models.User = Depends(get_current_user),
 ):
-    return db.query(models.Case).filter(
-        models.Case.tenant_id == user.tenant_id
-    ).all()
+    query = db.query(models.Case).filter(models.Case.tenant_id == user.tenant_id)
+    query = apply_filters(query, models.Case, type=type, status=status_filter)
+    return paginate(db, query, models.Case, CaseOut, params, response)
 
 @router.post("/", response_model=CaseOut)
 def create_case(
@@ -0,0 +1,67 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user, require_roles
+from app.api.pagination import ListParams, apply_filters, list_params, paginate
+from app.db.session import get_db
+from app.db import models
+from app.schemas.eligibility_batch import EligibilityBatchCreateRequest, EligibilityBatchOut
+from app.services import eligibility_batches
+from app.workers.tasks import run_eligibility_batch
+
+router = APIRouter()
+
+
+@router.post("", response_model=list[EligibilityBatchOut])
+def create_eligibility_batches(
+    payload: EligibilityBatchCreateRequest,
+    db: Session = Depends(get_db),
+    user: models.User = Depends(require_roles("admin", "reviewer", "scheduler")),
+) -> list[EligibilityBatchOut]:
+    batches = eligibility_batches.create_batches(
+        db,
+        tenant_id=user.tenant_id,
+        created_by=user.id,
+        payer_name=payload.payer_name,
+        scheduled_before=payload.scheduled_before,
+        limit=payload.limit,
+    )
+    for batch in batches:
+        run_eligibility_batch.delay(str(batch.id))
+    return batches
+
+
+@router.get("", response_model=list[EligibilityBatchOut])
+def list_eligibility_batches(
+    response: Response,
+    status_filter: Optional[str] = Query(default=None, alias="status"),
+    params: ListParams = Depends(list_params),
+    db: Session = Depends(get_db),
+    user: models.User = Depends(get_current_user),
+) -> list[EligibilityBatchOut]:
+    query = db.query(models.EligibilityBatch).filter(
+        models.EligibilityBatch.tenant_id == user.tenant_id
+    )
+    query = apply_filters(query, models.EligibilityBatch, status=status_filter)
+    return paginate(db, query, models.EligibilityBatch, EligibilityBatchOut, params, response)
+
+
+@router.get("/{batch_id}", response_model=EligibilityBatchOut)
+def get_eligibility_batch(
+    batch_id: str,
+    db: Session = Depends(get_db),
+    user: models.User = Depends(get_current_user),
+) -> EligibilityBatchOut:
+    batch = (
+        db.query(models.EligibilityBatch)
+        .filter(
+            models.EligibilityBatch.id == batch_id,
+            models.EligibilityBatch.tenant_id == user.tenant_id,
+        )
+        .first()
+    )
+    if not batch:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return batch
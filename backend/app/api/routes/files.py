@@ -0,0 +1,31 @@
+import mimetypes
+from pathlib import PurePosixPath
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.services.storage import LocalBackend, get_backend, verify_signed_key
+
+router = APIRouter()
+
+
+@router.get("/{key:path}")
+def read_stored_file(
+    key: str, expires: int, signature: str, filename: Optional[str] = None
+) -> FileResponse:
+    """Serve a local-backend object behind the signed URL from ``generate_presigned_url``."""
+    backend = get_backend()
+    if not isinstance(backend, LocalBackend):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if not verify_signed_key(key, expires, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid signature")
+    path = backend.path_for(key)
+    if not path.exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    name = filename or PurePosixPath(key).name
+    return FileResponse(
+        path,
+        media_type=mimetypes.guess_type(name)[0] or "application/octet-stream",
+        filename=name,
+    )
@@ -1,45 +1,109 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from uuid import UUID
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session, selectinload
+from starlette.concurrency import run_in_threadpool
+from uuid import UUID, uuid4
+from typing import List, Optional
 
 from app.api.deps import require_roles, get_current_user
+from app.api.uploads import StreamedUpload, stream_upload
+from app.api.pagination import ListParams, apply_filters, list_params, paginate
 from app.db.session import get_db
 from app.db import models
 from app.schemas.intake import IntakeItemOut
+from app.services import blobs
+from app.services.storage import delete_object
 
 router = APIRouter()
 
 @router.get("/", response_model=List[IntakeItemOut])
 def list_intake_items(
+    response: Response,
+    status_filter: Optional[str] = Query(default=None, alias="status"),
+    source: Optional[str] = None,
+    doc_type: Optional[str] = None,
+    case_id: Optional[UUID] = None,
+    params: ListParams = Depends(list_params),
     db: Session = Depends(get_db),
     user: models.User = Depends(get_current_user),
 ):
-    return db.query(models.IntakeItem).options(
-        joinedload(models.IntakeItem.case)
-    ).filter(
-        models.IntakeItem.tenant_id == user.tenant_id
-    ).order_by(models.IntakeItem.created_at.desc()).all()
+    query = db.query(models.IntakeItem).filter(models.IntakeItem.tenant_id == user.tenant_id)
+    query = apply_filters(
+        query,
+        models.IntakeItem,
+        status=status_filter,
+        source=source,
+        doc_type=doc_type,
+        case_id=case_id,
+    )
+    load_columns: tuple = ()
+    if params.wants("verification_id"):
+        # verification_id lives in the case payload; load it for this page only.
+        query = query.options(
+            selectinload(models.IntakeItem.case).load_only(models.Case.payload)
+        )
+        load_columns = (models.IntakeItem.case_id,)
+    return paginate(
+        db, query, models.IntakeItem, IntakeItemOut, params, response, load_columns
+    )
+
+def _save_intake_item(
+    db: Session, item: models.IntakeItem, upload: Optional[StreamedUpload] = None
+) -> models.IntakeItem:
+    duplicate_key = None
+    if upload is not None:
+        blob_key, ref_count = blobs.acquire(
+            db,
+            tenant_id=item.tenant_id,
+            sha256=upload.sha256,
+            storage_key=upload.storage_key,
+            size=upload.size,
+            content_type=upload.content_type,
+        )
+        if not upload.written and ref_count == 1:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Retry upload")
+        if upload.written and blob_key != upload.storage_key:
+            duplicate_key = upload.storage_key
+        item.storage_key = blob_key
+    db.add(item)
+    db.commit()
+    db.refresh(item)
+    if duplicate_key:
+        delete_object(duplicate_key)
+    return item
+
 
 @router.post("/fax-upload", response_model=IntakeItemOut)
-def simulate_fax_upload(
-    file_name: str,
+async def simulate_fax_upload(
+    request: Request,
+    file_name: Optional[str] = None,
     source: str = "fax",
     db: Session = Depends(get_db),
     user: models.User = Depends(require_roles("admin", "reviewer")),
 ):
-    # Simulate receiving a fax and saving to intake
+    # Simulate receiving a fax and saving to intake. A multipart body with a
+    # "file" part is streamed to object storage; otherwise only the name is kept.
+    tenant_id = user.tenant_id
     new_item = models.IntakeItem(
-        tenant_id=user.tenant_id,
+        id=uuid4(),
+        tenant_id=tenant_id,
         status="pending",
         source=source,
         filename=file_name,
         created_by=user.id
     )
-    db.add(new_item)
-    db.commit()
-    db.refresh(new_item)
-    return new_item
+    upload = None
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        upload = await stream_upload(
+            request,
+            lambda filename: blobs.new_storage_key(tenant_id),
+            existing_key_for=lambda sha256: blobs.existing_key(db, tenant_id, sha256),
+        )
+        new_item.filename = file_name or upload.filename
+        new_item.sha256 = upload.sha256
+    elif not file_name:
+        raise HTTPException(status_code=400, detail="Missing file_name")
+    return await run_in_threadpool(_save_intake_item, db, new_item, upload)
 
 
 from app.workers.tasks import classify_intake_item
@@ -1,86 +1,130 @@
-from statistics import median
+from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_roles
 from app.db.session import get_db
 from app.db import models
-from app.schemas.metrics import MetricsOverview
+from app.schemas.metrics import (
+    CircuitBreakerState,
+    EligibilityCacheStats,
+    ExtractionCacheStats,
+    MetricsOverview,
+    StorageOperationStats,
+    StorageStats,
+    TaskCoalesceStats,
+)
+from app.services import eligibility_cache, metrics_rollup, storage, text_cache
+from app.workers import breaker, coalesce
+from app.workers.tasks import extract_summary
 
 router = APIRouter()
 
 
 @router.get("/overview", response_model=MetricsOverview)
 def metrics_overview(
+    date_from: Optional[date] = Query(default=None, alias="from"),
+    date_to: Optional[date] = Query(default=None, alias="to"),
     db: Session = Depends(get_db),
     user: models.User = Depends(require_roles("admin")),
 ) -> MetricsOverview:
-    verifications = (
-        db.query(models.Verification)
-        .filter(models.Verification.tenant_id == user.tenant_id)
-        .all()
-    )
-    total = len(verifications)
+    rollups = metrics_rollup.load_rollups(db, user.tenant_id, date_from, date_to)
 
-    draft_events = (
-        db.query(models.AuditEvent)
-        .filter(
-            models.AuditEvent.tenant_id == user.tenant_id,
-            models.AuditEvent.event_type == "extraction_completed",
-        )
-        .all()
-    )
-    finalize_events = (
-        db.query(models.AuditEvent)
-        .filter(
-            models.AuditEvent.tenant_id == user.tenant_id,
-            models.AuditEvent.event_type == "verification_finalized",
-        )
-        .all()
-    )
-
-    draft_times = []
-    for event in draft_events:
-        verification = next((v for v in verifications if v.id == event.entity_id), None)
-        if verification:
-            delta = event.created_at - verification.created_at
-            draft_times.append(delta.total_seconds() / 60)
-
-    finalize_times = []
-    for event in finalize_events:
-        verification = next((v for v in verifications if v.id == event.entity_id), None)
-        if verification:
-            delta = event.created_at - verification.created_at
-            finalize_times.append(delta.total_seconds() / 60)
-
-    auto_draft = len([v for v in verifications if v.status in ["draft_ready", "finalized"]])
-    needs_review = len([v for v in verifications if v.status == "needs_human_review"])
-
-    failure_events = (
-        db.query(models.AuditEvent)
-        .filter(
-            models.AuditEvent.tenant_id == user.tenant_id,
-            models.AuditEvent.event_type == "verification_failed",
-        )
-        .all()
-    )
-    failure_counts: dict[str, int] = {}
-    for event in failure_events:
-        reason = "unknown"
-        if isinstance(event.diff_json, dict):
-            reason = event.diff_json.get("reason") or reason
-        failure_counts[reason] = failure_counts.get(reason, 0) + 1
+    status_counts = {
+        status: count for status, (count, _) in rollups.get("status_entered", {}).items()
+    }
+    draft_outcomes = rollups.get("draft_outcome", {})
+    auto_draft = draft_outcomes.get("draft_ready", (0, 0.0))[0]
+    needs_review = draft_outcomes.get("needs_human_review", (0, 0.0))[0]
+    extractions = auto_draft + needs_review
 
+    failure_counts = {
+        reason: count for reason, (count, _) in rollups.get("failure_reason", {}).items()
+    }
     top_failure_reasons = [
         {"reason": reason, "count": count}
         for reason, count in sorted(failure_counts.items(), key=lambda item: item[1], reverse=True)
     ]
 
     return MetricsOverview(
-        median_time_to_draft_minutes=median(draft_times) if draft_times else None,
-        median_time_to_finalize_minutes=median(finalize_times) if finalize_times else None,
-        percent_auto_draft_success=(auto_draft / total * 100) if total else 0,
-        percent_needs_human_review=(needs_review / total * 100) if total else 0,
+        median_time_to_draft_minutes=metrics_rollup.approximate_median(
+            rollups.get("time_to_draft", {})
+        ),
+        median_time_to_finalize_minutes=metrics_rollup.approximate_median(
+            rollups.get("time_to_finalize", {})
+        ),
+        percent_auto_draft_success=(auto_draft / extractions * 100) if extractions else 0,
+        percent_needs_human_review=(needs_review / extractions * 100) if extractions else 0,
         top_failure_reasons=top_failure_reasons,
+        verifications_created=rollups.get("verifications_created", {}).get("", (0, 0.0))[0],
+        status_counts=status_counts,
+    )
+
+
+@router.get("/extraction-cache", response_model=ExtractionCacheStats)
+def extraction_cache_stats(
+    user: models.User = Depends(require_roles("admin")),
+) -> ExtractionCacheStats:
+    counts = text_cache.stats()
+    lookups = counts["hits"] + counts["misses"]
+    return ExtractionCacheStats(
+        hits=counts["hits"],
+        misses=counts["misses"],
+        hit_rate=(counts["hits"] / lookups * 100) if lookups else None,
+    )
+
+
+@router.get("/circuit-breakers", response_model=list[CircuitBreakerState])
+def circuit_breakers(
+    user: models.User = Depends(require_roles("admin")),
+) -> list[CircuitBreakerState]:
+    """Payers whose breaker is open or half-open, or that still have parked work."""
+    return [CircuitBreakerState(**entry) for entry in breaker.snapshot()]
+
+
+@router.get("/eligibility-cache", response_model=EligibilityCacheStats)
+def eligibility_cache_stats(
+    user: models.User = Depends(require_roles("admin")),
+) -> EligibilityCacheStats:
+    counts = eligibility_cache.stats()
+    lookups = counts["hits"] + counts["misses"]
+    return EligibilityCacheStats(
+        hits=counts["hits"],
+        misses=counts["misses"],
+        hit_rate=(counts["hits"] / lookups * 100) if lookups else None,
+    )
+
+
+@router.get("/task-coalescing", response_model=list[TaskCoalesceStats])
+def task_coalescing_stats(
+    user: models.User = Depends(require_roles("admin")),
+) -> list[TaskCoalesceStats]:
+    return [
+        TaskCoalesceStats(task_name=task.name, **coalesce.stats(task.name))
+        for task in [extract_summary]
+    ]
+
+
+@router.get("/storage", response_model=StorageStats)
+def storage_stats(
+    user: models.User = Depends(require_roles("admin")),
+) -> StorageStats:
+    counts = storage.stats()
+    operations = []
+    for operation, values in sorted(counts["operations"].items()):
+        calls = int(values.get("calls", 0))
+        operations.append(
+            StorageOperationStats(
+                operation=operation,
+                calls=calls,
+                errors=int(values.get("errors", 0)),
+                avg_latency_ms=(values.get("seconds", 0.0) / calls * 1000) if calls else None,
+            )
+        )
+    return StorageStats(
+        bytes_sent=counts["bytes_sent"],
+        bytes_received=counts["bytes_received"],
+        operations=operations,
     )
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 from app.api.deps import require_roles, get_current_user
+from app.api.pagination import ListParams, apply_filters, list_params, paginate
 from app.db.session import get_db
 from app.db import models
 from app.schemas.prior_auth import PriorAuthCreate, PriorAuthOut, PriorAuthUpdate
@@ -12,12 +13,20 @@ router = APIRouter()
 
 @router.get("/", response_model=List[PriorAuthOut])
 def list_prior_auths(
+    response: Response,
+    status_filter: Optional[str] = Query(default=None, alias="status"),
+    verification_id: Optional[UUID] = None,
+    params: ListParams = Depends(list_params),
     db: Session = Depends(get_db),
     user: models.User = Depends(get_current_user),
 ):
-    return db.query(models.PriorAuthorization).filter(
+    query = db.query(models.PriorAuthorization).filter(
         models.PriorAuthorization.tenant_id == user.tenant_id
-    ).all()
+    )
+    query = apply_filters(
+        query, models.PriorAuthorization, status=status_filter, verification_id=verification_id
+    )
+    return paginate(db, query, models.PriorAuthorization, PriorAuthOut, params, response)
 
 @router.post("/", response_model=PriorAuthOut)
 def create_prior_auth(
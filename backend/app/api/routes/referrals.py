@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 from app.api.deps import require_roles, get_current_user
+from app.api.pagination import ListParams, apply_filters, list_params, paginate
 from app.db.session import get_db
 from app.db import models
 from app.schemas.referral import ReferralCreate, ReferralOut, ReferralUpdate
@@ -13,12 +14,18 @@ router = APIRouter()
 
 @router.get("/", response_model=List[ReferralOut])
 def list_referrals(
+    response: Response,
+    status_filter: Optional[str] = Query(default=None, alias="status"),
+    clinical_urgency: Optional[str] = None,
+    params: ListParams = Depends(list_params),
     db: Session = Depends(get_db),
     user: models.User = Depends(get_current_user),
 ):
-    return db.query(models.Referral).filter(
-        models.Referral.tenant_id == user.tenant_id
-    ).all()
+    query = db.query(models.Referral).filter(models.Referral.tenant_id == user.tenant_id)
+    query = apply_filters(
+        query, models.Referral, status=status_filter, clinical_urgency=clinical_urgency
+    )
+    return paginate(db, query, models.Referral, ReferralOut, params, response)
 
 
 @router.post("/", response_model=ReferralOut)
@@ -1,10 +1,21 @@
+import json
+from typing import Optional
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, require_roles
+from app.api.pagination import TextRange, parse_fields, project, projected, slice_text, text_range
 from app.db.session import get_db
 from app.db import models
-from app.schemas.summary import SummaryFieldOut, SummaryFieldUpdateRequest, SummaryResponse
+from app.schemas.artifact import TextSliceOut
+from app.schemas.summary import (
+    DraftSummaryOut,
+    SummaryFieldOut,
+    SummaryFieldUpdateRequest,
+    SummaryResponse,
+)
 from app.services import audit
 
 router = APIRouter()
@@ -13,6 +24,7 @@ router = APIRouter()
 @router.get("/{verification_id}/summary", response_model=SummaryResponse)
 def get_summary(
     verification_id: str,
+    fields: Optional[list[str]] = Depends(parse_fields),
     db: Session = Depends(get_db),
     user: models.User = Depends(get_current_user),
 ) -> SummaryResponse:
@@ -27,13 +39,64 @@ def get_summary(
     if not verification:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
 
-    fields = (
-        db.query(models.SummaryField)
-        .filter(models.SummaryField.verification_id == verification_id)
-        .order_by(models.SummaryField.field_name)
+    query = db.query(models.SummaryField).filter(
+        models.SummaryField.verification_id == verification_id
+    )
+    query = project(
+        query,
+        models.SummaryField,
+        SummaryFieldOut,
+        fields,
+        always=(models.SummaryField.field_name,),
+    )
+    rows = query.order_by(models.SummaryField.field_name).all()
+    if fields is None:
+        return SummaryResponse(verification_id=verification.id, fields=rows)
+    return JSONResponse(
+        content={"verification_id": str(verification.id), "fields": projected(rows, fields)}
+    )
+
+
+@router.get("/{verification_id}/drafts", response_model=list[DraftSummaryOut])
+def list_drafts(
+    verification_id: str,
+    db: Session = Depends(get_db),
+    user: models.User = Depends(get_current_user),
+) -> list[DraftSummaryOut]:
+    # raw_llm_output_json is deferred; fetch it through the /raw endpoint.
+    return (
+        db.query(models.DraftSummary)
+        .join(models.Verification, models.Verification.id == models.DraftSummary.verification_id)
+        .filter(
+            models.DraftSummary.verification_id == verification_id,
+            models.Verification.tenant_id == user.tenant_id,
+        )
+        .order_by(models.DraftSummary.created_at.desc())
         .all()
     )
-    return SummaryResponse(verification_id=verification.id, fields=fields)
+
+
+@router.get("/{verification_id}/drafts/{draft_id}/raw", response_model=TextSliceOut)
+def get_draft_raw_output(
+    verification_id: str,
+    draft_id: str,
+    window: TextRange = Depends(text_range),
+    db: Session = Depends(get_db),
+    user: models.User = Depends(get_current_user),
+) -> TextSliceOut:
+    raw = (
+        db.query(models.DraftSummary.raw_llm_output_json)
+        .join(models.Verification, models.Verification.id == models.DraftSummary.verification_id)
+        .filter(
+            models.DraftSummary.id == draft_id,
+            models.DraftSummary.verification_id == verification_id,
+            models.Verification.tenant_id == user.tenant_id,
+        )
+        .first()
+    )
+    if not raw:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    return slice_text(json.dumps(raw[0], indent=2), window)
 
 
 @router.patch("/{verification_id}/summary/fields/{field_name}", response_model=SummaryFieldOut)
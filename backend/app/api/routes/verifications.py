@@ -1,20 +1,23 @@
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, require_roles
+from app.api.pagination import MAX_PAGE_SIZE, estimate_count, keyset_page, set_page_headers
+from app.core.config import settings
 from app.db.session import get_db
 from app.db import models
 from app.schemas.verification import (
+    VerificationBatchExtractRequest,
     VerificationCreateRequest,
     VerificationListItem,
     VerificationOut,
     VerificationUpdateRequest,
 )
-from app.services import audit
-from app.workers.tasks import run_verification
+from app.services import audit, eligibility_batches
+from app.workers.tasks import extract_summary_batch, run_verification
 
 router = APIRouter()
 
@@ -74,35 +77,47 @@ def create_verification(
 
 @router.get("", response_model=list[VerificationListItem])
 def list_verifications(
+    response: Response,
     status_filter: Optional[str] = Query(default=None, alias="status"),
     payer_name: Optional[str] = None,
     date_from: Optional[datetime] = Query(default=None, alias="from"),
     date_to: Optional[datetime] = Query(default=None, alias="to"),
-    page: int = 1,
-    page_size: int = 25,
+    cursor: Optional[str] = None,
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=25, ge=1, le=MAX_PAGE_SIZE),
     db: Session = Depends(get_db),
     user: models.User = Depends(get_current_user),
 ) -> list[VerificationListItem]:
-    query = (
-        db.query(models.Verification, models.PatientInfo)
-        .outerjoin(models.PatientInfo, models.PatientInfo.verification_id == models.Verification.id)
-        .filter(models.Verification.tenant_id == user.tenant_id)
+    filtered = db.query(models.Verification.id).filter(
+        models.Verification.tenant_id == user.tenant_id
     )
     if status_filter:
-        query = query.filter(models.Verification.status == status_filter)
+        filtered = filtered.filter(models.Verification.status == status_filter)
     if payer_name:
-        query = query.filter(models.Verification.payer_name.ilike(f"%{payer_name}%"))
+        filtered = filtered.filter(models.Verification.payer_name.ilike(f"%{payer_name}%"))
     if date_from:
-        query = query.filter(models.Verification.created_at >= date_from)
+        filtered = filtered.filter(models.Verification.created_at >= date_from)
     if date_to:
-        query = query.filter(models.Verification.created_at <= date_to)
+        filtered = filtered.filter(models.Verification.created_at <= date_to)
 
-    query = query.order_by(models.Verification.created_at.desc())
-    results = query.offset((page - 1) * page_size).limit(page_size).all()
+    query = (
+        filtered.with_entities(models.Verification, models.PatientInfo)
+        .outerjoin(models.PatientInfo, models.PatientInfo.verification_id == models.Verification.id)
+    )
+    # Legacy offset paging; new clients follow the X-Next-Cursor header.
+    offset = 0 if cursor else (page - 1) * page_size
+    results, next_cursor = keyset_page(
+        query,
+        [models.Verification.created_at, models.Verification.id],
+        cursor,
+        page_size,
+        offset=offset,
+    )
+    set_page_headers(response, next_cursor, estimate_count(db, filtered))
 
-    response: list[VerificationListItem] = []
+    response_items: list[VerificationListItem] = []
     for verification, patient in results:
-        response.append(
+        response_items.append(
             VerificationListItem(
                 id=verification.id,
                 status=verification.status,
@@ -114,7 +129,30 @@ def list_verifications(
                 patient_name=patient.patient_name if patient else None,
             )
         )
-    return response
+    return response_items
+
+
+@router.post("/extract-batch")
+def extract_verifications_batch(
+    payload: VerificationBatchExtractRequest,
+    db: Session = Depends(get_db),
+    user: models.User = Depends(require_roles("admin", "reviewer", "scheduler")),
+) -> dict:
+    verification_ids = [
+        str(verification_id)
+        for (verification_id,) in db.query(models.Verification.id).filter(
+            models.Verification.tenant_id == user.tenant_id,
+            models.Verification.id.in_(payload.verification_ids),
+        )
+    ]
+    chunk_size = max(settings.extraction_batch_chunk_size, 1)
+    job_ids = [
+        extract_summary_batch.delay(
+            verification_ids[start : start + chunk_size], payload.incremental
+        ).id
+        for start in range(0, len(verification_ids), chunk_size)
+    ]
+    return {"job_ids": job_ids, "count": len(verification_ids)}
 
 
 @router.get("/{verification_id}", response_model=VerificationOut)
@@ -178,6 +216,7 @@ def update_verification(
 @router.post("/{verification_id}/run")
 def run_verification_job(
     verification_id: str,
+    refresh: bool = Query(default=False, description="Skip the eligibility cache"),
     db: Session = Depends(get_db),
     user: models.User = Depends(require_roles("admin", "reviewer", "scheduler")),
 ) -> dict:
@@ -191,8 +230,13 @@ def run_verification_job(
     )
     if not verification:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if verification.status == eligibility_batches.QUEUED:
+        # Its eligibility batch will run it; a single run would check it twice.
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Queued in an eligibility batch"
+        )
 
-    job = run_verification.delay(str(verification.id))
+    job = run_verification.delay(str(verification.id), bypass_cache=refresh)
     audit.log_event(
         db,
         tenant_id=user.tenant_id,
@@ -201,6 +245,6 @@ def run_verification_job(
         event_type="verification_run_requested",
         entity_type="verification",
         entity_id=verification.id,
-        diff_json={"job_id": job.id},
+        diff_json={"job_id": job.id, "refresh": refresh},
     )
     return {"job_id": job.id}
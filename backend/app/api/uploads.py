@@ -0,0 +1,181 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, status
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.storage import (
+    MultipartWriter,
+    ensure_bucket_exists,
+    run_io,
+    start_multipart,
+    upload_bytes,
+)
+
+
+@dataclass
+class StreamedUpload:
+    filename: str
+    content_type: Optional[str]
+    storage_key: str
+    sha256: str
+    size: int
+    # False when the content was already stored and the upload reused its key.
+    written: bool = True
+
+
+class _FilePartReader:
+    """Parser callbacks that expose the bytes of the first file part named ``field``."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.started = False
+        self.finished = False
+        self.pending = bytearray()
+        self._in_file = False
+        self._headers: dict[bytes, bytes] = {}
+        self._header_name = b""
+        self._header_value = b""
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = {}
+        self._in_file = False
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_name += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers[self._header_name.lower()] = self._header_value
+        self._header_name = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        if self.started:
+            return
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name", b"").decode("utf-8", "replace") != self.field:
+            return
+        if b"filename" not in options:
+            return
+        self.filename = options[b"filename"].decode("utf-8", "replace")
+        content_type = self._headers.get(b"content-type")
+        self.content_type = content_type.decode("latin-1") if content_type else None
+        self.started = True
+        self._in_file = True
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self.pending += data[start:end]
+
+    def on_part_end(self) -> None:
+        if self._in_file:
+            self.finished = True
+            self._in_file = False
+
+
+async def stream_upload(
+    request: Request,
+    storage_key_for: Callable[[str], str],
+    field: str = "file",
+    existing_key_for: Optional[Callable[[str], Optional[str]]] = None,
+) -> StreamedUpload:
+    """Pipe the ``field`` file of a multipart body into object storage.
+
+    The body is parsed as it arrives; file bytes are hashed incrementally and
+    sent to the storage backend in ``upload_part_size_bytes`` parts, so memory
+    per upload stays around one part regardless of file size.
+    ``storage_key_for`` receives the client filename and may raise
+    HTTPException to reject the file before any bytes are stored.
+
+    Files that fit in a single part are hashed before anything is written;
+    if ``existing_key_for`` (run in the threadpool) returns a key for that
+    digest, the write is skipped and that key is returned instead.
+    """
+    _, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing boundary")
+
+    part_size = settings.upload_part_size_bytes
+    reader = _FilePartReader(field)
+    parser = MultipartParser(boundary, reader.callbacks())
+    hasher = hashlib.sha256()
+    size = 0
+    upload: Optional[MultipartWriter] = None
+    storage_key = ""
+
+    try:
+        async for chunk in request.stream():
+            if reader.finished:
+                # Drain the rest of the body without parsing it.
+                continue
+            parser.write(chunk)
+            if reader.started and not storage_key:
+                storage_key = storage_key_for(reader.filename or "")
+            if not storage_key:
+                reader.pending.clear()
+                continue
+            while len(reader.pending) >= part_size:
+                part = bytes(reader.pending[:part_size])
+                del reader.pending[:part_size]
+                hasher.update(part)
+                size += len(part)
+                if upload is None:
+                    await run_io(ensure_bucket_exists)
+                    upload = await run_io(start_multipart, storage_key, reader.content_type)
+                await run_io(upload.upload_part, part)
+        if not storage_key:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing file")
+        if not reader.finished:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incomplete upload")
+
+        tail = bytes(reader.pending)
+        reader.pending.clear()
+        hasher.update(tail)
+        size += len(tail)
+        written = True
+        if upload is not None:
+            if tail:
+                await run_io(upload.upload_part, tail)
+            await run_io(upload.complete)
+        else:
+            existing = None
+            if existing_key_for is not None:
+                existing = await run_in_threadpool(existing_key_for, hasher.hexdigest())
+            if existing:
+                storage_key, written = existing, False
+            else:
+                await run_io(ensure_bucket_exists)
+                await run_io(upload_bytes, storage_key, tail, reader.content_type)
+    except BaseException:
+        if upload is not None:
+            await run_io(upload.abort)
+        raise
+
+    return StreamedUpload(
+        filename=reader.filename or "",
+        content_type=reader.content_type,
+        storage_key=storage_key,
+        sha256=hasher.hexdigest(),
+        size=size,
+        written=written,
+    )
@@ -12,18 +12,108 @@ class Settings(BaseSettings):
     access_token_exp_minutes: int = 60
     refresh_token_exp_days: int = 7
 
+    storage_backend: str = "s3"  # s3 or local
+    local_storage_root: str = "/data/storage"
+    local_storage_url_base: str = "http://localhost:8000/files"
+
     object_storage_endpoint: str = "http://minio:9000"
     object_storage_access_key: str = "minioadmin"
     object_storage_secret_key: str = "minioadmin"
     object_storage_bucket: str = "eb-copilot"
     object_storage_region: str = "us-east-1"
     object_storage_secure: bool = False
+    object_storage_max_pool_connections: int = 32
+    object_storage_max_attempts: int = 3
+    storage_io_workers: int = 8
+    storage_stats_flush_interval_seconds: float = 5.0
+    artifact_upload_concurrency: int = 8
+    upload_part_size_bytes: int = 5 * 1024 * 1024
+    text_range_max_length: int = 64 * 1024
+    evidence_context_chars: int = 200
 
     llm_api_key: Optional[str] = None
     llm_model_name: str = "gpt-4o-mini"
     llm_provider: str = "mock"
 
     enable_ocr: bool = False
+    text_compression_enabled: bool = True
+    text_compression_level: int = 6
+    text_compression_dictionary: Optional[str] = "payer-responses-v1"
+    pdf_extraction_workers: int = 4
+    pdf_pages_per_chunk: int = 8
+    extraction_artifact_concurrency: int = 4
+    extraction_batch_chunk_size: int = 200
+
+    audit_buffered: bool = True
+    audit_flush_interval_seconds: float = 1.0
+    audit_flush_max_events: int = 500
+
+    task_coalesce_window_seconds: float = 5.0
+    task_coalesce_lock_seconds: int = 600
+    # Task name -> queue; tasks not listed go to celery_default_queue.
+    celery_task_queues: dict[str, str] = {
+        "app.workers.tasks.extract_summary": "cpu",
+        "app.workers.tasks.extract_summary_batch": "cpu",
+        "app.workers.tasks.generate_report": "cpu",
+        "app.workers.tasks.compress_artifact_text": "cpu",
+        "app.workers.tasks.run_verification": "connectors",
+        "app.workers.tasks.run_eligibility_batch": "connectors",
+        "app.workers.tasks.classify_intake_item": "light",
+        "app.workers.tasks.process_prior_auth": "light",
+        "app.workers.tasks.process_referral": "light",
+        "app.workers.tasks.drain_deferred": "light",
+        "app.workers.tasks.purge_extracted_text_cache": "light",
+        "app.workers.tasks.rebuild_metric_rollups": "light",
+    }
+    celery_default_queue: str = "light"
+    # WorkerProfile fields keyed by profile name; scripts/run_worker.py starts one.
+    # A profile consumes the queue of the same name unless it lists "queues".
+    celery_worker_profiles: dict[str, dict] = {
+        # Threads, not prefork: prefork children are daemonic and cannot start the
+        # PDF process pool (pdf_extraction_workers), which is where the CPU-bound
+        # page parsing runs. Long tasks, so no prefetch.
+        "cpu": {"pool": "threads", "prefetch_multiplier": 1},
+        # Threads only wait on the shared connector event loop, so concurrency
+        # bounds in-flight payer calls rather than CPU use.
+        "connectors": {"pool": "threads", "concurrency": 512, "prefetch_multiplier": 4},
+        "light": {"pool": "threads", "concurrency": 32, "prefetch_multiplier": 16},
+    }
+
+    # Retryable task failures back off base * 2**retry seconds (jittered), up to max.
+    task_retry_backoff_base_seconds: float = 2.0
+    task_retry_backoff_max_seconds: float = 600.0
+
+    circuit_breaker_enabled: bool = True
+    # Retryable payer failures within the window that open a payer's breaker.
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_window_seconds: int = 60
+    circuit_breaker_cooldown_seconds: int = 30
+    circuit_breaker_probe_timeout_seconds: int = 120
+    # Parked calls released per drain run once a breaker closes.
+    circuit_breaker_drain_batch_size: int = 500
+
+    eligibility_connector: str = "mock"  # mock, simulator or simulator_http
+    payer_simulator_url: str = "http://payer-simulator:9100"
+    payer_simulator_seed: Optional[int] = None
+    # PayerProfile fields keyed by lowercased payer name, plus an optional "default".
+    payer_simulator_profiles: dict[str, dict] = {}
+    connector_timeout_seconds: float = 60.0
+    connector_batch_timeout_seconds: float = 600.0
+    connector_http_max_connections: int = 500
+    connector_http_max_keepalive: int = 100
+    connector_default_concurrency: int = 20
+    connector_default_rate_per_second: float = 10.0
+    connector_default_burst: int = 20
+    # Overrides keyed by lowercased payer name, e.g.
+    # {"aetna": {"concurrency": 50, "rate_per_second": 25, "burst": 50}}.
+    connector_payer_limits: dict[str, dict[str, float]] = {}
+
+    eligibility_cache_enabled: bool = True
+    eligibility_cache_ttl_seconds: int = 24 * 3600
+    # Overrides keyed by lowercased payer name; 0 turns caching off for that payer.
+    eligibility_cache_payer_ttl_seconds: dict[str, int] = {}
+    # Subscribers per batched 270; larger selections are split into several batches.
+    eligibility_batch_size: int = 1000
 
     app_name: str = "E&B Copilot"
     cors_origins: str = "http://localhost:3000"
@@ -1,18 +1,27 @@
 import uuid
 
 from sqlalchemy import (
+    BigInteger,
+    Boolean,
     Column,
     Date,
     DateTime,
+    Float,
     ForeignKey,
     Index,
+    Integer,
+    LargeBinary,
     Numeric,
     String,
     Text,
+    false,
     func,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy.orm import declarative_base, deferred, relationship
+
+from app.core.config import settings
+from app.utils.compression import compress_text, decompress_text
 
 Base = declarative_base()
 
@@ -48,6 +57,14 @@ class Verification(Base):
     plan_name = Column(String(255), nullable=True)
     service_category = Column(String(255), nullable=False)
     scheduled_at = Column(DateTime(timezone=True), nullable=True)
+    # When the payer actually answered the last run, and whether that answer
+    # came from the eligibility cache rather than a fresh connector call.
+    eligibility_fetched_at = Column(DateTime(timezone=True), nullable=True)
+    eligibility_from_cache = Column(Boolean, nullable=False, default=False, server_default=false())
+    # Set while the verification rides in a batched 270 instead of its own run.
+    eligibility_batch_id = Column(
+        UUID(as_uuid=True), ForeignKey("eligibility_batches.id"), nullable=True
+    )
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
@@ -61,6 +78,30 @@ class Verification(Base):
     artifacts = relationship("Artifact", back_populates="verification")
 
 
+class EligibilityBatch(Base):
+    """One batched 270 sent to a payer, with progress counters for its verifications."""
+
+    __tablename__ = "eligibility_batches"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    payer_name = Column(String(255), nullable=False)
+    status = Column(String(32), nullable=False)  # queued, running, completed, failed
+    total = Column(Integer, nullable=False, default=0)
+    succeeded = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    from_cache = Column(Integer, nullable=False, default=0)
+    failure_reason = Column(Text, nullable=True)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def pending(self) -> int:
+        return max(self.total - self.succeeded - self.failed, 0)
+
+
 class PatientInfo(Base):
     __tablename__ = "patient_info"
 
@@ -99,13 +140,47 @@ class Artifact(Base):
     source = Column(String(32), nullable=False)
     filename = Column(String(255), nullable=True)
     storage_key = Column(String(512), nullable=True)
-    text_content = Column(Text, nullable=True)
+    # Text lives zstd-compressed in text_content_zstd; text_content_raw only
+    # holds rows written before compression (or with it disabled). Both are
+    # deferred so listing artifacts does not pull text unless asked.
+    text_content_raw = deferred(Column("text_content", Text, nullable=True), group="text")
+    text_content_zstd = deferred(Column(LargeBinary, nullable=True), group="text")
+    # Start offset of each page in the extracted text, set by extract_summary.
+    page_offsets = deferred(Column(JSONB, nullable=True))
     sha256 = Column(String(64), nullable=False)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    extracted_at = Column(DateTime(timezone=True), nullable=True)
 
     verification = relationship("Verification", back_populates="artifacts")
 
+    @property
+    def text_content(self):
+        if self.text_content_zstd is not None:
+            return decompress_text(self.text_content_zstd)
+        return self.text_content_raw
+
+    @text_content.setter
+    def text_content(self, value) -> None:
+        if value is not None and settings.text_compression_enabled:
+            self.text_content_zstd = compress_text(value)
+            self.text_content_raw = None
+        else:
+            self.text_content_zstd = None
+            self.text_content_raw = value
+
+
+class ArtifactPage(Base):
+    """One page of an uploaded file's extracted text, addressed via Artifact.page_offsets."""
+
+    __tablename__ = "artifact_pages"
+
+    artifact_id = Column(
+        UUID(as_uuid=True), ForeignKey("artifacts.id", ondelete="CASCADE"), primary_key=True
+    )
+    page_number = Column(Integer, primary_key=True)
+    text = Column(Text, nullable=False)
+
 
 class DraftSummary(Base):
     __tablename__ = "draft_summaries"
@@ -113,7 +188,7 @@ class DraftSummary(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     verification_id = Column(UUID(as_uuid=True), ForeignKey("verifications.id"), nullable=False)
     llm_model_name = Column(String(128), nullable=False)
-    raw_llm_output_json = Column(JSONB, nullable=False)
+    raw_llm_output_json = deferred(Column(JSONB, nullable=False))
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 
@@ -134,6 +209,29 @@ class SummaryField(Base):
     )
 
 
+class ExtractedTextCache(Base):
+    __tablename__ = "extracted_text_cache"
+
+    sha256 = Column(String(64), primary_key=True)
+    extractor_version = Column(String(64), primary_key=True)
+    page_texts = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class Blob(Base):
+    """Stored object shared by every artifact with the same content in a tenant."""
+
+    __tablename__ = "blobs"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), primary_key=True)
+    sha256 = Column(String(64), primary_key=True)
+    storage_key = Column(String(512), nullable=False)
+    size = Column(BigInteger, nullable=True)
+    content_type = Column(String(255), nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 class GeneratedReport(Base):
     __tablename__ = "generated_reports"
 
@@ -158,10 +256,37 @@ class AuditEvent(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
 
+class MetricRollup(Base):
+    __tablename__ = "metric_rollups"
+
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    metric = Column(String(64), primary_key=True)
+    dimension = Column(String(128), primary_key=True, default="")
+    count = Column(BigInteger, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0)
+
+
 Index("ix_users_tenant_email", User.tenant_id, User.email, unique=True)
 Index("ix_verifications_tenant_status", Verification.tenant_id, Verification.status)
 Index("ix_verifications_created_at", Verification.created_at)
+Index(
+    "ix_verifications_tenant_created_id",
+    Verification.tenant_id,
+    Verification.created_at,
+    Verification.id,
+)
+Index(
+    "ix_verifications_batch_status", Verification.eligibility_batch_id, Verification.status
+)
+Index(
+    "ix_eligibility_batches_tenant_created_id",
+    EligibilityBatch.tenant_id,
+    EligibilityBatch.created_at,
+    EligibilityBatch.id,
+)
 Index("ix_artifacts_verification", Artifact.verification_id)
+Index("ix_artifacts_tenant_sha256", Artifact.tenant_id, Artifact.sha256)
 Index("ix_summary_fields_verification", SummaryField.verification_id)
 Index("ix_audit_events_tenant", AuditEvent.tenant_id)
 
@@ -258,3 +383,17 @@ Index("ix_referrals_tenant", Referral.tenant_id)
 Index("ix_cases_tenant_type_status", Case.tenant_id, Case.type, Case.status)
 Index("ix_cases_created_at", Case.created_at)
 Index("ix_intake_items_tenant_status", IntakeItem.tenant_id, IntakeItem.status)
+Index("ix_cases_tenant_created_id", Case.tenant_id, Case.created_at, Case.id)
+Index(
+    "ix_intake_items_tenant_created_id",
+    IntakeItem.tenant_id,
+    IntakeItem.created_at,
+    IntakeItem.id,
+)
+Index(
+    "ix_prior_auth_tenant_created_id",
+    PriorAuthorization.tenant_id,
+    PriorAuthorization.created_at,
+    PriorAuthorization.id,
+)
+Index("ix_referrals_tenant_created_id", Referral.tenant_id, Referral.created_at, Referral.id)
@@ -1,8 +1,10 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.api.pagination import PAGE_HEADERS
 from app.api.router import api_router
 from app.core.config import settings
+from app.services import audit, storage
 
 app = FastAPI(title=settings.app_name)
 
@@ -14,6 +16,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=PAGE_HEADERS,
 )
 
 app.include_router(api_router)
@@ -22,3 +25,9 @@ app.include_router(api_router)
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+
+@app.on_event("shutdown")
+def flush_buffers() -> None:
+    audit.flush()
+    storage.flush_stats()
@@ -14,11 +14,26 @@ class ArtifactOut(BaseModel):
     source: str
     filename: Optional[str]
     storage_key: Optional[str]
-    text_content: Optional[str]
     sha256: str
     created_by: Optional[UUID]
     created_at: datetime
 
 
+class TextSliceOut(BaseModel):
+    offset: int
+    length: int
+    total_length: int
+    next_offset: Optional[int]
+    text: str
+
+
+class EvidenceSnippetOut(BaseModel):
+    artifact_id: UUID
+    page: int
+    text_span: list[int]
+    offset: int
+    text: str
+
+
 class ManualArtifactIn(BaseModel):
     text_content: str
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class EligibilityBatchCreateRequest(BaseModel):
+    payer_name: Optional[str] = Field(None, max_length=255, description="Only this payer")
+    scheduled_before: Optional[datetime] = Field(
+        None, description="Only visits scheduled at or before this time"
+    )
+    limit: int = Field(10000, ge=1, le=100000, description="Most verifications to claim")
+
+
+class EligibilityBatchOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    payer_name: str
+    status: str
+    total: int
+    succeeded: int
+    failed: int
+    pending: int
+    from_cache: int
+    failure_reason: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
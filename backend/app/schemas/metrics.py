@@ -8,3 +8,45 @@ class MetricsOverview(BaseModel):
     percent_auto_draft_success: float
     percent_needs_human_review: float
     top_failure_reasons: list[dict]
+    verifications_created: int = 0
+    status_counts: dict[str, int] = {}
+
+
+class ExtractionCacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: Optional[float]
+
+
+class EligibilityCacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: Optional[float]
+
+
+class CircuitBreakerState(BaseModel):
+    payer_name: str
+    state: str
+    retry_in_seconds: float
+    deferred: int
+
+
+class TaskCoalesceStats(BaseModel):
+    task_name: str
+    triggered: int
+    scheduled: int
+    coalesced: int
+    deferred: int
+
+
+class StorageOperationStats(BaseModel):
+    operation: str
+    calls: int
+    errors: int
+    avg_latency_ms: Optional[float]
+
+
+class StorageStats(BaseModel):
+    bytes_sent: int
+    bytes_received: int
+    operations: list[StorageOperationStats]
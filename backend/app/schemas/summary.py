@@ -29,3 +29,12 @@ class SummaryFieldUpdateRequest(BaseModel):
 class SummaryResponse(BaseModel):
     verification_id: UUID
     fields: list[SummaryFieldOut]
+
+
+class DraftSummaryOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    verification_id: UUID
+    llm_model_name: str
+    created_at: datetime
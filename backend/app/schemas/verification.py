@@ -75,6 +75,8 @@ class VerificationOut(BaseModel):
     plan_name: Optional[str]
     service_category: str
     scheduled_at: Optional[datetime]
+    eligibility_fetched_at: Optional[datetime] = None
+    eligibility_from_cache: bool = False
     created_by: UUID
     created_at: datetime
     updated_at: datetime
@@ -102,3 +104,8 @@ class VerificationUpdateRequest(BaseModel):
     plan_name: Optional[str] = Field(None, max_length=255)
     service_category: Optional[str] = Field(None, min_length=2, max_length=255)
     scheduled_at: Optional[datetime] = None
+
+
+class VerificationBatchExtractRequest(BaseModel):
+    verification_ids: list[UUID] = Field(..., min_length=1, max_length=10000)
+    incremental: bool = True
@@ -1,10 +1,157 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
 from typing import Any, Optional
 from uuid import UUID
-import json
 
+import redis
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
+from sqlalchemy.exc import InterfaceError, OperationalError
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.redis import get_redis
 from app.db import models
+from app.db.session import SessionLocal
+from app.services import metrics_rollup
+
+logger = logging.getLogger(__name__)
+
+DEAD_LETTER_KEY = "audit:dead_letter"
+
+# The database itself is unreachable; every row would fail the same way.
+_TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+
+def write_events(db: Session, rows: list[dict[str, Any]]) -> None:
+    if not rows:
+        return
+    db.execute(insert(models.AuditEvent), rows)
+    metrics_rollup.apply_events(db, rows)
+
+
+def _write_committed(rows: list[dict[str, Any]]) -> None:
+    db = SessionLocal()
+    try:
+        write_events(db, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _dead_letter(row: dict[str, Any]) -> None:
+    payload = json.dumps(row, default=str)
+    try:
+        get_redis().rpush(DEAD_LETTER_KEY, payload)
+    except redis.RedisError:
+        # Last resort: the log line still carries the whole event.
+        logger.error("Could not dead-letter audit event: %s", payload)
+
+
+class AuditBuffer:
+    """Collects audit rows and writes them with one multi-row INSERT.
+
+    Flushes when ``max_events`` rows are pending or every ``flush_interval``
+    seconds from a daemon thread, and on interpreter / worker shutdown. If the
+    batch INSERT fails, rows are retried one at a time: rows the database
+    rejects go to the ``audit:dead_letter`` Redis list, and rows hit by a
+    connection failure stay pending for the next flush. Nothing is dropped.
+    """
+
+    def __init__(self, max_events: int, flush_interval: float):
+        self.max_events = max_events
+        self.flush_interval = flush_interval
+        self._rows: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, row: dict[str, Any]) -> None:
+        with self._lock:
+            self._rows.append(row)
+            pending = len(self._rows)
+        self._ensure_thread()
+        if pending >= self.max_events:
+            self.flush()
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            try:
+                _write_committed(rows)
+                return len(rows)
+            except _TRANSIENT_ERRORS:
+                logger.exception("Failed to flush %d audit events, keeping them", len(rows))
+                self._requeue(rows)
+                return 0
+            except Exception:
+                logger.exception("Failed to flush %d audit events, retrying singly", len(rows))
+
+            written = 0
+            for index, row in enumerate(rows):
+                try:
+                    _write_committed([row])
+                except _TRANSIENT_ERRORS:
+                    logger.exception(
+                        "Audit database unavailable, keeping %d events", len(rows) - index
+                    )
+                    self._requeue(rows[index:])
+                    break
+                except Exception:
+                    logger.exception("Dead-lettering audit event %s", row["id"])
+                    _dead_letter(row)
+                else:
+                    written += 1
+            return written
+
+    def _requeue(self, rows: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._rows = rows + self._rows
+
+    def reset(self) -> None:
+        # Called in forked children: the parent still owns its pending rows.
+        self._rows = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="audit-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+
+_buffer = AuditBuffer(
+    max_events=settings.audit_flush_max_events,
+    flush_interval=settings.audit_flush_interval_seconds,
+)
+atexit.register(_buffer.flush)
+os.register_at_fork(after_in_child=_buffer.reset)
+
+
+def flush() -> int:
+    return _buffer.flush()
 
 
 def log_event(
@@ -17,26 +164,25 @@ def log_event(
     entity_type: str,
     entity_id: UUID,
     diff_json: Optional[Any] = None,
+    sync: bool = False,
 ) -> models.AuditEvent:
-    def _serialize(value: Any) -> Any:
-        if isinstance(value, UUID):
-            return str(value)
-        if isinstance(value, dict):
-            return {k: _serialize(v) for k, v in value.items()}
-        if isinstance(value, list):
-            return [_serialize(v) for v in value]
-        return value
-
-    event = models.AuditEvent(
-        tenant_id=tenant_id,
-        actor_type=actor_type,
-        actor_id=actor_id,
-        event_type=event_type,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        diff_json=_serialize(diff_json) if diff_json is not None else None,
-    )
-    db.add(event)
-    db.commit()
-    db.refresh(event)
-    return event
+    row = {
+        "id": uuid.uuid4(),
+        "tenant_id": tenant_id,
+        "actor_type": actor_type,
+        "actor_id": actor_id,
+        "event_type": event_type,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "diff_json": jsonable_encoder(diff_json) if diff_json is not None else None,
+        "created_at": datetime.now(timezone.utc),
+    }
+    if sync:
+        # Joins the caller's transaction; the caller decides when to commit.
+        write_events(db, [row])
+    elif settings.audit_buffered:
+        _buffer.add(row)
+    else:
+        write_events(db, [row])
+        db.commit()
+    return models.AuditEvent(**row)
@@ -0,0 +1,70 @@
+import uuid
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+
+def new_storage_key(tenant_id: UUID) -> str:
+    # Keys are opaque; the (tenant_id, sha256) row is the content address.
+    return f"blobs/{tenant_id}/{uuid.uuid4()}"
+
+
+def existing_key(db: Session, tenant_id: UUID, sha256: str) -> Optional[str]:
+    return (
+        db.query(models.Blob.storage_key)
+        .filter(models.Blob.tenant_id == tenant_id, models.Blob.sha256 == sha256)
+        .scalar()
+    )
+
+
+def acquire(
+    db: Session,
+    *,
+    tenant_id: UUID,
+    sha256: str,
+    storage_key: str,
+    size: Optional[int] = None,
+    content_type: Optional[str] = None,
+) -> tuple[str, int]:
+    """Add a reference to the blob for ``sha256``, creating it at ``storage_key``.
+
+    Returns the blob's storage key, which differs from ``storage_key`` when the
+    content was already stored, and its new reference count. Runs in the
+    caller's transaction so the reference commits with the row that holds it.
+    """
+    stmt = insert(models.Blob).values(
+        tenant_id=tenant_id,
+        sha256=sha256,
+        storage_key=storage_key,
+        size=size,
+        content_type=content_type,
+        ref_count=1,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["tenant_id", "sha256"],
+        set_={"ref_count": models.Blob.ref_count + 1},
+    ).returning(models.Blob.storage_key, models.Blob.ref_count)
+    storage_key, ref_count = db.execute(stmt).one()
+    return storage_key, ref_count
+
+
+def release(db: Session, tenant_id: UUID, sha256: str) -> Optional[str]:
+    """Drop one reference; returns the storage key to delete once none remain."""
+    blob = (
+        db.query(models.Blob)
+        .filter(models.Blob.tenant_id == tenant_id, models.Blob.sha256 == sha256)
+        .with_for_update()
+        .first()
+    )
+    if blob is None:
+        return None
+    blob.ref_count -= 1
+    if blob.ref_count > 0:
+        return None
+    storage_key = blob.storage_key
+    db.delete(blob)
+    return storage_key
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+from app.services.connectors import ConnectorResult, get_connector, supports_batch
+from app.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PayerLimits:
+    concurrency: int
+    rate_per_second: float
+    burst: int
+
+
+def limits_for(payer_name: str) -> PayerLimits:
+    override = settings.connector_payer_limits.get(payer_name.strip().lower(), {})
+    return PayerLimits(
+        concurrency=int(override.get("concurrency", settings.connector_default_concurrency)),
+        rate_per_second=float(
+            override.get("rate_per_second", settings.connector_default_rate_per_second)
+        ),
+        burst=int(override.get("burst", settings.connector_default_burst)),
+    )
+
+
+class PayerGate:
+    """Caps in-flight calls and call rate for one payer."""
+
+    def __init__(self, limits: PayerLimits):
+        self.limits = limits
+        self._slots = asyncio.Semaphore(limits.concurrency)
+        self._bucket = TokenBucket(limits.rate_per_second, limits.burst)
+
+    async def __aenter__(self) -> "PayerGate":
+        await self._slots.acquire()
+        try:
+            await self._bucket.acquire()
+        except BaseException:
+            self._slots.release()
+            raise
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._slots.release()
+
+
+class ConnectorEngine:
+    """Event loop on a background thread that runs every connector call in a process.
+
+    Callers on worker threads hand it payloads and wait on the returned
+    future, so thousands of slow payer calls share one loop and one HTTP
+    connection pool instead of each holding a worker process.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._gates: dict[str, PayerGate] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._thread = threading.Thread(target=self._run, name="connector-engine", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._client = httpx.AsyncClient(
+            timeout=settings.connector_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.connector_http_max_connections,
+                max_keepalive_connections=settings.connector_http_max_keepalive,
+            ),
+        )
+        self._loop.run_forever()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pool for HTTP connectors; only use it from the engine loop."""
+        return self._client
+
+    def _gate(self, payer_name: str) -> PayerGate:
+        key = payer_name.strip().lower()
+        gate = self._gates.get(key)
+        if gate is None:
+            gate = self._gates[key] = PayerGate(limits_for(payer_name))
+        return gate
+
+    async def check(self, payload: dict) -> ConnectorResult:
+        payer_name = payload.get("payer_name") or ""
+        connector = get_connector(payer_name, self._client)
+        async with self._gate(payer_name):
+            try:
+                return await asyncio.wait_for(
+                    connector.get_eligibility(payload), settings.connector_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                return ConnectorResult(
+                    success=False, failure_reason="payer timeout", retryable=True
+                )
+
+    async def check_batch(self, payer_name: str, interchange: str) -> ConnectorResult:
+        # A batch holds one of the payer's slots like a single inquiry does.
+        connector = get_connector(payer_name, self._client)
+        async with self._gate(payer_name):
+            try:
+                return await asyncio.wait_for(
+                    connector.submit_batch(interchange), settings.connector_batch_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                return ConnectorResult(
+                    success=False, failure_reason="payer timeout", retryable=True
+                )
+
+    def submit(self, payload: dict) -> Future:
+        return asyncio.run_coroutine_threadsafe(self.check(payload), self._loop)
+
+    def submit_batch(self, payer_name: str, interchange: str) -> Future:
+        return asyncio.run_coroutine_threadsafe(
+            self.check_batch(payer_name, interchange), self._loop
+        )
+
+
+_engine: Optional[ConnectorEngine] = None
+_engine_pid: Optional[int] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> ConnectorEngine:
+    # The loop thread does not survive a fork; children start their own.
+    global _engine, _engine_pid
+    if _engine is None or _engine_pid != os.getpid():
+        with _engine_lock:
+            if _engine is None or _engine_pid != os.getpid():
+                _engine = ConnectorEngine()
+                _engine_pid = os.getpid()
+    return _engine
+
+
+def check_eligibility(payload: dict) -> ConnectorResult:
+    """Blocking entry point for worker threads."""
+    return get_engine().submit(payload).result()
+
+
+def batch_supported(payer_name: str) -> bool:
+    return supports_batch(get_connector(payer_name))
+
+
+def check_eligibility_batch(payer_name: str, interchange: str) -> ConnectorResult:
+    """Blocking entry point for a batched 270; the result carries the batched 271."""
+    return get_engine().submit_batch(payer_name, interchange).result()
@@ -1,21 +1,37 @@
 from dataclasses import dataclass
 from typing import Protocol, Optional
 
+import httpx
+
+from app.core.config import settings
+from app.services.payer_simulator import get_simulator
+
 
 @dataclass
 class ConnectorResult:
     success: bool
     raw_text: Optional[str] = None
     failure_reason: Optional[str] = None
+    # Throttles, timeouts and payer-side errors; worth asking again later.
+    retryable: bool = False
 
 
 class EligibilityConnector(Protocol):
-    def get_eligibility(self, payload: dict) -> ConnectorResult:
+    """Runs on the connector engine's event loop; must never block it."""
+
+    async def get_eligibility(self, payload: dict) -> ConnectorResult:
+        ...
+
+
+class BatchEligibilityConnector(EligibilityConnector, Protocol):
+    """Connectors that also take a batched 270 and answer with one batched 271."""
+
+    async def submit_batch(self, interchange: str) -> ConnectorResult:
         ...
 
 
 class MockEligibilityConnector:
-    def get_eligibility(self, payload: dict) -> ConnectorResult:
+    async def get_eligibility(self, payload: dict) -> ConnectorResult:
         payer = (payload.get("payer_name") or "").lower()
         member_id = (payload.get("member_id") or "").strip()
         if not member_id:
@@ -37,11 +53,63 @@ class MockEligibilityConnector:
 
 
 class ManualEvidenceOnlyConnector:
-    def get_eligibility(self, payload: dict) -> ConnectorResult:
+    async def get_eligibility(self, payload: dict) -> ConnectorResult:
         return ConnectorResult(success=False, failure_reason="requires evidence upload")
 
 
-def get_connector(payer_name: str) -> EligibilityConnector:
+class SimulatorConnector:
+    """Talks to the payer simulator, in-process or over HTTP when given a client."""
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client
+
+    async def get_eligibility(self, payload: dict) -> ConnectorResult:
+        if self.client is None:
+            response = await get_simulator().respond(payload)
+            return self._result(response.status_code, response.body)
+        return await self._post("/eligibility", json=payload)
+
+    async def submit_batch(self, interchange: str) -> ConnectorResult:
+        if self.client is None:
+            response = await get_simulator().respond_batch(interchange)
+            return self._result(response.status_code, response.body)
+        return await self._post(
+            "/eligibility/batch",
+            content=interchange,
+            headers={"Content-Type": "application/edi-x12"},
+        )
+
+    async def _post(self, path: str, **kwargs) -> ConnectorResult:
+        try:
+            response = await self.client.post(f"{settings.payer_simulator_url}{path}", **kwargs)
+        except httpx.HTTPError as exc:
+            return ConnectorResult(
+                success=False, failure_reason=f"payer unreachable: {exc}", retryable=True
+            )
+        return self._result(response.status_code, response.text)
+
+    @staticmethod
+    def _result(status_code: int, body: str) -> ConnectorResult:
+        if status_code == 200:
+            return ConnectorResult(success=True, raw_text=body)
+        if status_code == 429:
+            return ConnectorResult(success=False, failure_reason="payer throttled", retryable=True)
+        return ConnectorResult(
+            success=False, failure_reason=f"payer error {status_code}", retryable=status_code >= 500
+        )
+
+
+def get_connector(
+    payer_name: str, client: Optional[httpx.AsyncClient] = None
+) -> EligibilityConnector:
     if payer_name.lower().startswith("manual"):
         return ManualEvidenceOnlyConnector()
+    if settings.eligibility_connector == "simulator":
+        return SimulatorConnector()
+    if settings.eligibility_connector == "simulator_http":
+        return SimulatorConnector(client)
     return MockEligibilityConnector()
+
+
+def supports_batch(connector: EligibilityConnector) -> bool:
+    return callable(getattr(connector, "submit_batch", None))
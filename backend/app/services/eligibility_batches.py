@@ -0,0 +1,87 @@
+"""Group pending verifications by payer into batches for bulk 270 submission."""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db import models
+from app.services import audit
+
+QUEUED = "queued"
+
+
+def create_batches(
+    db: Session,
+    *,
+    tenant_id: UUID,
+    created_by: Optional[UUID],
+    payer_name: Optional[str] = None,
+    scheduled_before: Optional[datetime] = None,
+    limit: Optional[int] = None,
+) -> list[models.EligibilityBatch]:
+    """Claim pending verifications and split them into per-payer batches.
+
+    Claimed verifications move to ``queued`` so a second selection (or a
+    single run) does not pick them up while their batch is in flight.
+    """
+    query = db.query(models.Verification.id, models.Verification.payer_name).filter(
+        models.Verification.tenant_id == tenant_id,
+        models.Verification.status == "pending",
+        models.Verification.eligibility_batch_id.is_(None),
+    )
+    if payer_name:
+        query = query.filter(models.Verification.payer_name.ilike(payer_name.strip()))
+    if scheduled_before:
+        query = query.filter(models.Verification.scheduled_at <= scheduled_before)
+    query = query.order_by(
+        models.Verification.scheduled_at.asc().nulls_last(), models.Verification.created_at
+    )
+    if limit:
+        query = query.limit(limit)
+    rows = query.with_for_update(skip_locked=True).all()
+
+    by_payer: dict[str, tuple[str, list[UUID]]] = {}
+    for verification_id, name in rows:
+        key = name.strip().lower()
+        by_payer.setdefault(key, (name.strip(), []))[1].append(verification_id)
+
+    size = max(settings.eligibility_batch_size, 1)
+    batches: list[models.EligibilityBatch] = []
+    for name, verification_ids in by_payer.values():
+        for start in range(0, len(verification_ids), size):
+            chunk = verification_ids[start : start + size]
+            batch = models.EligibilityBatch(
+                tenant_id=tenant_id,
+                payer_name=name,
+                status=QUEUED,
+                total=len(chunk),
+                succeeded=0,
+                failed=0,
+                from_cache=0,
+                created_by=created_by,
+            )
+            db.add(batch)
+            db.flush()
+            db.execute(
+                update(models.Verification)
+                .where(models.Verification.id.in_(chunk))
+                .values(eligibility_batch_id=batch.id, status=QUEUED)
+            )
+            batches.append(batch)
+    db.commit()
+
+    for batch in batches:
+        audit.log_event(
+            db,
+            tenant_id=tenant_id,
+            actor_type="user" if created_by else "system",
+            actor_id=created_by,
+            event_type="eligibility_batch_created",
+            entity_type="eligibility_batch",
+            entity_id=batch.id,
+            diff_json={"payer_name": batch.payer_name, "total": batch.total},
+        )
+    return batches
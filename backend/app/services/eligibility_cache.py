@@ -0,0 +1,103 @@
+import json
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.utils.hashing import sha256_text
+
+logger = logging.getLogger(__name__)
+
+HITS_KEY = "eligibility_cache:hits"
+MISSES_KEY = "eligibility_cache:misses"
+
+
+@dataclass
+class CachedEligibility:
+    raw_text: str
+    fetched_at: datetime
+
+
+def _normalize(value: Optional[str]) -> str:
+    return re.sub(r"\s+", " ", (value or "").strip()).lower()
+
+
+def cache_key(payload: dict) -> Optional[str]:
+    """Redis key for a 270-style lookup, or None when it cannot be keyed.
+
+    Keys are scoped to the tenant so one tenant's cached response is never
+    served to another.
+    """
+    tenant_id = _normalize(payload.get("tenant_id"))
+    member_id = re.sub(r"[^0-9a-z]", "", _normalize(payload.get("member_id")))
+    date_of_birth = _normalize(payload.get("date_of_birth"))
+    if not tenant_id or not member_id or not date_of_birth:
+        return None
+    parts = [
+        tenant_id,
+        _normalize(payload.get("payer_name")),
+        member_id,
+        date_of_birth,
+        _normalize(payload.get("service_category")),
+    ]
+    # Hashed so member identifiers never appear in key names.
+    return f"eligibility:{sha256_text(chr(31).join(parts))}"
+
+
+def ttl_for(payer_name: str) -> int:
+    if not settings.eligibility_cache_enabled:
+        return 0
+    return settings.eligibility_cache_payer_ttl_seconds.get(
+        _normalize(payer_name), settings.eligibility_cache_ttl_seconds
+    )
+
+
+def _incr(key: str) -> None:
+    try:
+        get_redis().incr(key)
+    except redis.RedisError:
+        logger.warning("Could not update %s", key)
+
+
+def get(payload: dict) -> Optional[CachedEligibility]:
+    key = cache_key(payload)
+    if key is None or ttl_for(payload.get("payer_name") or "") <= 0:
+        return None
+    try:
+        cached = get_redis().get(key)
+    except redis.RedisError:
+        logger.warning("Eligibility cache unavailable, calling the payer")
+        return None
+    if cached is None:
+        _incr(MISSES_KEY)
+        return None
+    _incr(HITS_KEY)
+    entry = json.loads(cached)
+    return CachedEligibility(
+        raw_text=entry["raw_text"], fetched_at=datetime.fromisoformat(entry["fetched_at"])
+    )
+
+
+def put(payload: dict, raw_text: str, fetched_at: datetime) -> None:
+    key = cache_key(payload)
+    ttl = ttl_for(payload.get("payer_name") or "")
+    if key is None or ttl <= 0:
+        return
+    entry = json.dumps({"raw_text": raw_text, "fetched_at": fetched_at.isoformat()})
+    try:
+        get_redis().set(key, entry, ex=ttl)
+    except redis.RedisError:
+        logger.warning("Could not cache eligibility response")
+
+
+def stats() -> dict[str, int]:
+    try:
+        hits, misses = get_redis().mget(HITS_KEY, MISSES_KEY)
+    except redis.RedisError:
+        hits, misses = None, None
+    return {"hits": int(hits or 0), "misses": int(misses or 0)}
@@ -1,8 +1,10 @@
 import re
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from app.core.config import settings
+from app.services import x12
+from app.utils.page_index import page_for_offset
 
 
 @dataclass
@@ -45,15 +47,6 @@ FIELD_NAMES = [
 ]
 
 
-def _find_match(artifacts: list[dict], pattern: str) -> Optional[tuple[re.Match, dict]]:
-    for artifact in artifacts:
-        text = artifact.get("text") or ""
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match, artifact
-    return None
-
-
 def _currency_value(amount: str) -> dict[str, Any]:
     clean = re.sub(r"[^0-9.]", "", amount)
     if not clean:
@@ -72,165 +65,189 @@ def _evidence_from_match(match: re.Match, artifact: dict) -> EvidenceRef:
     return EvidenceRef(
         artifact_id=artifact["id"],
         text_span=[match.start(), match.end()],
+        page=page_for_offset(artifact.get("page_offsets") or [0], match.start()),
+    )
+
+
+def evidence_to_json(evidence: Optional[EvidenceRef]) -> Optional[dict[str, Any]]:
+    if not evidence:
+        return None
+    return {
+        "artifact_id": evidence.artifact_id,
+        "text_span": evidence.text_span,
+        "page": evidence.page,
+    }
+
+
+def eligibility_needs_review(value: Any, confidence: float) -> bool:
+    return value == "unknown" or confidence < 0.8
+
+
+@dataclass(frozen=True)
+class FieldOutput:
+    field_name: str
+    group: int
+    convert: Callable[[str], Any]
+    confidence: float
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    prefix: str
+    pattern: str
+    outputs: tuple[FieldOutput, ...]
+
+    @property
+    def regex(self) -> str:
+        return re.escape(self.prefix) + self.pattern
+
+
+def _as_is(value: str) -> str:
+    return value
+
+
+def _lower(value: str) -> str:
+    return value.lower()
+
+
+def _strip(value: str) -> str:
+    return value.strip()
+
+
+def _amount_pair(label: str, total_field: str, remaining_field: str) -> FieldSpec:
+    return FieldSpec(
+        f"{label} total:",
+        r"\s*\$([0-9,.]+)\s*remaining:\s*\$([0-9,.]+)",
+        (
+            FieldOutput(total_field, 1, _currency_value, 0.7),
+            FieldOutput(remaining_field, 2, _currency_value, 0.7),
+        ),
     )
 
 
+FIELD_SPECS: tuple[FieldSpec, ...] = (
+    FieldSpec(
+        "Eligibility status:",
+        r"\s*(active|inactive|unknown)",
+        (FieldOutput("eligibility_status", 1, _lower, 0.9),),
+    ),
+    FieldSpec(
+        "Effective:",
+        r"\s*(\d{4}-\d{2}-\d{2})\s*to\s*(\d{4}-\d{2}-\d{2})",
+        (
+            FieldOutput("effective_from", 1, _as_is, 0.85),
+            FieldOutput("effective_to", 2, _as_is, 0.85),
+        ),
+    ),
+    FieldSpec("Copay:", r"\s*\$([0-9,.]+)", (FieldOutput("copay", 1, _currency_value, 0.7),)),
+    FieldSpec(
+        "Coinsurance:",
+        r"\s*([0-9,.]+%)",
+        (FieldOutput("coinsurance", 1, _percent_value, 0.7),),
+    ),
+    _amount_pair(
+        "Deductible individual", "deductible_total_individual", "deductible_remaining_individual"
+    ),
+    _amount_pair("Deductible family", "deductible_total_family", "deductible_remaining_family"),
+    _amount_pair(
+        "OOP max individual", "oop_max_total_individual", "oop_max_remaining_individual"
+    ),
+    _amount_pair("OOP max family", "oop_max_total_family", "oop_max_remaining_family"),
+    FieldSpec("Visit limit:", r"\s*([\w\s]+)", (FieldOutput("limitations", 1, _strip, 0.6),)),
+)
+
+
+class FieldScanner:
+    """Finds the first match of every spec with one pass per text.
+
+    Every spec starts with a literal prefix, so a single alternation of
+    zero-width lookaheads yields each candidate position; the full pattern is
+    only tried there. A match anchored at the earliest such position is the
+    same match ``re.search`` would return.
+    """
+
+    def __init__(self, specs: tuple[FieldSpec, ...]):
+        self.specs = specs
+        self._patterns = [re.compile(spec.regex, re.IGNORECASE) for spec in specs]
+
+        prefixes: list[str] = []
+        for spec in specs:
+            if spec.prefix.lower() not in [p.lower() for p in prefixes]:
+                prefixes.append(spec.prefix)
+        # Longest first so a prefix that contains another is reported; the
+        # shorter one's specs are tried at the same position.
+        prefixes.sort(key=len, reverse=True)
+        self._groups: dict[str, list[int]] = {}
+        alternatives = []
+        for index, prefix in enumerate(prefixes):
+            group = f"p{index}"
+            alternatives.append(f"(?P<{group}>{re.escape(prefix)})")
+            self._groups[group] = [
+                spec_index
+                for spec_index, spec in enumerate(specs)
+                if prefix.lower().startswith(spec.prefix.lower())
+            ]
+        self._anchor = re.compile(f"(?=(?:{'|'.join(alternatives)}))", re.IGNORECASE)
+
+    def scan(self, artifacts: list[dict]) -> list[Optional[tuple[re.Match, dict]]]:
+        found: list[Optional[tuple[re.Match, dict]]] = [None] * len(self.specs)
+        remaining = len(self.specs)
+        for artifact in artifacts:
+            text = artifact.get("text") or ""
+            for anchor in self._anchor.finditer(text):
+                for spec_index in self._groups[anchor.lastgroup]:
+                    if found[spec_index] is not None:
+                        continue
+                    match = self._patterns[spec_index].match(text, anchor.start())
+                    if match:
+                        found[spec_index] = (match, artifact)
+                        remaining -= 1
+                if not remaining:
+                    return found
+        return found
+
+
+_scanner = FieldScanner(FIELD_SPECS)
+
+
 def mock_extract(artifacts: list[dict]) -> ExtractionResult:
     results: list[FieldExtraction] = []
     raw_output: dict[str, Any] = {}
 
-    patterns = {
-        "eligibility_status": r"Eligibility status:\s*(active|inactive|unknown)",
-        "effective": r"Effective:\s*(\d{4}-\d{2}-\d{2})\s*to\s*(\d{4}-\d{2}-\d{2})",
-        "copay": r"Copay:\s*\$([0-9,.]+)",
-        "coinsurance": r"Coinsurance:\s*([0-9,.]+%)",
-        "deductible_individual": r"Deductible individual total:\s*\$([0-9,.]+)\s*remaining:\s*\$([0-9,.]+)",
-        "deductible_family": r"Deductible family total:\s*\$([0-9,.]+)\s*remaining:\s*\$([0-9,.]+)",
-        "oop_individual": r"OOP max individual total:\s*\$([0-9,.]+)\s*remaining:\s*\$([0-9,.]+)",
-        "oop_family": r"OOP max family total:\s*\$([0-9,.]+)\s*remaining:\s*\$([0-9,.]+)",
-        "limitations": r"Visit limit:\s*([\w\s]+)",
-    }
-
-    eligibility_match = _find_match(artifacts, patterns["eligibility_status"])
-    if eligibility_match:
-        match, artifact = eligibility_match
-        value = match.group(1).lower()
+    for spec, hit in zip(_scanner.specs, _scanner.scan(artifacts)):
+        if hit is None:
+            for output in spec.outputs:
+                results.append(FieldExtraction(output.field_name, "unknown", 0.0, None))
+            continue
+        match, artifact = hit
         evidence = _evidence_from_match(match, artifact)
-        results.append(FieldExtraction("eligibility_status", value, 0.9, evidence))
-    else:
-        results.append(FieldExtraction("eligibility_status", "unknown", 0.0, None))
-
-    effective_match = _find_match(artifacts, patterns["effective"])
-    if effective_match:
-        match, artifact = effective_match
-        from_date = match.group(1)
-        to_date = match.group(2)
-        evidence = _evidence_from_match(match, artifact)
-        results.append(FieldExtraction("effective_from", from_date, 0.85, evidence))
-        results.append(FieldExtraction("effective_to", to_date, 0.85, evidence))
-    else:
-        results.append(FieldExtraction("effective_from", "unknown", 0.0, None))
-        results.append(FieldExtraction("effective_to", "unknown", 0.0, None))
-
-    copay_match = _find_match(artifacts, patterns["copay"])
-    if copay_match:
-        match, artifact = copay_match
-        results.append(
-            FieldExtraction(
-                "copay", _currency_value(match.group(1)), 0.7, _evidence_from_match(match, artifact)
-            )
-        )
-    else:
-        results.append(FieldExtraction("copay", "unknown", 0.0, None))
-
-    coinsurance_match = _find_match(artifacts, patterns["coinsurance"])
-    if coinsurance_match:
-        match, artifact = coinsurance_match
-        results.append(
-            FieldExtraction(
-                "coinsurance",
-                _percent_value(match.group(1)),
-                0.7,
-                _evidence_from_match(match, artifact),
-            )
-        )
-    else:
-        results.append(FieldExtraction("coinsurance", "unknown", 0.0, None))
-
-    deductible_ind_match = _find_match(artifacts, patterns["deductible_individual"])
-    if deductible_ind_match:
-        match, artifact = deductible_ind_match
-        evidence = _evidence_from_match(match, artifact)
-        results.append(
-            FieldExtraction(
-                "deductible_total_individual", _currency_value(match.group(1)), 0.7, evidence
-            )
-        )
-        results.append(
-            FieldExtraction(
-                "deductible_remaining_individual", _currency_value(match.group(2)), 0.7, evidence
-            )
-        )
-    else:
-        results.append(FieldExtraction("deductible_total_individual", "unknown", 0.0, None))
-        results.append(FieldExtraction("deductible_remaining_individual", "unknown", 0.0, None))
-
-    deductible_fam_match = _find_match(artifacts, patterns["deductible_family"])
-    if deductible_fam_match:
-        match, artifact = deductible_fam_match
-        evidence = _evidence_from_match(match, artifact)
-        results.append(
-            FieldExtraction(
-                "deductible_total_family", _currency_value(match.group(1)), 0.7, evidence
-            )
-        )
-        results.append(
-            FieldExtraction(
-                "deductible_remaining_family", _currency_value(match.group(2)), 0.7, evidence
-            )
-        )
-    else:
-        results.append(FieldExtraction("deductible_total_family", "unknown", 0.0, None))
-        results.append(FieldExtraction("deductible_remaining_family", "unknown", 0.0, None))
-
-    oop_ind_match = _find_match(artifacts, patterns["oop_individual"])
-    if oop_ind_match:
-        match, artifact = oop_ind_match
-        evidence = _evidence_from_match(match, artifact)
-        results.append(
-            FieldExtraction("oop_max_total_individual", _currency_value(match.group(1)), 0.7, evidence)
-        )
-        results.append(
-            FieldExtraction(
-                "oop_max_remaining_individual", _currency_value(match.group(2)), 0.7, evidence
+        for output in spec.outputs:
+            results.append(
+                FieldExtraction(
+                    output.field_name,
+                    output.convert(match.group(output.group)),
+                    output.confidence,
+                    evidence,
+                )
             )
-        )
-    else:
-        results.append(FieldExtraction("oop_max_total_individual", "unknown", 0.0, None))
-        results.append(FieldExtraction("oop_max_remaining_individual", "unknown", 0.0, None))
-
-    oop_fam_match = _find_match(artifacts, patterns["oop_family"])
-    if oop_fam_match:
-        match, artifact = oop_fam_match
-        evidence = _evidence_from_match(match, artifact)
-        results.append(
-            FieldExtraction("oop_max_total_family", _currency_value(match.group(1)), 0.7, evidence)
-        )
-        results.append(
-            FieldExtraction("oop_max_remaining_family", _currency_value(match.group(2)), 0.7, evidence)
-        )
-    else:
-        results.append(FieldExtraction("oop_max_total_family", "unknown", 0.0, None))
-        results.append(FieldExtraction("oop_max_remaining_family", "unknown", 0.0, None))
-
-    limitations_match = _find_match(artifacts, patterns["limitations"])
-    if limitations_match:
-        match, artifact = limitations_match
-        results.append(
-            FieldExtraction(
-                "limitations", match.group(1).strip(), 0.6, _evidence_from_match(match, artifact)
-            )
-        )
-    else:
-        results.append(FieldExtraction("limitations", "unknown", 0.0, None))
 
     for field in results:
         raw_output[field.field_name] = {
             "value": field.value,
             "confidence": field.confidence,
-            "evidence": None if not field.evidence else {
-                "artifact_id": field.evidence.artifact_id,
-                "text_span": field.evidence.text_span,
-                "page": field.evidence.page,
-            },
+            "evidence": evidence_to_json(field.evidence),
         }
 
-    needs_review = True
-    eligibility = next((f for f in results if f.field_name == "eligibility_status"), None)
-    if eligibility and eligibility.value != "unknown" and eligibility.confidence >= 0.8:
-        needs_review = False
+    return ExtractionResult(
+        raw_output=raw_output, fields=results, needs_review=_needs_review(results)
+    )
+
 
-    return ExtractionResult(raw_output=raw_output, fields=results, needs_review=needs_review)
+def _needs_review(fields: list[FieldExtraction]) -> bool:
+    eligibility = next((f for f in fields if f.field_name == "eligibility_status"), None)
+    return eligibility is None or eligibility_needs_review(
+        eligibility.value, eligibility.confidence
+    )
 
 
 def extract_with_llm(artifacts: list[dict]) -> ExtractionResult:
@@ -238,3 +255,68 @@ def extract_with_llm(artifacts: list[dict]) -> ExtractionResult:
         return mock_extract(artifacts)
     # Placeholder for real LLM integration.
     return mock_extract(artifacts)
+
+
+def _extract_x12(
+    artifacts: list[dict], service_category: Optional[str]
+) -> tuple[dict[str, FieldExtraction], list[dict], list[str]]:
+    found: dict[str, FieldExtraction] = {}
+    unparsed: list[dict] = []
+    rejections: list[str] = []
+    for artifact in artifacts:
+        try:
+            parsed = x12.parse_271(x12.chunked(artifact["text"]), service_category)
+        except x12.X12Error:
+            unparsed.append(artifact)
+            continue
+        rejections.extend(parsed.rejections)
+        offsets = artifact.get("page_offsets") or [0]
+        for name, field in parsed.fields.items():
+            if name in found:
+                continue
+            evidence = EvidenceRef(
+                artifact_id=artifact["id"],
+                text_span=field.span,
+                page=page_for_offset(offsets, field.span[0]),
+            )
+            found[name] = FieldExtraction(name, field.value, field.confidence, evidence)
+    return found, unparsed, rejections
+
+
+def extract_fields(
+    artifacts: list[dict], service_category: Optional[str] = None
+) -> ExtractionResult:
+    """Read X12 271 artifacts directly and send only the rest to the LLM.
+
+    The LLM is skipped entirely when the 271s answer every field.
+    """
+    structured = [a for a in artifacts if x12.is_x12(a.get("text") or "")]
+    if not structured:
+        return extract_with_llm(artifacts)
+    found, unparsed, rejections = _extract_x12(structured, service_category)
+    others = [a for a in artifacts if not x12.is_x12(a.get("text") or "")] + unparsed
+
+    fallback: dict[str, FieldExtraction] = {}
+    if others and any(name not in found for name in FIELD_NAMES):
+        fallback = {
+            field.field_name: field
+            for field in extract_with_llm(others).fields
+            if field.value != "unknown"
+        }
+
+    results: list[FieldExtraction] = []
+    raw_output: dict[str, Any] = {}
+    for name in FIELD_NAMES:
+        field = found.get(name) or fallback.get(name) or FieldExtraction(name, "unknown", 0.0, None)
+        results.append(field)
+        raw_output[name] = {
+            "value": field.value,
+            "confidence": field.confidence,
+            "evidence": evidence_to_json(field.evidence),
+            "source": "x12" if name in found else "llm",
+        }
+    if rejections:
+        raw_output["x12_rejections"] = rejections
+    return ExtractionResult(
+        raw_output=raw_output, fields=results, needs_review=_needs_review(results)
+    )
@@ -0,0 +1,209 @@
+from datetime import date, datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db import models
+
+# Upper bounds (minutes) of the duration histogram buckets; the last bucket is open.
+DURATION_BUCKETS = [1, 2, 5, 10, 15, 30, 60, 120, 240, 480, 1440, 2880, 10080]
+OPEN_BUCKET = "inf"
+
+STATUS_BY_EVENT = {
+    "verification_created": "pending",
+    "verification_finalized": "finalized",
+    "verification_failed": "blocked_needs_evidence",
+}
+DURATION_METRIC_BY_EVENT = {
+    "extraction_completed": "time_to_draft",
+    "verification_finalized": "time_to_finalize",
+}
+TRACKED_EVENTS = set(STATUS_BY_EVENT) | set(DURATION_METRIC_BY_EVENT)
+
+RollupKey = tuple[UUID, date, str, str]
+
+
+def _bucket(minutes: float) -> str:
+    for bound in DURATION_BUCKETS:
+        if minutes <= bound:
+            return str(bound)
+    return OPEN_BUCKET
+
+
+def _to_uuid(value: Any) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def _add(deltas: dict[RollupKey, list[float]], key: RollupKey, value: float = 0.0) -> None:
+    entry = deltas.setdefault(key, [0, 0.0])
+    entry[0] += 1
+    entry[1] += value
+
+
+def rollup_deltas(
+    rows: list[dict[str, Any]], created_at_by_verification: dict[UUID, datetime]
+) -> dict[RollupKey, list[float]]:
+    deltas: dict[RollupKey, list[float]] = {}
+    for row in rows:
+        event_type = row["event_type"]
+        if event_type not in TRACKED_EVENTS or row["entity_type"] != "verification":
+            continue
+        tenant_id = _to_uuid(row["tenant_id"])
+        created_at: datetime = row["created_at"]
+        day = created_at.date()
+        diff = row.get("diff_json") if isinstance(row.get("diff_json"), dict) else {}
+
+        if event_type == "verification_created":
+            _add(deltas, (tenant_id, day, "verifications_created", ""))
+        status = diff.get("status") if event_type == "extraction_completed" else None
+        status = status or STATUS_BY_EVENT.get(event_type)
+        if status:
+            _add(deltas, (tenant_id, day, "status_entered", status))
+        if event_type == "verification_failed":
+            reason = str(diff.get("reason") or "unknown")[:128]
+            _add(deltas, (tenant_id, day, "failure_reason", reason))
+
+        # Re-extractions still enter a status, but draft outcomes and time to
+        # draft count each verification once, at its first draft. Events
+        # written before first_draft was recorded count as first drafts.
+        first_draft = event_type != "extraction_completed" or diff.get("first_draft", True)
+        if event_type == "extraction_completed" and first_draft and status:
+            _add(deltas, (tenant_id, day, "draft_outcome", status))
+
+        metric = DURATION_METRIC_BY_EVENT.get(event_type) if first_draft else None
+        verification_created_at = created_at_by_verification.get(_to_uuid(row["entity_id"]))
+        if metric and verification_created_at:
+            minutes = (created_at - verification_created_at).total_seconds() / 60
+            _add(deltas, (tenant_id, day, metric, _bucket(minutes)), minutes)
+    return deltas
+
+
+def apply_events(db: Session, rows: list[dict[str, Any]]) -> None:
+    tracked = [
+        row
+        for row in rows
+        if row["event_type"] in TRACKED_EVENTS and row["entity_type"] == "verification"
+    ]
+    if not tracked:
+        return
+    needs_created_at = {
+        _to_uuid(row["entity_id"])
+        for row in tracked
+        if row["event_type"] in DURATION_METRIC_BY_EVENT
+    }
+    created_at_by_verification: dict[UUID, datetime] = {}
+    if needs_created_at:
+        created_at_by_verification = dict(
+            db.query(models.Verification.id, models.Verification.created_at).filter(
+                models.Verification.id.in_(needs_created_at)
+            )
+        )
+
+    deltas = rollup_deltas(tracked, created_at_by_verification)
+    if not deltas:
+        return
+    # Sorted so concurrent flushes take row locks in the same order.
+    values = [
+        {
+            "tenant_id": tenant_id,
+            "day": day,
+            "metric": metric,
+            "dimension": dimension,
+            "count": count,
+            "total": total,
+        }
+        for (tenant_id, day, metric, dimension), (count, total) in sorted(
+            deltas.items(), key=lambda item: (str(item[0][0]), item[0][1:])
+        )
+    ]
+    stmt = insert(models.MetricRollup).values(values)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["tenant_id", "day", "metric", "dimension"],
+            set_={
+                "count": models.MetricRollup.count + stmt.excluded.count,
+                "total": models.MetricRollup.total + stmt.excluded.total,
+            },
+        )
+    )
+
+
+def approximate_median(histogram: dict[str, tuple[int, float]]) -> Optional[float]:
+    total_count = sum(count for count, _ in histogram.values())
+    if not total_count:
+        return None
+    midpoint = total_count / 2
+    seen = 0
+    lower = 0.0
+    for bound in [*DURATION_BUCKETS, OPEN_BUCKET]:
+        count, total = histogram.get(str(bound), (0, 0.0))
+        if count and seen + count >= midpoint:
+            if bound == OPEN_BUCKET:
+                return total / count
+            # Linear interpolation inside the bucket that holds the median.
+            return lower + (midpoint - seen) / count * (bound - lower)
+        seen += count
+        if bound != OPEN_BUCKET:
+            lower = float(bound)
+    return None
+
+
+def load_rollups(
+    db: Session,
+    tenant_id: UUID,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> dict[str, dict[str, tuple[int, float]]]:
+    query = db.query(
+        models.MetricRollup.metric,
+        models.MetricRollup.dimension,
+        func.sum(models.MetricRollup.count),
+        func.sum(models.MetricRollup.total),
+    ).filter(models.MetricRollup.tenant_id == tenant_id)
+    if date_from:
+        query = query.filter(models.MetricRollup.day >= date_from)
+    if date_to:
+        query = query.filter(models.MetricRollup.day <= date_to)
+    query = query.group_by(models.MetricRollup.metric, models.MetricRollup.dimension)
+
+    rollups: dict[str, dict[str, tuple[int, float]]] = {}
+    for metric, dimension, count, total in query:
+        rollups.setdefault(metric, {})[dimension] = (int(count or 0), float(total or 0))
+    return rollups
+
+
+def rebuild(db: Session, tenant_id: Optional[UUID] = None, chunk_size: int = 5000) -> int:
+    delete_query = db.query(models.MetricRollup)
+    event_query = db.query(models.AuditEvent).filter(
+        models.AuditEvent.event_type.in_(TRACKED_EVENTS),
+        models.AuditEvent.entity_type == "verification",
+    )
+    if tenant_id:
+        delete_query = delete_query.filter(models.MetricRollup.tenant_id == tenant_id)
+        event_query = event_query.filter(models.AuditEvent.tenant_id == tenant_id)
+    delete_query.delete(synchronize_session=False)
+
+    processed = 0
+    batch: list[dict[str, Any]] = []
+    for event in event_query.order_by(models.AuditEvent.created_at).yield_per(chunk_size):
+        batch.append(
+            {
+                "tenant_id": event.tenant_id,
+                "event_type": event.event_type,
+                "entity_type": event.entity_type,
+                "entity_id": event.entity_id,
+                "diff_json": event.diff_json,
+                "created_at": event.created_at,
+            }
+        )
+        if len(batch) >= chunk_size:
+            apply_events(db, batch)
+            processed += len(batch)
+            batch = []
+    apply_events(db, batch)
+    processed += len(batch)
+    db.commit()
+    return processed
@@ -0,0 +1,278 @@
+"""Stand-in payer for load tests: realistic latency, failures, throttling and 271s.
+
+Use it in-process through ``SimulatorConnector`` or serve it over HTTP with
+``scripts/run_payer_simulator.py``; both draw from the same profiles.
+"""
+import asyncio
+import math
+import random
+import zlib
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import FastAPI, Request, Response
+
+from app.core.config import settings
+from app.services import x12
+from app.utils.rate_limit import TokenBucket
+
+# Extra service types padded into large responses, as real payers do.
+FILLER_SERVICE_TYPES = ["1", "33", "35", "47", "48", "50", "86", "88", "98", "AL", "MH", "UC"]
+
+
+@dataclass(frozen=True)
+class PayerProfile:
+    latency_median_ms: float = 400.0
+    latency_p99_ms: float = 4000.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    rate_limit_per_second: float = 0.0  # 0 disables rate-based 429s
+    plan_count: int = 1
+    benefit_loops_per_plan: int = 12
+    response_format: str = "text"  # text or x12
+    batch_inquiry_ms: float = 2.0  # extra latency per subscriber in a batched 270
+
+    def sample_latency(self, rng: random.Random) -> float:
+        # Lognormal fitted to the median and p99 (z = 2.326).
+        mu = math.log(self.latency_median_ms)
+        sigma = max(0.0, math.log(self.latency_p99_ms / self.latency_median_ms) / 2.326)
+        return rng.lognormvariate(mu, sigma) / 1000
+
+
+def profile_for(payer_name: str) -> PayerProfile:
+    known = {f.name for f in fields(PayerProfile)}
+    profiles = settings.payer_simulator_profiles
+    overrides = {**profiles.get("default", {}), **profiles.get(payer_name.strip().lower(), {})}
+    return PayerProfile(**{key: value for key, value in overrides.items() if key in known})
+
+
+@dataclass
+class SimulatedResponse:
+    status_code: int
+    body: str = ""
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+def _member_rng(payload: dict) -> random.Random:
+    # Benefit amounts stay stable for a member across calls.
+    seed = f"{payload.get('payer_name')}|{payload.get('member_id')}".lower()
+    return random.Random(zlib.crc32(seed.encode("utf-8")))
+
+
+def _is_active(member_id: str) -> bool:
+    return member_id[-1].isdigit() and int(member_id[-1]) % 2 == 0
+
+
+def _plan_amounts(rng: random.Random) -> dict[str, float]:
+    deductible = rng.choice([250, 500, 1000, 1500, 3000])
+    oop = deductible * rng.choice([3, 4, 5])
+    return {
+        "copay": rng.choice([10, 20, 25, 30, 40, 50]),
+        "coinsurance": rng.choice([10, 20, 30]),
+        "deductible": deductible,
+        "deductible_remaining": round(deductible * rng.random()),
+        "oop": oop,
+        "oop_remaining": round(oop * rng.random()),
+        "visits": rng.choice([12, 20, 30, 60]),
+    }
+
+
+def render_text(payload: dict, profile: PayerProfile) -> str:
+    rng = _member_rng(payload)
+    member_id = payload["member_id"]
+    status = "active" if _is_active(member_id) else "inactive"
+    lines = [f"Member ID: {member_id}", f"Payer: {payload.get('payer_name', '').title()}"]
+    for plan in range(profile.plan_count):
+        amounts = _plan_amounts(rng)
+        lines += [
+            f"Plan: {'Primary' if plan == 0 else f'Additional plan {plan}'}",
+            f"Eligibility status: {status}",
+            "Effective: 2024-01-01 to 2024-12-31",
+            f"Copay: ${amounts['copay']}",
+            f"Coinsurance: {amounts['coinsurance']}%",
+            f"Deductible individual total: ${amounts['deductible']} "
+            f"remaining: ${amounts['deductible_remaining']}",
+            f"Deductible family total: ${amounts['deductible'] * 2} "
+            f"remaining: ${amounts['deductible_remaining'] * 2}",
+            f"OOP max individual total: ${amounts['oop']} remaining: ${amounts['oop_remaining']}",
+            f"OOP max family total: ${amounts['oop'] * 2} "
+            f"remaining: ${amounts['oop_remaining'] * 2}",
+            f"Visit limit: {amounts['visits']} visits per year",
+        ]
+        for loop in range(profile.benefit_loops_per_plan):
+            code = FILLER_SERVICE_TYPES[loop % len(FILLER_SERVICE_TYPES)]
+            lines.append(f"Service type {code} copay ${rng.choice([0, 15, 35, 75])}")
+    return "\n".join(lines) + "\n"
+
+
+def _x12_header(payer: str, control: str, now: datetime) -> list[str]:
+    return [
+        f"BHT*0022*11*{control}*{now:%Y%m%d}*{now:%H%M}",
+        "HL*1**20*1",
+        f"NM1*PR*2*{payer}*****PI*{x12.payer_identifier(payer)}",
+        "HL*2*1*21*1",
+        f"NM1*1P*2*{x12.PROVIDER_NAME}*****XX*{x12.PROVIDER_NPI}",
+    ]
+
+
+def _x12_subscriber(
+    payload: dict, profile: PayerProfile, rng: random.Random, number: int, trace: str
+) -> list[str]:
+    member_id = (payload.get("member_id") or "").strip()
+    first, _, last = (payload.get("patient_name") or "JANE DOE").upper().rpartition(" ")
+    loop = [
+        f"HL*{number}*2*22*0",
+        f"TRN*2*{trace}*{x12.TRACE_ORIGINATOR}",
+        f"NM1*IL*1*{last}*{first}****MI*{member_id}",
+    ]
+    if not member_id:
+        # 72: invalid or missing member id.
+        return loop + ["AAA*N**72*C"]
+    dob = (payload.get("date_of_birth") or "1970-01-01").replace("-", "")
+    service_type = payload.get("service_type") or x12.service_type_for(
+        payload.get("service_category")
+    )
+    loop.append(f"DMG*D8*{dob}")
+    status = "1" if _is_active(member_id) else "6"
+    for plan in range(profile.plan_count):
+        amounts = _plan_amounts(rng)
+        name = "PRIMARY PLAN" if plan == 0 else f"ADDITIONAL PLAN {plan}"
+        loop += [
+            f"EB*{status}*IND*{service_type}*PR*{name}",
+            "DTP*291*RD8*20240101-20241231",
+            f"EB*B*IND*{service_type}*PR**27*{amounts['copay']}",
+            f"EB*A*IND*{service_type}*PR****{amounts['coinsurance'] / 100:.2f}",
+            f"EB*C*IND*{service_type}*PR**23*{amounts['deductible']}",
+            f"EB*C*IND*{service_type}*PR**29*{amounts['deductible_remaining']}",
+            f"EB*C*FAM*{service_type}*PR**23*{amounts['deductible'] * 2}",
+            f"EB*C*FAM*{service_type}*PR**29*{amounts['deductible_remaining'] * 2}",
+            f"EB*G*IND*{service_type}*PR**23*{amounts['oop']}",
+            f"EB*G*IND*{service_type}*PR**29*{amounts['oop_remaining']}",
+            f"EB*G*FAM*{service_type}*PR**23*{amounts['oop'] * 2}",
+            f"EB*G*FAM*{service_type}*PR**29*{amounts['oop_remaining'] * 2}",
+            f"EB*F*IND*{service_type}*PR*****VS*{amounts['visits']}",
+            f"MSG*{amounts['visits']} VISITS PER YEAR",
+        ]
+        for loop_number in range(profile.benefit_loops_per_plan):
+            code = FILLER_SERVICE_TYPES[loop_number % len(FILLER_SERVICE_TYPES)]
+            loop.append(f"EB*B*IND*{code}*PR**27*{rng.choice([0, 15, 35, 75])}")
+    return loop
+
+
+def render_x12(payload: dict, profile: PayerProfile) -> str:
+    rng = _member_rng(payload)
+    now = datetime.now(timezone.utc)
+    payer = (payload.get("payer_name") or "PAYER").upper()
+    control = f"{rng.randrange(10**9):09d}"
+    body = _x12_header(payer, control, now) + _x12_subscriber(payload, profile, rng, 3, control)
+    return x12.interchange("HB", "271", payer, x12.SUBMITTER_ID, control, body, now)
+
+
+def render_x12_batch(inquiries: list[dict], profile: PayerProfile, control: str) -> str:
+    """One 271 answering every subscriber of a batched 270, echoing their traces."""
+    now = datetime.now(timezone.utc)
+    payer = (inquiries[0].get("payer_name") or "PAYER").upper()
+    body = _x12_header(payer, control, now)
+    for number, inquiry in enumerate(inquiries, start=3):
+        body += _x12_subscriber(inquiry, profile, _member_rng(inquiry), number, inquiry["trace"])
+    return x12.interchange("HB", "271", payer, x12.SUBMITTER_ID, control, body, now)
+
+
+class PayerSimulator:
+    def __init__(self, seed: Optional[int] = None):
+        self._rng = random.Random(seed)
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def _throttled(self, payer_name: str, profile: PayerProfile) -> bool:
+        if profile.throttle_rate and self._rng.random() < profile.throttle_rate:
+            return True
+        if not profile.rate_limit_per_second:
+            return False
+        key = payer_name.strip().lower()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate = profile.rate_limit_per_second
+            bucket = self._buckets[key] = TokenBucket(rate, max(1, int(rate)))
+        return not bucket.try_acquire()
+
+    async def _fail(
+        self, payer_name: str, profile: PayerProfile, extra_seconds: float = 0.0
+    ) -> Optional[SimulatedResponse]:
+        """Wait out the payer's latency; returns the throttle or error it answers with, if any."""
+        if self._throttled(payer_name, profile):
+            # Throttles come back fast, like a gateway rejecting at the edge.
+            await asyncio.sleep(profile.sample_latency(self._rng) / 10)
+            return SimulatedResponse(429, "rate limited", {"Retry-After": "1"})
+        await asyncio.sleep(profile.sample_latency(self._rng) + extra_seconds)
+        if self._rng.random() < profile.error_rate:
+            return SimulatedResponse(self._rng.choice([500, 502, 503, 504]), "payer error")
+        return None
+
+    async def respond(self, payload: dict) -> SimulatedResponse:
+        payer_name = payload.get("payer_name") or ""
+        profile = profile_for(payer_name)
+        failure = await self._fail(payer_name, profile)
+        if failure:
+            return failure
+        if not (payload.get("member_id") or "").strip():
+            return SimulatedResponse(400, "missing member id")
+        if profile.response_format == "x12":
+            body, content_type = render_x12(payload, profile), "application/edi-x12"
+        else:
+            body, content_type = render_text(payload, profile), "text/plain"
+        return SimulatedResponse(200, body, {"Content-Type": content_type})
+
+    async def respond_batch(self, interchange: str) -> SimulatedResponse:
+        try:
+            control = x12.interchange_control(interchange)
+            inquiries = list(x12.iter_270(x12.chunked(interchange)))
+        except x12.X12Error as exc:
+            return SimulatedResponse(400, str(exc))
+        if not inquiries:
+            return SimulatedResponse(400, "no inquiries in batch")
+        payer_name = inquiries[0]["payer_name"]
+        profile = profile_for(payer_name)
+        failure = await self._fail(
+            payer_name, profile, len(inquiries) * profile.batch_inquiry_ms / 1000
+        )
+        if failure:
+            return failure
+        body = render_x12_batch(inquiries, profile, control)
+        return SimulatedResponse(200, body, {"Content-Type": "application/edi-x12"})
+
+
+_simulator: Optional[PayerSimulator] = None
+
+
+def get_simulator() -> PayerSimulator:
+    global _simulator
+    if _simulator is None:
+        _simulator = PayerSimulator(settings.payer_simulator_seed)
+    return _simulator
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(title="Payer simulator")
+
+    @app.post("/eligibility")
+    async def eligibility(request: Request) -> Response:
+        result = await get_simulator().respond(await request.json())
+        return Response(
+            content=result.body,
+            status_code=result.status_code,
+            headers=result.headers,
+            media_type=result.headers.get("Content-Type", "text/plain"),
+        )
+
+    @app.post("/eligibility/batch")
+    async def eligibility_batch(request: Request) -> Response:
+        result = await get_simulator().respond_batch((await request.body()).decode("utf-8"))
+        return Response(
+            content=result.body,
+            status_code=result.status_code,
+            headers=result.headers,
+            media_type=result.headers.get("Content-Type", "text/plain"),
+        )
+
+    return app
@@ -1,53 +1,522 @@
+import asyncio
+import atexit
+import functools
+import hashlib
+import hmac
 import io
-from typing import Optional
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Protocol, TypeVar
+from urllib.parse import quote, urlencode
 
 import boto3
+import redis
 from botocore.client import Config
+from botocore.exceptions import ClientError
+from botocore.utils import determine_content_length
 
 from app.core.config import settings
+from app.core.redis import get_redis
+from app.utils.compression import compress_text
 
+logger = logging.getLogger(__name__)
 
-def get_s3_client():
-    return boto3.client(
-        "s3",
-        endpoint_url=settings.object_storage_endpoint,
-        aws_access_key_id=settings.object_storage_access_key,
-        aws_secret_access_key=settings.object_storage_secret_key,
-        region_name=settings.object_storage_region,
-        use_ssl=settings.object_storage_secure,
-        config=Config(signature_version="s3v4"),
+T = TypeVar("T")
+
+STATS_KEY = "storage:stats"
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_pid: Optional[int] = None
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    global _io_executor, _io_executor_pid
+    if _io_executor is None or _io_executor_pid != os.getpid():
+        _io_executor = ThreadPoolExecutor(
+            max_workers=settings.storage_io_workers, thread_name_prefix="storage-io"
+        )
+        _io_executor_pid = os.getpid()
+    return _io_executor
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking object-store call on the dedicated storage pool.
+
+    Kept apart from the default threadpool so slow uploads cannot starve the
+    threads FastAPI uses for sync routes and DB work.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_io_executor(), functools.partial(func, *args, **kwargs)
     )
 
 
-def ensure_bucket_exists():
-    client = get_s3_client()
-    buckets = client.list_buckets().get("Buckets", [])
-    if not any(bucket["Name"] == settings.object_storage_bucket for bucket in buckets):
-        client.create_bucket(Bucket=settings.object_storage_bucket)
+_client = None
+_client_lock = threading.Lock()
+
+# Below this size a single PutObject beats spinning up a transfer manager.
+SINGLE_PUT_MAX_BYTES = 8 * 1024 * 1024
+
+
+def _request_bytes(params: dict[str, Any]) -> int:
+    body = params.get("body")
+    if not body:
+        return 0
+    return determine_content_length(body) or 0
+
+
+def _before_call(model, params, context, **kwargs) -> None:
+    context["storage_started"] = time.perf_counter()
+    context["storage_bytes_sent"] = _request_bytes(params)
+
+
+class _StatsBuffer:
+    """Storage counters summed in process and pushed to Redis in one pipeline.
+
+    Recording an S3 call only touches a dict; a daemon thread flushes every
+    ``flush_interval`` seconds, and on shutdown. Counts from a failed flush
+    are merged back, so they are late rather than lost.
+    """
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._counts: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, counts: dict[str, float]) -> None:
+        with self._lock:
+            for field, amount in counts.items():
+                self._counts[field] = self._counts.get(field, 0) + amount
+        self._ensure_thread()
+
+    def flush(self) -> None:
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if not counts:
+            return
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for field, amount in counts.items():
+                if isinstance(amount, float):
+                    pipe.hincrbyfloat(STATS_KEY, field, amount)
+                else:
+                    pipe.hincrby(STATS_KEY, field, amount)
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("Could not flush storage stats, keeping them for the next flush")
+            self.add(counts)
+
+    def reset(self) -> None:
+        # Called in forked children: the parent still owns its pending counts.
+        self._counts = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="storage-stats", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+
+_stats = _StatsBuffer(flush_interval=settings.storage_stats_flush_interval_seconds)
+atexit.register(_stats.flush)
+os.register_at_fork(after_in_child=_stats.reset)
+
+
+def flush_stats() -> None:
+    _stats.flush()
+
+
+def _record(operation: str, context: dict, error: bool, bytes_received: int = 0) -> None:
+    started = context.get("storage_started")
+    if started is None:
+        return
+    counts: dict[str, float] = {
+        f"{operation}.calls": 1,
+        f"{operation}.seconds": time.perf_counter() - started,
+        "bytes_sent": context.get("storage_bytes_sent", 0),
+        "bytes_received": bytes_received,
+    }
+    if error:
+        counts[f"{operation}.errors"] = 1
+    _stats.add(counts)
+
+
+def _after_call(http_response, parsed, model, context, **kwargs) -> None:
+    received = 0
+    if http_response.status_code < 300:
+        received = int(http_response.headers.get("content-length") or 0)
+    _record(model.name, context, http_response.status_code >= 300, received)
+
+
+def _after_call_error(exception, context, **kwargs) -> None:
+    _record(context.get("storage_operation", "unknown"), context, True)
+
+
+def _before_parameter_build(model, context, **kwargs) -> None:
+    # after-call-error does not carry the operation model.
+    context["storage_operation"] = model.name
+
+
+def _reset_client() -> None:
+    # Forked children must not share the parent's pooled sockets.
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_client)
+
+
+def get_s3_client():
+    """Process-wide S3 client with a pooled connection set and retries."""
+    global _client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is None:
+            client = boto3.client(
+                "s3",
+                endpoint_url=settings.object_storage_endpoint,
+                aws_access_key_id=settings.object_storage_access_key,
+                aws_secret_access_key=settings.object_storage_secret_key,
+                region_name=settings.object_storage_region,
+                use_ssl=settings.object_storage_secure,
+                config=Config(
+                    signature_version="s3v4",
+                    max_pool_connections=settings.object_storage_max_pool_connections,
+                    retries={
+                        "mode": "standard",
+                        "total_max_attempts": settings.object_storage_max_attempts,
+                    },
+                ),
+            )
+            client.meta.events.register("before-parameter-build.s3", _before_parameter_build)
+            client.meta.events.register("before-call.s3", _before_call)
+            client.meta.events.register("after-call.s3", _after_call)
+            client.meta.events.register("after-call-error.s3", _after_call_error)
+            _client = client
+    return _client
+
+
+def stats() -> dict[str, Any]:
+    _stats.flush()
+    try:
+        raw = get_redis().hgetall(STATS_KEY)
+    except redis.RedisError:
+        raw = {}
+    operations: dict[str, dict[str, float]] = {}
+    for field, value in raw.items():
+        if "." not in field:
+            continue
+        operation, metric = field.rsplit(".", 1)
+        operations.setdefault(operation, {})[metric] = float(value)
+    return {
+        "bytes_sent": int(raw.get("bytes_sent", 0)),
+        "bytes_received": int(raw.get("bytes_received", 0)),
+        "operations": operations,
+    }
+
+
+class MultipartWriter(Protocol):
+    def upload_part(self, data: bytes) -> None:
+        ...
+
+    def complete(self) -> None:
+        ...
+
+    def abort(self) -> None:
+        ...
+
+
+class StorageBackend(Protocol):
+    def ensure_ready(self) -> None:
+        ...
+
+    def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        ...
+
+    def get(self, key: str) -> bytes:
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+    def start_multipart(self, key: str, content_type: Optional[str] = None) -> MultipartWriter:
+        ...
+
+    def presigned_url(self, key: str, expires_in: int, filename: Optional[str] = None) -> str:
+        ...
+
+    def local_file(self, key: str):
+        """Context manager yielding a filesystem path with the object's bytes."""
+        ...
+
+
+def content_disposition(filename: str) -> str:
+    return f"attachment; filename*=UTF-8''{quote(filename)}"
+
+
+class S3MultipartUpload:
+    """S3 multipart upload fed part by part, so callers never hold the whole object."""
+
+    def __init__(self, key: str, content_type: Optional[str] = None):
+        self.key = key
+        self._client = get_s3_client()
+        extra = {"ContentType": content_type} if content_type else {}
+        self.upload_id = self._client.create_multipart_upload(
+            Bucket=settings.object_storage_bucket, Key=key, **extra
+        )["UploadId"]
+        self._parts: list[dict[str, Any]] = []
+
+    def upload_part(self, data: bytes) -> None:
+        # Every part but the last must be at least 5 MiB.
+        part_number = len(self._parts) + 1
+        response = self._client.upload_part(
+            Bucket=settings.object_storage_bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=data,
+        )
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+
+    def complete(self) -> None:
+        if not self._parts:
+            self.upload_part(b"")
+        self._client.complete_multipart_upload(
+            Bucket=settings.object_storage_bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self._parts},
+        )
+
+    def abort(self) -> None:
+        self._client.abort_multipart_upload(
+            Bucket=settings.object_storage_bucket, Key=self.key, UploadId=self.upload_id
+        )
+
+
+class S3Backend:
+    def __init__(self) -> None:
+        self._bucket_ready = False
+
+    def ensure_ready(self) -> None:
+        """Create the bucket if needed; checked once per process."""
+        if self._bucket_ready:
+            return
+        client = get_s3_client()
+        try:
+            client.head_bucket(Bucket=settings.object_storage_bucket)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") not in ("404", "NoSuchBucket"):
+                raise
+            try:
+                client.create_bucket(Bucket=settings.object_storage_bucket)
+            except client.exceptions.BucketAlreadyOwnedByYou:
+                pass
+        self._bucket_ready = True
+
+    def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        client = get_s3_client()
+        extra = {}
+        if content_type:
+            extra["ContentType"] = content_type
+        if len(data) <= SINGLE_PUT_MAX_BYTES:
+            client.put_object(Bucket=settings.object_storage_bucket, Key=key, Body=data, **extra)
+            return
+        client.upload_fileobj(
+            io.BytesIO(data), settings.object_storage_bucket, key, ExtraArgs=extra
+        )
+
+    def get(self, key: str) -> bytes:
+        response = get_s3_client().get_object(Bucket=settings.object_storage_bucket, Key=key)
+        return response["Body"].read()
+
+    def delete(self, key: str) -> None:
+        get_s3_client().delete_object(Bucket=settings.object_storage_bucket, Key=key)
+
+    def start_multipart(self, key: str, content_type: Optional[str] = None) -> S3MultipartUpload:
+        return S3MultipartUpload(key, content_type)
+
+    def presigned_url(self, key: str, expires_in: int, filename: Optional[str] = None) -> str:
+        params = {"Bucket": settings.object_storage_bucket, "Key": key}
+        if filename:
+            params["ResponseContentDisposition"] = content_disposition(filename)
+        return get_s3_client().generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=expires_in
+        )
+
+    @contextmanager
+    def local_file(self, key: str) -> Iterator[str]:
+        # Streams the body to disk instead of materialising it in memory first.
+        with tempfile.NamedTemporaryFile(delete=False) as tmp:
+            get_s3_client().download_fileobj(settings.object_storage_bucket, key, tmp)
+        try:
+            yield tmp.name
+        finally:
+            os.unlink(tmp.name)
+
+
+class LocalMultipartUpload:
+    def __init__(self, backend: "LocalBackend", key: str):
+        self.key = key
+        self._target = backend.path_for(key)
+        self._target.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = tempfile.NamedTemporaryFile(
+            dir=self._target.parent, prefix=".upload-", delete=False
+        )
+
+    def upload_part(self, data: bytes) -> None:
+        self._tmp.write(data)
+
+    def complete(self) -> None:
+        self._tmp.flush()
+        os.fsync(self._tmp.fileno())
+        self._tmp.close()
+        os.replace(self._tmp.name, self._target)
+
+    def abort(self) -> None:
+        self._tmp.close()
+        try:
+            os.unlink(self._tmp.name)
+        except FileNotFoundError:
+            pass
+
+
+class LocalBackend:
+    """Objects stored as files under ``local_storage_root``.
+
+    Paths are ``root/ab/cd/<sha256 of key>``: two levels of fan-out keep
+    directories small, and hashing the key means user-supplied filenames
+    never become path components. Writes go to a temp file in the target
+    directory and are renamed into place, so readers never see partial data.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def path_for(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    def ensure_ready(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def put(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        upload = self.start_multipart(key, content_type)
+        try:
+            upload.upload_part(data)
+            upload.complete()
+        except BaseException:
+            upload.abort()
+            raise
+
+    def get(self, key: str) -> bytes:
+        return self.path_for(key).read_bytes()
+
+    def delete(self, key: str) -> None:
+        self.path_for(key).unlink(missing_ok=True)
+
+    def start_multipart(
+        self, key: str, content_type: Optional[str] = None
+    ) -> LocalMultipartUpload:
+        return LocalMultipartUpload(self, key)
+
+    def presigned_url(self, key: str, expires_in: int, filename: Optional[str] = None) -> str:
+        expires = int(time.time()) + expires_in
+        params = {"expires": expires, "signature": sign_key(key, expires)}
+        if filename:
+            params["filename"] = filename
+        query = urlencode(params)
+        return f"{settings.local_storage_url_base.rstrip('/')}/{quote(key)}?{query}"
+
+    @contextmanager
+    def local_file(self, key: str) -> Iterator[str]:
+        path = self.path_for(key)
+        if not path.exists():
+            raise FileNotFoundError(key)
+        yield str(path)
+
+
+def sign_key(key: str, expires: int) -> str:
+    message = f"{key}:{expires}".encode("utf-8")
+    return hmac.new(settings.jwt_secret.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def verify_signed_key(key: str, expires: int, signature: str) -> bool:
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(sign_key(key, expires), signature)
+
+
+_backend: Optional[StorageBackend] = None
+
+
+def get_backend() -> StorageBackend:
+    global _backend
+    if _backend is None:
+        if settings.storage_backend == "local":
+            _backend = LocalBackend(settings.local_storage_root)
+        elif settings.storage_backend == "s3":
+            _backend = S3Backend()
+        else:
+            raise ValueError(f"Unknown storage backend: {settings.storage_backend}")
+    return _backend
+
+
+def ensure_bucket_exists() -> None:
+    get_backend().ensure_ready()
 
 
 def upload_bytes(key: str, data: bytes, content_type: Optional[str] = None) -> None:
-    client = get_s3_client()
-    extra = {}
-    if content_type:
-        extra["ContentType"] = content_type
-    client.upload_fileobj(io.BytesIO(data), settings.object_storage_bucket, key, ExtraArgs=extra)
+    get_backend().put(key, data, content_type)
 
 
-def upload_text(key: str, text: str) -> None:
+def upload_text(key: str, text: str) -> str:
+    """Store ``text`` (zstd-compressed when enabled); returns the key used."""
+    if settings.text_compression_enabled:
+        key = key if key.endswith(".zst") else f"{key}.zst"
+        upload_bytes(key, compress_text(text), content_type="application/zstd")
+        return key
     upload_bytes(key, text.encode("utf-8"), content_type="text/plain")
+    return key
 
 
-def generate_presigned_url(key: str, expires_in: int = 900) -> str:
-    client = get_s3_client()
-    return client.generate_presigned_url(
-        "get_object",
-        Params={"Bucket": settings.object_storage_bucket, "Key": key},
-        ExpiresIn=expires_in,
-    )
+def start_multipart(key: str, content_type: Optional[str] = None) -> MultipartWriter:
+    return get_backend().start_multipart(key, content_type)
+
+
+def generate_presigned_url(
+    key: str, expires_in: int = 900, filename: Optional[str] = None
+) -> str:
+    return get_backend().presigned_url(key, expires_in, filename)
 
 
 def download_bytes(key: str) -> bytes:
-    client = get_s3_client()
-    response = client.get_object(Bucket=settings.object_storage_bucket, Key=key)
-    return response["Body"].read()
+    return get_backend().get(key)
+
+
+def delete_object(key: str) -> None:
+    get_backend().delete(key)
+
+
+def local_file(key: str):
+    """Context manager yielding a readable path for ``key`` on any backend."""
+    return get_backend().local_file(key)
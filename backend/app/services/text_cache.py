@@ -0,0 +1,94 @@
+import logging
+from typing import Iterable, Optional
+
+import redis
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.redis import get_redis
+from app.db import models
+from app.utils.text_extraction import IMAGE_EXTRACTOR_VERSION, PDF_EXTRACTOR_VERSION
+
+logger = logging.getLogger(__name__)
+
+HITS_KEY = "extracted_text_cache:hits"
+MISSES_KEY = "extracted_text_cache:misses"
+
+CacheKey = tuple[str, str]
+
+
+def _incr(key: str, amount: int) -> None:
+    if amount <= 0:
+        return
+    try:
+        get_redis().incrby(key, amount)
+    except redis.RedisError:
+        logger.warning("Could not update %s", key)
+
+
+def lookup(
+    db: Session, keys: Iterable[CacheKey], count: bool = True
+) -> dict[CacheKey, list[str]]:
+    keys = set(keys)
+    if not keys:
+        return {}
+    rows = (
+        db.query(models.ExtractedTextCache)
+        .filter(
+            tuple_(
+                models.ExtractedTextCache.sha256,
+                models.ExtractedTextCache.extractor_version,
+            ).in_(list(keys))
+        )
+        .all()
+    )
+    found = {(row.sha256, row.extractor_version): row.page_texts for row in rows}
+    if count:
+        _incr(HITS_KEY, len(found))
+        _incr(MISSES_KEY, len(keys) - len(found))
+    return found
+
+
+def store(db: Session, entries: dict[CacheKey, list[str]]) -> None:
+    if not entries:
+        return
+    stmt = insert(models.ExtractedTextCache).values(
+        [
+            {"sha256": sha256, "extractor_version": version, "page_texts": pages}
+            for (sha256, version), pages in entries.items()
+        ]
+    )
+    db.execute(stmt.on_conflict_do_nothing(index_elements=["sha256", "extractor_version"]))
+    db.commit()
+
+
+def invalidate(
+    db: Session,
+    *,
+    sha256: Optional[str] = None,
+    extractor_version: Optional[str] = None,
+    stale_only: bool = False,
+) -> int:
+    query = db.query(models.ExtractedTextCache)
+    if sha256:
+        query = query.filter(models.ExtractedTextCache.sha256 == sha256)
+    if extractor_version:
+        query = query.filter(models.ExtractedTextCache.extractor_version == extractor_version)
+    if stale_only:
+        query = query.filter(
+            models.ExtractedTextCache.extractor_version.notin_(
+                [PDF_EXTRACTOR_VERSION, IMAGE_EXTRACTOR_VERSION]
+            )
+        )
+    deleted = query.delete(synchronize_session=False)
+    db.commit()
+    return deleted
+
+
+def stats() -> dict[str, int]:
+    try:
+        hits, misses = get_redis().mget(HITS_KEY, MISSES_KEY)
+    except redis.RedisError:
+        hits, misses = None, None
+    return {"hits": int(hits or 0), "misses": int(misses or 0)}
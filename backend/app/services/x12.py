@@ -0,0 +1,434 @@
+"""Single-pass X12 271 reader mapping EB benefit loops onto summary fields.
+
+Segments are tokenized from an iterable of text chunks, so only the current
+chunk and one partial segment are ever held; field candidates are the only
+other state kept while walking the loops. The writers at the bottom build the
+batched 270 inquiries we send and split batched 271 replies per subscriber.
+"""
+import re
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional
+
+CHUNK_SIZE = 64 * 1024
+ISA_LENGTH = 106
+IMPLEMENTATION = "005010X279A1"
+SUBMITTER_ID = "EBCOPILOT"
+TRACE_ORIGINATOR = "9EBCOPILOT"
+PROVIDER_NAME = "EB COPILOT CLINIC"
+PROVIDER_NPI = "1234567893"
+
+# EB03 service type codes for the categories verifications use most.
+SERVICE_TYPE_CODES = {
+    "physical therapy": "PT",
+    "chiropractic": "33",
+    "dental": "35",
+    "mental health": "MH",
+    "vision": "AL",
+    "urgent care": "UC",
+    "office visit": "98",
+}
+HEALTH_BENEFIT_PLAN_COVERAGE = "30"
+SERVICE_CATEGORIES = {code: category for category, code in SERVICE_TYPE_CODES.items()}
+
+ACTIVE_CODES = {"1", "2", "3", "4", "5"}
+INACTIVE_CODES = {"6", "7", "8"}
+REMAINING_PERIOD = "29"
+# HL03 levels whose EB loops describe the patient: subscriber and dependent.
+PATIENT_LEVELS = {"22", "23"}
+QUANTITY_QUALIFIERS = {"VS": "visits", "DY": "days", "HS": "hours", "MN": "months", "YY": "years"}
+CONFIDENCE = 0.95
+
+
+class X12Error(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Delimiters:
+    element: str
+    repetition: str
+    component: str
+    segment: str
+
+
+@dataclass(slots=True)
+class Segment:
+    tag: str
+    elements: list[str]
+    start: int
+    end: int
+
+    def get(self, position: int) -> str:
+        """Element by X12 position (EB01 is ``get(1)``); missing ones are empty."""
+        return self.elements[position] if position < len(self.elements) else ""
+
+
+@dataclass
+class X12Field:
+    value: object
+    confidence: float
+    span: list[int]
+    rank: int
+
+
+@dataclass
+class X12Result:
+    fields: dict[str, X12Field] = field(default_factory=dict)
+    rejections: list[str] = field(default_factory=list)
+    segment_count: int = 0
+
+
+def is_x12(text: str) -> bool:
+    return text[:16].lstrip().startswith("ISA")
+
+
+def chunked(text: str, size: int = CHUNK_SIZE) -> Iterator[str]:
+    for start in range(0, len(text), size):
+        yield text[start : start + size]
+
+
+def _delimiters(header: str) -> Delimiters:
+    if not header.startswith("ISA") or len(header) < ISA_LENGTH:
+        raise X12Error("Missing ISA header")
+    return Delimiters(
+        element=header[3], repetition=header[82], component=header[104], segment=header[105]
+    )
+
+
+def iter_segments(chunks: Iterable[str]) -> Iterator[tuple[Segment, Delimiters]]:
+    buffer = ""
+    offset = 0  # absolute position of buffer[0]
+    delimiters: Optional[Delimiters] = None
+    for chunk in chunks:
+        buffer += chunk
+        if delimiters is None:
+            lead = len(buffer) - len(buffer.lstrip())
+            if len(buffer) - lead < ISA_LENGTH:
+                continue
+            delimiters = _delimiters(buffer[lead : lead + ISA_LENGTH])
+        pieces = buffer.split(delimiters.segment)
+        buffer = pieces.pop()
+        for raw in pieces:
+            segment = _segment(raw, offset, delimiters)
+            if segment:
+                yield segment, delimiters
+            offset += len(raw) + 1
+    if delimiters is None:
+        raise X12Error("Missing ISA header")
+    segment = _segment(buffer, offset, delimiters)
+    if segment:
+        yield segment, delimiters
+
+
+def interchange_control(text: str) -> str:
+    """ISA13 of an interchange, echoed in the IEA and in replies."""
+    header = text.lstrip()[:ISA_LENGTH]
+    return header.split(_delimiters(header).element)[13]
+
+
+def _segment(raw: str, offset: int, delimiters: Delimiters) -> Optional[Segment]:
+    # Line breaks after each terminator are common; they are not part of the segment.
+    stripped = raw.lstrip()
+    if not stripped:
+        return None
+    start = offset + len(raw) - len(stripped)
+    elements = stripped.rstrip().split(delimiters.element)
+    return Segment(elements[0], elements, start, offset + len(raw))
+
+
+def _amount(value: str) -> Optional[dict]:
+    try:
+        return {"amount": float(value), "currency": "USD"}
+    except ValueError:
+        return None
+
+
+def _percent(value: str) -> Optional[dict]:
+    try:
+        percent = float(value)
+    except ValueError:
+        return None
+    # 271s send coinsurance as a fraction; some payers send whole percents.
+    return {"percent": round(percent * 100, 4) if percent <= 1 else percent}
+
+
+def _date(value: str) -> str:
+    return f"{value[:4]}-{value[4:6]}-{value[6:8]}" if re.fullmatch(r"\d{8}", value) else value
+
+
+class _Walker:
+    def __init__(self, service_type: Optional[str]):
+        self.preferred = service_type
+        self.result = X12Result()
+        self.level = ""
+        self.in_related_entity = False
+        self.benefit: Optional[Segment] = None
+        self.benefit_rank = 3
+        self.in_limitation = False
+
+    def _rank(self, service_types: list[str]) -> int:
+        if self.preferred and self.preferred in service_types:
+            return 0
+        if HEALTH_BENEFIT_PLAN_COVERAGE in service_types or not service_types:
+            return 1
+        return 2
+
+    def offer(self, name: str, value: object, segment: Segment, rank: int) -> None:
+        if value is None:
+            return
+        current = self.result.fields.get(name)
+        # First hit wins within a rank; a better-matching service type replaces it.
+        if current is None or rank < current.rank:
+            self.result.fields[name] = X12Field(
+                value, CONFIDENCE, [segment.start, segment.end], rank
+            )
+
+    def feed(self, segment: Segment, delimiters: Delimiters) -> None:
+        self.result.segment_count += 1
+        tag = segment.tag
+        if tag == "HL":
+            self.level = segment.get(3)
+            self.benefit = None
+            self.in_limitation = False
+        elif tag == "LS":
+            self.in_related_entity = True
+            self.in_limitation = False
+        elif tag == "LE":
+            self.in_related_entity = False
+        elif self.in_related_entity or self.level not in PATIENT_LEVELS:
+            return
+        elif tag == "AAA":
+            self.result.rejections.append(segment.get(3))
+        elif tag == "EB":
+            self._benefit(segment, delimiters)
+        elif tag == "DTP":
+            self._dates(segment)
+        elif tag == "MSG" and self.in_limitation and self.benefit is not None:
+            # The first message in a limitation loop spells it out; prefer it
+            # to the bare quantity.
+            self.in_limitation = False
+            current = self.result.fields.get("limitations")
+            if current is not None and current.span[0] == self.benefit.start:
+                current.value = segment.get(1).strip()
+                current.span[1] = segment.end
+            else:
+                self.offer("limitations", segment.get(1).strip(), segment, self.benefit_rank)
+
+    def _benefit(self, segment: Segment, delimiters: Delimiters) -> None:
+        self.benefit = segment
+        self.in_limitation = False
+        info = segment.get(1)
+        coverage = segment.get(2) or "IND"
+        service_types = [code for code in segment.get(3).split(delimiters.repetition) if code]
+        period = segment.get(6)
+        rank = self.benefit_rank = self._rank(service_types)
+
+        if info in ACTIVE_CODES:
+            self.offer("eligibility_status", "active", segment, rank)
+        elif info in INACTIVE_CODES:
+            self.offer("eligibility_status", "inactive", segment, rank)
+        elif info == "B":
+            self.offer("copay", _amount(segment.get(7)), segment, rank)
+        elif info == "A":
+            self.offer("coinsurance", _percent(segment.get(8)), segment, rank)
+        elif info in ("C", "G") and coverage in ("IND", "FAM"):
+            prefix = "deductible" if info == "C" else "oop_max"
+            kind = "remaining" if period == REMAINING_PERIOD else "total"
+            scope = "individual" if coverage == "IND" else "family"
+            self.offer(f"{prefix}_{kind}_{scope}", _amount(segment.get(7)), segment, rank)
+        elif info == "F":
+            quantity, qualifier = segment.get(10), segment.get(9)
+            if quantity:
+                unit = QUANTITY_QUALIFIERS.get(qualifier, qualifier.lower())
+                self.offer("limitations", f"{quantity} {unit}".strip(), segment, rank)
+            self.in_limitation = True
+
+    def _dates(self, segment: Segment) -> None:
+        qualifier, form, value = segment.get(1), segment.get(2), segment.get(3)
+        rank = self.benefit_rank if self.benefit is not None else 1
+        if self.benefit is not None and self.benefit.get(1) not in ACTIVE_CODES | INACTIVE_CODES:
+            return
+        if qualifier in ("291", "307") and form == "RD8" and "-" in value:
+            begin, _, end = value.partition("-")
+            self.offer("effective_from", _date(begin), segment, rank)
+            self.offer("effective_to", _date(end), segment, rank)
+        elif qualifier in ("291", "346", "356") and form == "D8":
+            self.offer("effective_from", _date(value), segment, rank)
+        elif qualifier in ("347", "357") and form == "D8":
+            self.offer("effective_to", _date(value), segment, rank)
+
+
+def parse_271(chunks: Iterable[str], service_category: Optional[str] = None) -> X12Result:
+    service_type = SERVICE_TYPE_CODES.get((service_category or "").strip().lower())
+    walker = _Walker(service_type)
+    for segment, delimiters in iter_segments(chunks):
+        walker.feed(segment, delimiters)
+    return walker.result
+
+
+def service_type_for(service_category: Optional[str]) -> str:
+    return SERVICE_TYPE_CODES.get(
+        (service_category or "").strip().lower(), HEALTH_BENEFIT_PLAN_COVERAGE
+    )
+
+
+def payer_identifier(payer_name: str) -> str:
+    return f"{zlib.crc32(payer_name.upper().encode('utf-8')) % 100000:05d}"
+
+
+def _clean(value: Optional[str]) -> str:
+    # Delimiters inside a value would split it into extra elements.
+    return re.sub(r"[*~^:]", " ", (value or "").upper()).strip()
+
+
+def _split_name(patient_name: Optional[str]) -> tuple[str, str]:
+    first, _, last = _clean(patient_name).rpartition(" ")
+    return last, first
+
+
+def interchange(
+    functional_id: str,
+    transaction_set: str,
+    sender: str,
+    receiver: str,
+    control: str,
+    body: list[str],
+    now: Optional[datetime] = None,
+) -> str:
+    """Wrap transaction-set ``body`` segments (BHT onwards) in ISA/GS/ST envelopes."""
+    now = now or datetime.now(timezone.utc)
+    segments = [
+        f"ISA*00*{' ' * 10}*00*{' ' * 10}*ZZ*{sender[:15]:<15}*ZZ*{receiver[:15]:<15}"
+        f"*{now:%y%m%d}*{now:%H%M}*^*00501*{control}*0*P*:",
+        f"GS*{functional_id}*{sender[:15]}*{receiver[:15]}*{now:%Y%m%d}*{now:%H%M}*1*X*"
+        f"{IMPLEMENTATION}",
+        f"ST*{transaction_set}*0001*{IMPLEMENTATION}",
+        *body,
+        f"SE*{len(body) + 2}*0001",
+        "GE*1*1",
+        f"IEA*1*{control}",
+    ]
+    return "~\n".join(segments) + "~\n"
+
+
+def build_270(
+    payer_name: str, inquiries: list[dict], control: str, now: Optional[datetime] = None
+) -> str:
+    """One 270 interchange asking ``payer_name`` about every inquiry.
+
+    Inquiries are eligibility payloads plus a ``trace`` the payer echoes back
+    in each subscriber's TRN, which is how ``split_271`` matches replies.
+    """
+    now = now or datetime.now(timezone.utc)
+    payer = _clean(payer_name) or "PAYER"
+    body = [
+        f"BHT*0022*13*{control}*{now:%Y%m%d}*{now:%H%M}",
+        "HL*1**20*1",
+        f"NM1*PR*2*{payer}*****PI*{payer_identifier(payer)}",
+        "HL*2*1*21*1",
+        f"NM1*1P*2*{PROVIDER_NAME}*****XX*{PROVIDER_NPI}",
+    ]
+    for number, inquiry in enumerate(inquiries, start=3):
+        last, first = _split_name(inquiry.get("patient_name"))
+        body += [
+            f"HL*{number}*2*22*0",
+            f"TRN*1*{inquiry['trace']}*{TRACE_ORIGINATOR}",
+            f"NM1*IL*1*{last}*{first}****MI*{_clean(inquiry.get('member_id'))}",
+        ]
+        if inquiry.get("date_of_birth"):
+            body.append(f"DMG*D8*{inquiry['date_of_birth'].replace('-', '')}")
+        body += [
+            f"DTP*291*D8*{now:%Y%m%d}",
+            f"EQ*{service_type_for(inquiry.get('service_category'))}",
+        ]
+    return interchange("HS", "270", SUBMITTER_ID, payer, control, body, now)
+
+
+def iter_270(chunks: Iterable[str]) -> Iterator[dict]:
+    """Eligibility payloads (with ``trace``) for each subscriber in a 270."""
+    payer_name = ""
+    inquiry: Optional[dict] = None
+    for segment, delimiters in iter_segments(chunks):
+        tag = segment.tag
+        if tag in ("HL", "SE") and inquiry is not None:
+            yield inquiry
+            inquiry = None
+        if tag == "HL" and segment.get(3) in PATIENT_LEVELS:
+            inquiry = {"payer_name": payer_name, "trace": None, "member_id": None}
+        elif tag == "NM1" and segment.get(1) == "PR":
+            payer_name = segment.get(3)
+        elif inquiry is None:
+            continue
+        elif tag == "TRN" and inquiry["trace"] is None:
+            inquiry["trace"] = segment.get(2)
+        elif tag == "NM1" and segment.get(1) == "IL":
+            inquiry["patient_name"] = f"{segment.get(4)} {segment.get(3)}".strip()
+            inquiry["member_id"] = segment.get(9) or None
+        elif tag == "DMG" and segment.get(1) == "D8":
+            inquiry["date_of_birth"] = _date(segment.get(2))
+        elif tag == "EQ":
+            inquiry["service_type"] = segment.get(1)
+            inquiry["service_category"] = SERVICE_CATEGORIES.get(segment.get(1))
+    if inquiry is not None:
+        yield inquiry
+
+
+def split_271(chunks: Iterable[str]) -> Iterator[tuple[Optional[str], str]]:
+    """Split a batched 271 into standalone single-subscriber 271s, keyed by trace.
+
+    Each reply keeps the original envelope and information source/receiver
+    loops so ``parse_271`` reads it like a real-time response. Only one
+    subscriber loop is held at a time.
+    """
+    isa = gs = ""
+    transaction: list[str] = []
+    loops: dict[str, list[str]] = {"20": [], "21": []}
+    subscriber: Optional[list[str]] = None
+    trace: Optional[str] = None
+    section: list[str] = []
+    for segment, delimiters in iter_segments(chunks):
+        raw = delimiters.element.join(segment.elements)
+        tag, level = segment.tag, segment.get(3)
+        if subscriber is not None and (
+            tag in ("SE", "GE", "IEA") or (tag == "HL" and level != "23")
+        ):
+            yield trace, _standalone(delimiters, isa, gs, transaction, loops, subscriber)
+            subscriber = trace = None
+        if tag == "ISA":
+            isa = raw
+        elif tag == "GS":
+            gs = raw
+        elif tag == "ST":
+            transaction = section = [raw]
+        elif tag == "HL" and level in loops:
+            if level == "20":
+                loops["21"] = []
+            loops[level] = section = [raw]
+        elif tag == "HL" and level == "22":
+            subscriber = section = [raw]
+        elif tag not in ("SE", "GE", "IEA"):
+            section.append(raw)
+            if tag == "TRN" and subscriber is not None and trace is None:
+                trace = segment.get(2)
+
+
+def _standalone(
+    delimiters: Delimiters,
+    isa: str,
+    gs: str,
+    transaction: list[str],
+    loops: dict[str, list[str]],
+    subscriber: list[str],
+) -> str:
+    element, terminator = delimiters.element, delimiters.segment + "\n"
+    segments = [*transaction, *loops["20"], *loops["21"], *subscriber]
+    control = isa.split(element)[13] if isa.count(element) >= 13 else "000000001"
+    st_control = transaction[0].split(element)[2] if transaction else "0001"
+    trailer = [
+        element.join(["SE", str(len(segments) + 1), st_control]),
+        element.join(["GE", "1", "1"]),
+        element.join(["IEA", "1", control]),
+    ]
+    return terminator.join([isa, gs, *segments, *trailer]) + terminator
@@ -0,0 +1,66 @@
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import zstandard
+
+from app.core.config import settings
+
+DICTIONARY_DIR = Path(__file__).resolve().parent / "zstd_dicts"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def _dictionaries() -> dict[int, zstandard.ZstdCompressionDict]:
+    # Keyed by the id zstd writes into each frame header, so rows compressed
+    # with an older dictionary stay readable after retraining.
+    loaded = {}
+    for path in sorted(DICTIONARY_DIR.glob("*.dict")):
+        dictionary = zstandard.ZstdCompressionDict(path.read_bytes())
+        loaded[dictionary.dict_id()] = dictionary
+    return loaded
+
+
+@lru_cache(maxsize=None)
+def _active_dictionary() -> Optional[zstandard.ZstdCompressionDict]:
+    name = settings.text_compression_dictionary
+    if not name:
+        return None
+    path = DICTIONARY_DIR / f"{name}.dict"
+    return zstandard.ZstdCompressionDict(path.read_bytes()) if path.exists() else None
+
+
+def _compressor() -> zstandard.ZstdCompressor:
+    # Compressor contexts are not thread-safe; keep one per thread.
+    compressor = getattr(_local, "compressor", None)
+    if compressor is None:
+        compressor = zstandard.ZstdCompressor(
+            level=settings.text_compression_level, dict_data=_active_dictionary()
+        )
+        _local.compressor = compressor
+    return compressor
+
+
+def compress_text(text: str) -> bytes:
+    return _compressor().compress(text.encode("utf-8"))
+
+
+def decompress_text(data: bytes) -> str:
+    dict_id = zstandard.get_frame_parameters(data).dict_id
+    dictionary = None
+    if dict_id:
+        dictionary = _dictionaries().get(dict_id)
+        if dictionary is None:
+            raise ValueError(f"Unknown zstd dictionary id {dict_id}")
+    decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+    return decompressor.decompress(data).decode("utf-8")
+
+
+def train_dictionary(samples: list[str], dict_size: int = 16 * 1024) -> bytes:
+    dictionary = zstandard.train_dictionary(
+        dict_size, [sample.encode("utf-8") for sample in samples]
+    )
+    return dictionary.as_bytes()
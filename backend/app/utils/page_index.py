@@ -0,0 +1,16 @@
+from bisect import bisect_right
+
+
+def page_offsets(pages: list[str]) -> list[int]:
+    """Start offset of every page within ``"".join(pages)``."""
+    offsets: list[int] = []
+    position = 0
+    for page in pages:
+        offsets.append(position)
+        position += len(page)
+    return offsets
+
+
+def page_for_offset(offsets: list[int], position: int) -> int:
+    """1-based number of the page holding ``position``."""
+    return max(1, bisect_right(offsets, position))
@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second with bursts of up to ``capacity``.
+
+    Not thread-safe: each bucket belongs to one event loop.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        while not self.try_acquire():
+            await asyncio.sleep((1 - self._tokens) / self.rate)
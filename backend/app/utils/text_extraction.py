@@ -1,21 +1,183 @@
+import io
+import logging
+import mmap
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from io import StringIO
 from pathlib import Path
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional
 
-from pdfminer.high_level import extract_text
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
 from PIL import Image
 import pytesseract
 
 from app.core.config import settings
+from app.utils.page_index import page_offsets
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction output changes so cached text is re-derived.
+PDF_EXTRACTOR_VERSION = "pdfminer-20240706.1"
+IMAGE_EXTRACTOR_VERSION = "tesseract.1"
+
+
+@dataclass
+class ExtractedText:
+    pages: list[str]
+
+    @property
+    def text(self) -> str:
+        return "".join(self.pages)
+
+    @property
+    def page_offsets(self) -> list[int]:
+        return page_offsets(self.pages)
+
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_pid: Optional[int] = None
+# Process that could not start a pool; it extracts serially from then on.
+_pdf_pool_failed_pid: Optional[int] = None
+
+
+def _is_daemonic() -> bool:
+    # Celery prefork children are daemonic billiard processes, and daemonic
+    # processes may not start children of their own.
+    if multiprocessing.current_process().daemon:
+        return True
+    try:
+        import billiard.process
+    except ImportError:
+        return False
+    return bool(billiard.process.current_process().daemon)
+
+
+def _get_pdf_pool() -> Optional[ProcessPoolExecutor]:
+    global _pdf_pool, _pdf_pool_pid
+    if settings.pdf_extraction_workers <= 1 or _pdf_pool_failed_pid == os.getpid():
+        return None
+    if _is_daemonic():
+        _pdf_pool_unavailable("running in a daemonic worker process")
+        return None
+    # Pools do not survive a fork, so each worker process lazily builds its own.
+    if _pdf_pool is None or _pdf_pool_pid != os.getpid():
+        _pdf_pool = ProcessPoolExecutor(
+            max_workers=settings.pdf_extraction_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        _pdf_pool_pid = os.getpid()
+    return _pdf_pool
+
+
+def _pdf_pool_unavailable(reason: str) -> None:
+    global _pdf_pool_failed_pid
+    _pdf_pool_failed_pid = os.getpid()
+    logger.warning("Page-parallel PDF extraction disabled in this process: %s", reason)
+
+
+def _reset_pdf_pool() -> None:
+    global _pdf_pool, _pdf_pool_pid
+    if _pdf_pool is not None and _pdf_pool_pid == os.getpid():
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
+    _pdf_pool = None
+    _pdf_pool_pid = None
+
+
+@contextmanager
+def _mapped(file_path: str) -> Iterator[BinaryIO]:
+    """Read-only mmap of ``file_path``; parsers read from the page cache, not a copy."""
+    with open(file_path, "rb") as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            yield io.BytesIO(b"")
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def count_pdf_pages(file_path: str) -> int:
+    with _mapped(file_path) as fp:
+        document = PDFDocument(PDFParser(fp))
+        return sum(1 for _ in PDFPage.create_pages(document))
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> list[str]:
+    # Mirrors pdfminer's extract_text, but keeps one string per page so the
+    # concatenated chunks are byte-for-byte what a single pass would produce.
+    rsrcmgr = PDFResourceManager(caching=True)
+    laparams = LAParams()
+    pages: list[str] = []
+    with _mapped(file_path) as fp:
+        for page in PDFPage.get_pages(fp, range(start, stop), caching=True):
+            with StringIO() as output:
+                device = TextConverter(rsrcmgr, output, laparams=laparams)
+                PDFPageInterpreter(rsrcmgr, device).process_page(page)
+                device.close()
+                pages.append(output.getvalue())
+    return pages
+
+
+def _page_ranges(page_count: int, chunk_size: int) -> list[tuple[int, int]]:
+    chunk_size = max(chunk_size, 1)
+    return [
+        (start, min(start + chunk_size, page_count))
+        for start in range(0, page_count, chunk_size)
+    ]
+
+
+def extract_pdf_pages(file_path: str) -> ExtractedText:
+    page_count = count_pdf_pages(file_path)
+    ranges = _page_ranges(page_count, settings.pdf_pages_per_chunk)
+    # Even a single chunk goes to the pool: the cpu worker runs tasks on threads,
+    # and parsing in-thread would hold the GIL against every other task.
+    pool = _get_pdf_pool() if ranges else None
+
+    if pool is not None:
+        try:
+            futures = [
+                pool.submit(_extract_page_range, file_path, start, stop) for start, stop in ranges
+            ]
+            return ExtractedText(pages=[page for future in futures for page in future.result()])
+        except (AssertionError, OSError) as exc:
+            # The process cannot start children; stop trying and extract
+            # in-process rather than failing the task.
+            _reset_pdf_pool()
+            _pdf_pool_unavailable(repr(exc))
+        except BrokenProcessPool:
+            # A child died; the next PDF gets a fresh pool.
+            _reset_pdf_pool()
+
+    pages: list[str] = []
+    for start, stop in ranges:
+        pages.extend(_extract_page_range(file_path, start, stop))
+    return ExtractedText(pages=pages)
 
 
 def extract_text_from_pdf(file_path: str) -> str:
-    return extract_text(file_path) or ""
+    return extract_pdf_pages(file_path).text
 
 
 def extract_text_from_image(file_path: str) -> str:
     if not settings.enable_ocr:
         return ""
-    image = Image.open(file_path)
-    return pytesseract.image_to_string(image) or ""
+    with _mapped(file_path) as fp, Image.open(fp) as image:
+        return pytesseract.image_to_string(image) or ""
+
+
+def extractor_version(file_type: str) -> Optional[str]:
+    if file_type == "pdf":
+        return PDF_EXTRACTOR_VERSION
+    if file_type == "image" and settings.enable_ocr:
+        return IMAGE_EXTRACTOR_VERSION
+    return None
 
 
 def detect_file_type(filename: str) -> str:
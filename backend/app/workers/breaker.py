@@ -0,0 +1,219 @@
+"""Per-payer circuit breakers shared by every worker through Redis.
+
+closed:    calls flow; failures within the window are counted and any success
+           resets the count.
+open:      the failure threshold was hit; calls are refused until the
+           cooldown expires.
+half_open: the cooldown expired; one probe call is let through. Its success
+           closes the breaker, its failure reopens it.
+
+Work refused while a breaker is not closed is parked in the payer's deferred
+queue; ``drain_deferred`` releases it once the breaker closes. When Redis is
+unreachable the breakers fail open and calls go straight to the payer.
+"""
+import json
+import logging
+import time
+import uuid
+from typing import Any, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# KEYS: open, tripped, probe. ARGV: probe token, probe ttl.
+# 1: allowed while closed, 2: allowed as the half-open probe, 0: refused.
+_ALLOW_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 1 then
+    return 0
+end
+if redis.call('exists', KEYS[2]) == 0 then
+    return 1
+end
+if redis.call('set', KEYS[3], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return 2
+end
+return 0
+"""
+
+# KEYS: failures, open, tripped, probe. ARGV: threshold, window, cooldown.
+# Returns 1 when this failure opened the breaker.
+_FAILURE_SCRIPT = """
+if redis.call('exists', KEYS[2]) == 1 then
+    return 0
+end
+if redis.call('exists', KEYS[3]) == 1 then
+    redis.call('del', KEYS[4])
+    redis.call('set', KEYS[2], '1', 'EX', ARGV[3])
+    return 1
+end
+local failures = redis.call('incr', KEYS[1])
+if failures == 1 then
+    redis.call('expire', KEYS[1], ARGV[2])
+end
+if failures >= tonumber(ARGV[1]) then
+    redis.call('del', KEYS[1])
+    redis.call('set', KEYS[3], '1')
+    redis.call('set', KEYS[2], '1', 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# KEYS: failures, open, tripped, probe. Returns 1 when this success closed the
+# breaker. Late successes from calls started before it opened are ignored.
+_SUCCESS_SCRIPT = """
+if redis.call('exists', KEYS[2]) == 1 then
+    return 0
+end
+local tripped = redis.call('exists', KEYS[3])
+redis.call('del', KEYS[1], KEYS[3], KEYS[4])
+return tripped
+"""
+
+
+def _key(payer_name: str, suffix: str) -> str:
+    return f"breaker:{' '.join(payer_name.lower().split())}:{suffix}"
+
+
+def _keys(payer_name: str) -> list[str]:
+    return [_key(payer_name, suffix) for suffix in ("failures", "open", "tripped", "probe")]
+
+
+def allow(payer_name: str) -> bool:
+    if not settings.circuit_breaker_enabled:
+        return True
+    _, open_key, tripped_key, probe_key = _keys(payer_name)
+    try:
+        return bool(
+            get_redis().eval(
+                _ALLOW_SCRIPT,
+                3,
+                open_key,
+                tripped_key,
+                probe_key,
+                uuid.uuid4().hex,
+                settings.circuit_breaker_probe_timeout_seconds,
+            )
+        )
+    except redis.RedisError:
+        logger.warning("Circuit breaker unavailable, allowing call to %s", payer_name)
+        return True
+
+
+def record_failure(payer_name: str) -> bool:
+    """Count a retryable payer failure; returns whether it opened the breaker."""
+    if not settings.circuit_breaker_enabled:
+        return False
+    try:
+        opened = get_redis().eval(
+            _FAILURE_SCRIPT,
+            4,
+            *_keys(payer_name),
+            settings.circuit_breaker_failure_threshold,
+            settings.circuit_breaker_window_seconds,
+            settings.circuit_breaker_cooldown_seconds,
+        )
+    except redis.RedisError:
+        logger.warning("Could not record failure for %s", payer_name)
+        return False
+    if opened:
+        logger.warning("Circuit breaker for %s opened", payer_name)
+    return bool(opened)
+
+
+def record_success(payer_name: str) -> bool:
+    """Note that the payer answered; returns whether that closed the breaker."""
+    if not settings.circuit_breaker_enabled:
+        return False
+    try:
+        closed = get_redis().eval(_SUCCESS_SCRIPT, 4, *_keys(payer_name))
+    except redis.RedisError:
+        logger.warning("Could not record success for %s", payer_name)
+        return False
+    if closed:
+        logger.info("Circuit breaker for %s closed", payer_name)
+    return bool(closed)
+
+
+def state(payer_name: str) -> str:
+    client = get_redis()
+    try:
+        is_open = client.exists(_key(payer_name, "open"))
+        tripped = client.exists(_key(payer_name, "tripped"))
+    except redis.RedisError:
+        return CLOSED
+    if is_open:
+        return OPEN
+    return HALF_OPEN if tripped else CLOSED
+
+
+def retry_in(payer_name: str) -> float:
+    """Seconds until an open breaker goes half-open (0 if it is not open)."""
+    try:
+        ttl = get_redis().ttl(_key(payer_name, "open"))
+    except redis.RedisError:
+        return 0.0
+    return float(max(ttl, 0))
+
+
+def park(payer_name: str, task_name: str, args: list, kwargs: Optional[dict] = None) -> None:
+    """Queue a task call until the payer's breaker closes; identical calls are kept once."""
+    entry = json.dumps({"task": task_name, "args": args, "kwargs": kwargs or {}}, sort_keys=True)
+    get_redis().zadd(_key(payer_name, "deferred"), {entry: time.time()}, nx=True)
+
+
+def take_deferred(payer_name: str, count: int) -> list[dict[str, Any]]:
+    """Pop up to ``count`` parked calls, oldest first."""
+    popped = get_redis().zpopmin(_key(payer_name, "deferred"), count)
+    return [json.loads(entry) for entry, _ in popped]
+
+
+def deferred_count(payer_name: str) -> int:
+    try:
+        return int(get_redis().zcard(_key(payer_name, "deferred")))
+    except redis.RedisError:
+        return 0
+
+
+def claim_drain(payer_name: str, countdown: float) -> bool:
+    """Take the right to schedule the payer's next drain, so only one is pending."""
+    ttl = int(countdown) + settings.circuit_breaker_probe_timeout_seconds
+    try:
+        return bool(get_redis().set(_key(payer_name, "drain"), "1", nx=True, ex=max(ttl, 1)))
+    except redis.RedisError:
+        return True
+
+
+def release_drain(payer_name: str) -> None:
+    try:
+        get_redis().delete(_key(payer_name, "drain"))
+    except redis.RedisError:
+        logger.warning("Could not release drain claim for %s", payer_name)
+
+
+def snapshot() -> list[dict[str, Any]]:
+    """Breakers that are not closed or still hold parked work."""
+    client = get_redis()
+    payers: set[str] = set()
+    try:
+        for pattern in ("breaker:*:tripped", "breaker:*:deferred"):
+            for key in client.scan_iter(match=pattern, count=500):
+                payers.add(key[len("breaker:") : key.rindex(":")])
+    except redis.RedisError:
+        logger.warning("Circuit breaker state unavailable")
+        return []
+    return [
+        {
+            "payer_name": payer,
+            "state": state(payer),
+            "retry_in_seconds": retry_in(payer),
+            "deferred": deferred_count(payer),
+        }
+        for payer in sorted(payers)
+    ]
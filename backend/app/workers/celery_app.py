@@ -1,6 +1,8 @@
 from celery import Celery
+from celery.signals import worker_process_shutdown, worker_shutdown
 
 from app.core.config import settings
+from app.workers.profiles import task_routes
 
 celery_app = Celery(
     "eb_copilot",
@@ -16,4 +18,17 @@ celery_app.conf.update(
     enable_utc=True,
     task_acks_late=True,
     imports=["app.workers.tasks"],
+    # Queues and the worker profiles that consume them come from Settings;
+    # see app.workers.profiles.
+    task_default_queue=settings.celery_default_queue,
+    task_routes=task_routes(),
 )
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_buffers(**kwargs) -> None:
+    from app.services import audit, storage
+
+    audit.flush()
+    storage.flush_stats()
@@ -0,0 +1,118 @@
+import logging
+import uuid
+from typing import Any, Optional
+
+import redis
+from celery import Task
+
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# A trigger sets the pending marker and schedules one run after the settle
+# window; triggers that find the marker already set are folded into that run.
+# A run clears the marker once it holds the running lock, so anything that
+# arrives mid-run schedules exactly one follow-up.
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _pending_key(task_name: str, entity_id: str) -> str:
+    return f"coalesce:{task_name}:{entity_id}:pending"
+
+
+def _running_key(task_name: str, entity_id: str) -> str:
+    return f"coalesce:{task_name}:{entity_id}:running"
+
+
+def _stats_key(task_name: str) -> str:
+    return f"coalesce:stats:{task_name}"
+
+
+def _count(task_name: str, field: str) -> None:
+    try:
+        get_redis().hincrby(_stats_key(task_name), field, 1)
+    except redis.RedisError:
+        logger.warning("Could not record coalesce stat %s for %s", field, task_name)
+
+
+def trigger(task: Task, entity_id: str, *args: Any, **kwargs: Any) -> Optional[str]:
+    """Schedule ``task(entity_id, ...)`` unless a run is already pending."""
+    entity_id = str(entity_id)
+    window = settings.task_coalesce_window_seconds
+    try:
+        scheduled = get_redis().set(
+            _pending_key(task.name, entity_id),
+            "1",
+            nx=True,
+            ex=settings.task_coalesce_lock_seconds,
+        )
+    except redis.RedisError:
+        logger.warning("Coalescing unavailable, enqueueing %s directly", task.name)
+        return task.delay(entity_id, *args, **kwargs).id
+
+    _count(task.name, "triggered")
+    if not scheduled:
+        _count(task.name, "coalesced")
+        return None
+    _count(task.name, "scheduled")
+    return task.apply_async(args=[entity_id, *args], kwargs=kwargs, countdown=window).id
+
+
+def acquire(task: Task, entity_id: str) -> Optional[str]:
+    """Take the per-entity running lock; returns a token, or None if held."""
+    entity_id = str(entity_id)
+    token = uuid.uuid4().hex
+    client = get_redis()
+    try:
+        if not client.set(
+            _running_key(task.name, entity_id),
+            token,
+            nx=True,
+            ex=settings.task_coalesce_lock_seconds,
+        ):
+            return None
+        client.delete(_pending_key(task.name, entity_id))
+    except redis.RedisError:
+        logger.warning("Coalescing unavailable, running %s without a lock", task.name)
+    return token
+
+
+def release(task: Task, entity_id: str, token: str) -> None:
+    try:
+        get_redis().eval(_RELEASE_SCRIPT, 1, _running_key(task.name, str(entity_id)), token)
+    except redis.RedisError:
+        logger.warning("Could not release running lock for %s", task.name)
+
+
+def defer(task: Task, entity_id: str) -> None:
+    """Re-queue the current invocation because another run holds the lock."""
+    try:
+        get_redis().set(
+            _pending_key(task.name, str(entity_id)), "1", ex=settings.task_coalesce_lock_seconds
+        )
+    except redis.RedisError:
+        pass
+    _count(task.name, "deferred")
+    task.apply_async(
+        args=task.request.args,
+        kwargs=task.request.kwargs,
+        countdown=settings.task_coalesce_window_seconds,
+    )
+
+
+def stats(task_name: str) -> dict[str, int]:
+    try:
+        raw = get_redis().hgetall(_stats_key(task_name))
+    except redis.RedisError:
+        raw = {}
+    return {
+        field: int(raw.get(field, 0))
+        for field in ["triggered", "scheduled", "coalesced", "deferred"]
+    }
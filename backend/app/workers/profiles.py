@@ -0,0 +1,63 @@
+"""Worker profiles: which queues a worker consumes and with what pool.
+
+Each queue gets its own worker so CPU-bound extraction, payer I/O and quick
+state updates never wait on one another's slots.
+"""
+from dataclasses import dataclass, field, fields
+from typing import Optional
+
+from app.core.config import settings
+
+CELERY_APP = "app.workers.celery_app.celery_app"
+POOLS = {"prefork", "threads", "gevent", "eventlet", "solo"}
+
+
+@dataclass(frozen=True)
+class WorkerProfile:
+    name: str
+    queues: list[str] = field(default_factory=list)
+    pool: str = "prefork"
+    concurrency: Optional[int] = None  # None lets Celery use the CPU count
+    prefetch_multiplier: int = 4
+    max_tasks_per_child: Optional[int] = None
+
+
+def task_routes() -> dict[str, dict[str, str]]:
+    return {task: {"queue": queue} for task, queue in settings.celery_task_queues.items()}
+
+
+def profile_for(name: str) -> WorkerProfile:
+    if name not in settings.celery_worker_profiles:
+        raise ValueError(f"Unknown worker profile {name!r}")
+    known = {f.name for f in fields(WorkerProfile)} - {"name"}
+    options = {
+        key: value for key, value in settings.celery_worker_profiles[name].items() if key in known
+    }
+    profile = WorkerProfile(name=name, **{"queues": [name], **options})
+    if profile.pool not in POOLS:
+        raise ValueError(f"Unknown pool {profile.pool!r} for worker profile {name!r}")
+    return profile
+
+
+def worker_argv(profile: WorkerProfile, loglevel: str = "info") -> list[str]:
+    argv = [
+        "celery",
+        "-A",
+        CELERY_APP,
+        "worker",
+        "-l",
+        loglevel,
+        "-n",
+        f"{profile.name}@%h",
+        "-Q",
+        ",".join(profile.queues),
+        "-P",
+        profile.pool,
+        "--prefetch-multiplier",
+        str(profile.prefetch_multiplier),
+    ]
+    if profile.concurrency:
+        argv += ["-c", str(profile.concurrency)]
+    if profile.max_tasks_per_child and profile.pool == "prefork":
+        argv += ["--max-tasks-per-child", str(profile.max_tasks_per_child)]
+    return argv
@@ -0,0 +1,92 @@
+"""Retry policy for worker tasks: which failures retry, and how long to wait.
+
+Tasks take ``PolicyTask`` as their base instead of ``autoretry_for=(Exception,)``:
+fatal errors fail the task on the first attempt, retryable ones come back
+after a jittered exponential backoff.
+"""
+import logging
+import random
+
+import httpx
+import redis
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
+from celery import Task
+from celery.exceptions import Ignore, Reject, Retry
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_S3_CODES = {"SlowDown", "Throttling", "RequestTimeout", "InternalError", "ServiceUnavailable"}
+
+
+class RetryableError(Exception):
+    """The same call may succeed later."""
+
+
+class FatalError(Exception):
+    """The call fails the same way on every attempt."""
+
+
+class PayerUnavailable(RetryableError):
+    def __init__(self, payer_name: str, reason: str):
+        super().__init__(f"{payer_name}: {reason}")
+        self.payer_name = payer_name
+        self.reason = reason
+
+
+RETRYABLE_ERRORS = (
+    RetryableError,
+    ConnectionError,
+    TimeoutError,
+    httpx.TransportError,
+    redis.ConnectionError,
+    redis.TimeoutError,
+    OperationalError,
+    PoolTimeoutError,
+    BotoConnectionError,
+    HTTPClientError,
+)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, FatalError):
+        return False
+    if isinstance(exc, RETRYABLE_ERRORS):
+        return True
+    if isinstance(exc, DBAPIError):
+        return bool(exc.connection_invalidated)
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    if isinstance(exc, ClientError):
+        status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode") or 0
+        code = exc.response.get("Error", {}).get("Code")
+        return status == 429 or status >= 500 or code in RETRYABLE_S3_CODES
+    return False
+
+
+def backoff_seconds(retries: int) -> float:
+    """Exponential backoff with equal jitter, so retries from one outage spread out."""
+    ceiling = min(
+        settings.task_retry_backoff_max_seconds,
+        settings.task_retry_backoff_base_seconds * 2**retries,
+    )
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+class PolicyTask(Task):
+    max_retries = 3
+
+    def __call__(self, *args, **kwargs):
+        try:
+            return super().__call__(*args, **kwargs)
+        except (Retry, Ignore, Reject):
+            raise
+        except Exception as exc:
+            if not is_retryable(exc):
+                logger.warning("%s failed permanently: %r", self.name, exc)
+                raise
+            raise self.retry(exc=exc, countdown=backoff_seconds(self.request.retries))
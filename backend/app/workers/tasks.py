@@ -1,26 +1,177 @@
-import tempfile
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import joinedload, undefer, undefer_group
 
 from app.db.session import SessionLocal
 from app.db import models
-from app.services import audit
-from app.services.connectors import get_connector
-from app.services.extraction import extract_with_llm
+from app.services import (
+    audit,
+    eligibility_batches,
+    eligibility_cache,
+    metrics_rollup,
+    text_cache,
+    x12,
+)
+from app.services.connector_engine import (
+    batch_supported,
+    check_eligibility,
+    check_eligibility_batch,
+    get_engine,
+)
+from app.services.connectors import ConnectorResult
+from app.services.extraction import (
+    eligibility_needs_review,
+    evidence_to_json,
+    extract_fields,
+)
 from app.core.config import settings
 from app.services.reporting import render_summary_pdf
-from app.services.storage import download_bytes, ensure_bucket_exists, upload_bytes, upload_text
+from app.services.storage import (
+    delete_object,
+    ensure_bucket_exists,
+    local_file,
+    upload_bytes,
+    upload_text,
+)
 from app.utils.hashing import sha256_text
-from app.utils.text_extraction import extract_text_from_image, extract_text_from_pdf
+from app.utils.page_index import page_offsets
+from app.utils.text_extraction import (
+    extract_pdf_pages,
+    extract_text_from_image,
+    extractor_version,
+)
+from app.workers import breaker, coalesce
 from app.workers.celery_app import celery_app
-
-
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
-def run_verification(self, verification_id: str) -> str:
+from app.workers.retry import PayerUnavailable, PolicyTask
+
+
+def _eligibility_payload(verification: models.Verification) -> dict:
+    patient = verification.patient_info
+    insurance = verification.insurance_info
+    return {
+        "tenant_id": str(verification.tenant_id),
+        "payer_name": verification.payer_name,
+        "member_id": insurance.member_id if insurance else None,
+        "patient_name": patient.patient_name if patient else None,
+        "date_of_birth": patient.date_of_birth.isoformat() if patient else None,
+        "service_category": verification.service_category,
+    }
+
+
+def _record_eligibility(
+    db,
+    verification: models.Verification,
+    result: ConnectorResult,
+    fetched_at: datetime,
+    from_cache: bool,
+) -> bool:
+    """Store a connector response as an artifact, or block the verification.
+
+    Returns whether an artifact was stored and extraction should follow.
+    """
+    verification.eligibility_from_cache = from_cache
+    verification.eligibility_fetched_at = fetched_at
+
+    if result.success and result.raw_text:
+        ensure_bucket_exists()
+        artifact_id = uuid.uuid4()
+        storage_key = upload_text(
+            f"artifacts/{verification.tenant_id}/{artifact_id}.txt", result.raw_text
+        )
+        artifact = models.Artifact(
+            id=artifact_id,
+            tenant_id=verification.tenant_id,
+            verification_id=verification.id,
+            type="text",
+            source="connector",
+            filename=None,
+            storage_key=storage_key,
+            text_content=result.raw_text,
+            sha256=sha256_text(result.raw_text),
+            created_by=None,
+        )
+        db.add(artifact)
+        db.commit()
+        audit.log_event(
+            db,
+            tenant_id=verification.tenant_id,
+            actor_type="system",
+            actor_id=None,
+            event_type="evidence_uploaded",
+            entity_type="artifact",
+            entity_id=artifact.id,
+            diff_json={
+                "source": "connector",
+                "verification_id": str(verification.id),
+                "from_cache": from_cache,
+                "fetched_at": fetched_at.isoformat(),
+            },
+        )
+        return True
+
+    verification.status = "blocked_needs_evidence"
+    db.commit()
+    audit.log_event(
+        db,
+        tenant_id=verification.tenant_id,
+        actor_type="system",
+        actor_id=None,
+        event_type="verification_failed",
+        entity_type="verification",
+        entity_id=verification.id,
+        diff_json={"reason": result.failure_reason},
+    )
+    return False
+
+
+def _schedule_drain(payer_name: str, countdown: float) -> None:
+    if breaker.claim_drain(payer_name, countdown):
+        drain_deferred.apply_async(args=[payer_name], countdown=countdown)
+
+
+def _note_payer_result(payer_name: str, result: ConnectorResult) -> None:
+    if result.retryable:
+        breaker.record_failure(payer_name)
+    elif breaker.record_success(payer_name):
+        # Any answer, even a rejection, shows the payer is back.
+        drain_deferred.delay(payer_name)
+
+
+def _defer_verification(
+    db, verification: models.Verification, task_name: str, args: list, kwargs: dict
+) -> str:
+    payer_name = verification.payer_name
+    breaker.park(payer_name, task_name, args, kwargs)
+    _schedule_drain(payer_name, breaker.retry_in(payer_name))
+    verification.status = "deferred"
+    db.commit()
+    audit.log_event(
+        db,
+        tenant_id=verification.tenant_id,
+        actor_type="system",
+        actor_id=None,
+        event_type="verification_deferred",
+        entity_type="verification",
+        entity_id=verification.id,
+        diff_json={"payer_name": payer_name, "breaker": breaker.state(payer_name)},
+    )
+    return "deferred"
+
+
+@celery_app.task(bind=True, base=PolicyTask, max_retries=3)
+def run_verification(self, verification_id: str, bypass_cache: bool = False) -> str:
     db = SessionLocal()
     try:
         verification = db.query(models.Verification).filter_by(id=verification_id).first()
         if not verification:
             return "verification_not_found"
+        if verification.status == eligibility_batches.QUEUED:
+            # Claimed by a batch after this run was requested; the batch runs it.
+            return "queued_in_batch"
 
         verification.status = "running"
         db.commit()
@@ -35,124 +186,469 @@ def run_verification(self, verification_id: str) -> str:
             diff_json=None,
         )
 
-        patient = verification.patient_info
-        insurance = verification.insurance_info
-        payload = {
-            "payer_name": verification.payer_name,
-            "member_id": insurance.member_id if insurance else None,
-            "patient_name": patient.patient_name if patient else None,
-            "date_of_birth": patient.date_of_birth.isoformat() if patient else None,
-        }
-        connector = get_connector(verification.payer_name)
-        result = connector.get_eligibility(payload)
-
-        if result.success and result.raw_text:
-            ensure_bucket_exists()
-            artifact_id = uuid.uuid4()
-            storage_key = f"artifacts/{verification.tenant_id}/{artifact_id}.txt"
-            upload_text(storage_key, result.raw_text)
-            artifact = models.Artifact(
-                id=artifact_id,
-                tenant_id=verification.tenant_id,
-                verification_id=verification.id,
-                type="text",
-                source="connector",
-                filename=None,
-                storage_key=storage_key,
-                text_content=result.raw_text,
-                sha256=sha256_text(result.raw_text),
-                created_by=None,
-            )
-            db.add(artifact)
+        payload = _eligibility_payload(verification)
+        cached = None if bypass_cache else eligibility_cache.get(payload)
+        if cached:
+            result = ConnectorResult(success=True, raw_text=cached.raw_text)
+            fetched_at = cached.fetched_at
+        else:
+            payer_name = verification.payer_name
+            call = (self.name, [verification_id], {"bypass_cache": bypass_cache})
+            if not breaker.allow(payer_name):
+                return _defer_verification(db, verification, *call)
+            # End the read transaction so no pooled connection is held while the
+            # payer answers; the verification reloads when it is next used.
             db.commit()
-            audit.log_event(
-                db,
-                tenant_id=verification.tenant_id,
-                actor_type="system",
-                actor_id=None,
-                event_type="evidence_uploaded",
-                entity_type="artifact",
-                entity_id=artifact.id,
-                diff_json={"source": "connector", "verification_id": str(verification.id)},
-            )
-            extract_summary.delay(str(verification.id))
+            result = check_eligibility(payload)
+            fetched_at = datetime.now(timezone.utc)
+            _note_payer_result(payer_name, result)
+            if result.retryable:
+                if breaker.state(payer_name) != breaker.CLOSED:
+                    return _defer_verification(db, verification, *call)
+                if self.request.retries < self.max_retries:
+                    raise PayerUnavailable(payer_name, result.failure_reason)
+            if result.success and result.raw_text:
+                eligibility_cache.put(payload, result.raw_text, fetched_at)
+
+        if _record_eligibility(db, verification, result, fetched_at, cached is not None):
+            coalesce.trigger(extract_summary, str(verification.id))
             return "queued_extraction"
-
-        verification.status = "blocked_needs_evidence"
-        db.commit()
-        audit.log_event(
-            db,
-            tenant_id=verification.tenant_id,
-            actor_type="system",
-            actor_id=None,
-            event_type="verification_failed",
-            entity_type="verification",
-            entity_id=verification.id,
-            diff_json={"reason": result.failure_reason},
-        )
         return "blocked_needs_evidence"
     finally:
         db.close()
 
 
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
-def extract_summary(self, verification_id: str) -> str:
+def _batch_trace(verification_id) -> str:
+    # TRN02 allows 50 characters; a bare UUID fits and maps straight back.
+    return uuid.UUID(str(verification_id)).hex
+
+
+def _fetch_batch_responses(
+    payer_name: str, payloads: dict[str, dict], control: str
+) -> Iterator[tuple[str, ConnectorResult, datetime]]:
+    """Yield (verification id, result, fetched_at) for every payload in a batch."""
+    if not batch_supported(payer_name):
+        # No batch API for this payer: fan the inquiries out on the engine.
+        engine = get_engine()
+        futures = {
+            engine.submit(payload): verification_id
+            for verification_id, payload in payloads.items()
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            _note_payer_result(payer_name, result)
+            yield futures[future], result, datetime.now(timezone.utc)
+        return
+
+    by_trace = {_batch_trace(verification_id): verification_id for verification_id in payloads}
+    interchange = x12.build_270(
+        payer_name,
+        [{**payload, "trace": trace} for trace, payload in zip(by_trace, payloads.values())],
+        control,
+    )
+    result = check_eligibility_batch(payer_name, interchange)
+    fetched_at = datetime.now(timezone.utc)
+    _note_payer_result(payer_name, result)
+    if not (result.success and result.raw_text):
+        for verification_id in payloads:
+            yield verification_id, result, fetched_at
+        return
+
+    for trace, response in x12.split_271(x12.chunked(result.raw_text)):
+        verification_id = by_trace.pop(trace, None)
+        if verification_id is not None:
+            yield verification_id, ConnectorResult(success=True, raw_text=response), fetched_at
+    missing = ConnectorResult(success=False, failure_reason="no 271 response in batch")
+    for verification_id in by_trace.values():
+        yield verification_id, missing, fetched_at
+
+
+def _batch_summary(batch: models.EligibilityBatch) -> dict:
+    return {
+        "status": batch.status,
+        "total": batch.total,
+        "succeeded": batch.succeeded,
+        "failed": batch.failed,
+    }
+
+
+def _queue_batch_extraction(verification_ids: list[str]) -> None:
+    chunk_size = max(settings.extraction_batch_chunk_size, 1)
+    for start in range(0, len(verification_ids), chunk_size):
+        extract_summary_batch.delay(verification_ids[start : start + chunk_size])
+
+
+def _defer_batch(task, db, batch: models.EligibilityBatch, extract_ids: list[str]) -> dict:
+    breaker.park(batch.payer_name, task.name, [str(batch.id)])
+    _schedule_drain(batch.payer_name, breaker.retry_in(batch.payer_name))
+    batch.status = "deferred"
+    db.commit()
+    # Answers recorded before the breaker opened are not revisited by the drain.
+    _queue_batch_extraction(extract_ids)
+    return _batch_summary(batch)
+
+
+@celery_app.task(bind=True, base=PolicyTask, max_retries=3)
+def run_eligibility_batch(self, batch_id: str) -> dict:
+    """Send one batched 270 for a payer and fan the 271s out to each verification.
+
+    Each answer is committed as it is recorded and only verifications still
+    ``queued`` are sent, so a retry does not resend answered inquiries. If an
+    attempt fails part-way or is deferred behind the payer's breaker, the
+    verifications it recorded are queued for extraction first.
+    """
     db = SessionLocal()
     try:
-        verification = db.query(models.Verification).filter_by(id=verification_id).first()
-        if not verification:
-            return "verification_not_found"
+        batch = db.query(models.EligibilityBatch).filter_by(id=batch_id).first()
+        if not batch:
+            return {"status": "batch_not_found"}
+        batch.status = "running"
+        batch.started_at = batch.started_at or datetime.now(timezone.utc)
+        db.commit()
 
-        artifacts = db.query(models.Artifact).filter_by(verification_id=verification_id).all()
-        artifact_payloads: list[dict] = []
+        verifications = {
+            str(verification.id): verification
+            for verification in db.query(models.Verification)
+            .options(
+                joinedload(models.Verification.patient_info),
+                joinedload(models.Verification.insurance_info),
+            )
+            .filter(
+                models.Verification.eligibility_batch_id == batch.id,
+                models.Verification.status == eligibility_batches.QUEUED,
+            )
+        }
+        extract_ids: list[str] = []
+        payloads: dict[str, dict] = {}
+        unanswered = 0
+        try:
+            for verification_id, verification in verifications.items():
+                payload = _eligibility_payload(verification)
+                cached = eligibility_cache.get(payload)
+                if cached is None:
+                    payloads[verification_id] = payload
+                    continue
+                verification.status = "running"
+                result = ConnectorResult(success=True, raw_text=cached.raw_text)
+                _record_eligibility(db, verification, result, cached.fetched_at, True)
+                batch.succeeded += 1
+                batch.from_cache += 1
+                db.commit()
+                extract_ids.append(verification_id)
+
+            if payloads and not breaker.allow(batch.payer_name):
+                return _defer_batch(self, db, batch, extract_ids)
+            retries_left = self.request.retries < self.max_retries
+            if payloads:
+                control = f"{uuid.UUID(str(batch.id)).int % 10**9:09d}"
+                payer_name = batch.payer_name
+                # As in run_verification: hold no pooled connection during the payer wait.
+                db.commit()
+                responses = _fetch_batch_responses(payer_name, payloads, control)
+                for verification_id, result, fetched_at in responses:
+                    if result.retryable and (
+                        retries_left or breaker.state(payer_name) != breaker.CLOSED
+                    ):
+                        # Stays queued for the retry or the breaker drain to resend.
+                        unanswered += 1
+                        continue
+                    verification = verifications[verification_id]
+                    verification.status = "running"
+                    if result.success and result.raw_text:
+                        eligibility_cache.put(
+                            payloads[verification_id], result.raw_text, fetched_at
+                        )
+                    if _record_eligibility(db, verification, result, fetched_at, False):
+                        batch.succeeded += 1
+                        extract_ids.append(verification_id)
+                    else:
+                        batch.failed += 1
+                        batch.failure_reason = result.failure_reason
+                    db.commit()
+        except Exception:
+            _queue_batch_extraction(extract_ids)
+            raise
+        if unanswered:
+            if breaker.state(batch.payer_name) != breaker.CLOSED:
+                return _defer_batch(self, db, batch, extract_ids)
+            _queue_batch_extraction(extract_ids)
+            raise PayerUnavailable(batch.payer_name, f"{unanswered} inquiries unanswered")
+
+        batch.status = "failed" if batch.failed and not batch.succeeded else "completed"
+        batch.completed_at = datetime.now(timezone.utc)
+        db.commit()
+        _queue_batch_extraction(extract_ids)
+        return _batch_summary(batch)
+    finally:
+        db.close()
 
-        for artifact in artifacts:
-            text = ""
-            if artifact.type == "text" and artifact.text_content:
-                text = artifact.text_content
-            elif artifact.storage_key:
-                data = download_bytes(artifact.storage_key)
-                with tempfile.NamedTemporaryFile(delete=False) as tmp:
-                    tmp.write(data)
-                    tmp.flush()
-                    if artifact.type == "pdf":
-                        text = extract_text_from_pdf(tmp.name)
-                    elif artifact.type == "image":
-                        text = extract_text_from_image(tmp.name)
-            artifact_payloads.append({"id": str(artifact.id), "text": text})
-
-        extraction = extract_with_llm(artifact_payloads)
-
-        db.query(models.SummaryField).filter_by(verification_id=verification_id).delete()
-        db.query(models.DraftSummary).filter_by(verification_id=verification_id).delete()
-
-        draft = models.DraftSummary(
-            verification_id=verification.id,
-            llm_model_name=settings.llm_model_name,
-            raw_llm_output_json=extraction.raw_output,
+
+@celery_app.task(bind=True, base=PolicyTask, max_retries=3)
+def drain_deferred(self, payer_name: str) -> int:
+    """Release calls parked behind a payer's circuit breaker.
+
+    While the breaker is open this reschedules itself for the end of the
+    cooldown; half-open it releases one call as the probe; closed it releases
+    the backlog a chunk per run.
+    """
+    breaker.release_drain(payer_name)
+    state = breaker.state(payer_name)
+    if state == breaker.OPEN:
+        _schedule_drain(payer_name, breaker.retry_in(payer_name))
+        return 0
+    size = 1 if state == breaker.HALF_OPEN else max(settings.circuit_breaker_drain_batch_size, 1)
+    entries = breaker.take_deferred(payer_name, size)
+    for entry in entries:
+        celery_app.send_task(entry["task"], args=entry["args"], kwargs=entry["kwargs"])
+    if state == breaker.HALF_OPEN and entries:
+        # Send another probe if this one never reports back.
+        _schedule_drain(payer_name, settings.circuit_breaker_probe_timeout_seconds)
+    elif state == breaker.CLOSED and breaker.deferred_count(payer_name):
+        _schedule_drain(payer_name, 0)
+    return len(entries)
+
+
+def _extract_artifact_pages(source: dict) -> list[str]:
+    # The local backend hands over the stored file itself; S3 streams to a temp file.
+    with local_file(source["storage_key"]) as path:
+        if source["type"] == "pdf":
+            return extract_pdf_pages(path).pages
+        return [extract_text_from_image(path)]
+
+
+def _load_artifact_texts(db, artifacts: list[models.Artifact]) -> list[dict]:
+    sources = []
+    for artifact in artifacts:
+        version = extractor_version(artifact.type)
+        sources.append(
+            {
+                "id": str(artifact.id),
+                "type": artifact.type,
+                "text_content": artifact.text_content,
+                "storage_key": artifact.storage_key,
+                "cache_key": (artifact.sha256, version) if version else None,
+            }
         )
-        db.add(draft)
-        db.commit()
 
-        for field in extraction.fields:
-            summary = models.SummaryField(
-                verification_id=verification.id,
-                field_name=field.field_name,
-                value_json=field.value,
-                confidence=field.confidence,
-                evidence_ref_json=None
-                if not field.evidence
-                else {
-                    "artifact_id": field.evidence.artifact_id,
-                    "text_span": field.evidence.text_span,
-                    "page": field.evidence.page,
-                },
-                status="draft",
-            )
-            db.add(summary)
+    cached = text_cache.lookup(db, [s["cache_key"] for s in sources if s["cache_key"]])
+    pending = [
+        s
+        for s in sources
+        if not (s["type"] == "text" and s["text_content"])
+        and s["storage_key"]
+        and s["type"] in ["pdf", "image"]
+        and s["cache_key"] not in cached
+    ]
+    extracted: dict[str, list[str]] = {}
+    if pending:
+        workers = max(1, min(settings.extraction_artifact_concurrency, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for source, pages in zip(pending, pool.map(_extract_artifact_pages, pending)):
+                extracted[source["id"]] = pages
+        text_cache.store(
+            db, {s["cache_key"]: extracted[s["id"]] for s in pending if s["cache_key"]}
+        )
 
-        verification.status = "needs_human_review" if extraction.needs_review else "draft_ready"
-        db.commit()
+    payloads: list[dict] = []
+    for source in sources:
+        if source["type"] == "text" and source["text_content"]:
+            pages = [source["text_content"]]
+        elif source["id"] in extracted:
+            pages = extracted[source["id"]]
+        elif source["cache_key"] in cached:
+            pages = cached[source["cache_key"]]
+        else:
+            pages = []
+        payloads.append(
+            {
+                "id": source["id"],
+                "text": "".join(pages),
+                "pages": pages,
+                "page_offsets": page_offsets(pages),
+            }
+        )
+    return payloads
+
+
+def _index_artifact_pages(db, artifacts: list[models.Artifact], payloads: list[dict]) -> None:
+    # Text artifacts are a single page read from the artifact itself; files
+    # keep one row per page so evidence lookups never load the whole document.
+    stale: list[uuid.UUID] = []
+    rows: list[dict] = []
+    for artifact, payload in zip(artifacts, payloads):
+        offsets = payload["page_offsets"]
+        if not payload["pages"] or artifact.page_offsets == offsets:
+            continue
+        artifact.page_offsets = offsets
+        if artifact.type == "text":
+            continue
+        stale.append(artifact.id)
+        rows.extend(
+            {"artifact_id": artifact.id, "page_number": number, "text": text}
+            for number, text in enumerate(payload["pages"], start=1)
+        )
+    if stale:
+        db.query(models.ArtifactPage).filter(
+            models.ArtifactPage.artifact_id.in_(stale)
+        ).delete(synchronize_session=False)
+    if rows:
+        db.execute(insert(models.ArtifactPage), rows)
+
+
+def _is_reviewer_owned(field: models.SummaryField) -> bool:
+    return field.status != "draft" or field.reviewer_id is not None
+
+
+def _merge_summary_fields(
+    verification_id: uuid.UUID,
+    existing: dict[str, models.SummaryField],
+    extraction,
+    incremental: bool,
+) -> tuple[list[dict], list[dict], bool, set[str]]:
+    """Rows to insert and update, whether review is needed, and the fields this run set."""
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    applied: set[str] = set()
+    eligibility = existing.get("eligibility_status")
+    if eligibility is None:
+        needs_review = True
+    elif _is_reviewer_owned(eligibility):
+        needs_review = eligibility.value_json in [None, "unknown"]
+    else:
+        needs_review = eligibility_needs_review(eligibility.value_json, float(eligibility.confidence))
+
+    for field in extraction.fields:
+        current = existing.get(field.field_name)
+        values = {
+            "value_json": field.value,
+            "confidence": field.confidence,
+            "evidence_ref_json": evidence_to_json(field.evidence),
+        }
+        if current is None:
+            inserts.append(
+                {
+                    "verification_id": verification_id,
+                    "field_name": field.field_name,
+                    "status": "draft",
+                    **values,
+                }
+            )
+        elif _is_reviewer_owned(current):
+            continue
+        elif incremental and field.confidence <= float(current.confidence):
+            continue
+        else:
+            updates.append({"id": current.id, **values})
+        applied.add(field.field_name)
+        if field.field_name == "eligibility_status":
+            needs_review = eligibility_needs_review(field.value, field.confidence)
+    return inserts, updates, needs_review, applied
+
+
+def _merge_raw_output(previous: Optional[dict], extraction, applied: set[str]) -> dict:
+    """Raw output backing the merged summary: each field keeps the entry of the run that set it."""
+    if not previous:
+        return extraction.raw_output
+    field_names = {field.field_name for field in extraction.fields}
+    merged = dict(previous)
+    for name, entry in extraction.raw_output.items():
+        if name not in field_names or name in applied or name not in merged:
+            merged[name] = entry
+    return merged
+
+
+def _extract_summaries(db, verification_ids: list[str], incremental: bool) -> dict[str, str]:
+    verifications = (
+        db.query(models.Verification).filter(models.Verification.id.in_(verification_ids)).all()
+    )
+    results = {str(verification_id): "verification_not_found" for verification_id in verification_ids}
+    for verification in verifications:
+        if verification.status == "finalized":
+            # A finalized summary is frozen; re-extracting would reopen its fields.
+            results[str(verification.id)] = "already_finalized"
+    verifications = [
+        verification for verification in verifications if verification.status != "finalized"
+    ]
+    if not verifications:
+        return results
+    found_ids = [verification.id for verification in verifications]
+
+    artifact_query = (
+        db.query(models.Artifact)
+        .options(undefer_group("text"), undefer(models.Artifact.page_offsets))
+        .filter(models.Artifact.verification_id.in_(found_ids))
+    )
+    if incremental:
+        artifact_query = artifact_query.filter(models.Artifact.extracted_at.is_(None))
+    artifacts = artifact_query.order_by(models.Artifact.created_at).all()
+    payloads = _load_artifact_texts(db, artifacts)
+    _index_artifact_pages(db, artifacts, payloads)
+    payloads_by_verification: dict[uuid.UUID, list[dict]] = {}
+    for artifact, payload in zip(artifacts, payloads):
+        payloads_by_verification.setdefault(artifact.verification_id, []).append(payload)
+
+    existing_by_verification: dict[uuid.UUID, dict[str, models.SummaryField]] = {}
+    for field in db.query(models.SummaryField).filter(
+        models.SummaryField.verification_id.in_(found_ids)
+    ):
+        existing_by_verification.setdefault(field.verification_id, {})[field.field_name] = field
+    draft_columns = [models.DraftSummary.verification_id]
+    if incremental:
+        # Incremental runs extend the previous draft's raw output.
+        draft_columns.append(models.DraftSummary.raw_llm_output_json)
+    previous_raw: dict[uuid.UUID, Optional[dict]] = {
+        row[0]: row[1] if incremental else None
+        for row in db.query(*draft_columns).filter(
+            models.DraftSummary.verification_id.in_(found_ids)
+        )
+    }
+
+    drafts: list[dict] = []
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    completed: list[models.Verification] = []
+    for verification in verifications:
+        artifact_payloads = payloads_by_verification.get(verification.id, [])
+        if incremental and not artifact_payloads:
+            results[str(verification.id)] = "no_new_artifacts"
+            continue
+        extraction = extract_fields(artifact_payloads, verification.service_category)
+        field_inserts, field_updates, needs_review, applied = _merge_summary_fields(
+            verification.id,
+            existing_by_verification.get(verification.id, {}),
+            extraction,
+            incremental,
+        )
+        drafts.append(
+            {
+                "verification_id": verification.id,
+                "llm_model_name": settings.llm_model_name,
+                "raw_llm_output_json": _merge_raw_output(
+                    previous_raw.get(verification.id), extraction, applied
+                ),
+            }
+        )
+        inserts.extend(field_inserts)
+        updates.extend(field_updates)
+        verification.status = "needs_human_review" if needs_review else "draft_ready"
+        results[str(verification.id)] = verification.status
+        completed.append(verification)
+
+    if drafts:
+        # One draft per verification: each run replaces the previous one.
+        db.query(models.DraftSummary).filter(
+            models.DraftSummary.verification_id.in_([draft["verification_id"] for draft in drafts])
+        ).delete(synchronize_session=False)
+        db.execute(insert(models.DraftSummary), drafts)
+    if inserts:
+        db.execute(insert(models.SummaryField), inserts)
+    if updates:
+        db.execute(update(models.SummaryField), updates)
+    if artifacts:
+        db.query(models.Artifact).filter(
+            models.Artifact.id.in_([artifact.id for artifact in artifacts])
+        ).update({"extracted_at": datetime.now(timezone.utc)}, synchronize_session=False)
+    for verification in completed:
         audit.log_event(
             db,
             tenant_id=verification.tenant_id,
@@ -161,14 +657,75 @@ def extract_summary(self, verification_id: str) -> str:
             event_type="extraction_completed",
             entity_type="verification",
             entity_id=verification.id,
-            diff_json={"status": verification.status},
+            diff_json={
+                "status": verification.status,
+                "incremental": incremental,
+                "first_draft": verification.id not in previous_raw,
+                "artifact_ids": [
+                    payload["id"] for payload in payloads_by_verification.get(verification.id, [])
+                ],
+            },
+            sync=True,
         )
-        return verification.status
-    finally:
-        db.close()
+    db.commit()
+    return results
 
 
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+@celery_app.task(bind=True, base=PolicyTask, max_retries=3)
+def extract_summary(self, verification_id: str, incremental: bool = True) -> str:
+    token = coalesce.acquire(self, verification_id)
+    if token is None:
+        coalesce.defer(self, verification_id)
+        return "deferred"
+    db = SessionLocal()
+    try:
+        results = _extract_summaries(db, [verification_id], incremental)
+        return next(iter(results.values()))
+    finally:
+        db.close()
+        coalesce.release(self, verification_id, token)
+
+
+@celery_app.task(bind=True, base=PolicyTask, max_retries=3)
+def extract_summary_batch(self, verification_ids: list[str], incremental: bool = True) -> dict:
+    results: dict[str, str] = {}
+    chunk_size = max(settings.extraction_batch_chunk_size, 1)
+    for start in range(0, len(verification_ids), chunk_size):
+        chunk = [str(verification_id) for verification_id in verification_ids[start : start + chunk_size]]
+        tokens: dict[str, str] = {}
+        for verification_id in chunk:
+            token = coalesce.acquire(extract_summary, verification_id)
+            if token is None:
+                # A single run holds this verification; hand it a follow-up.
+                # A pending incremental run would swallow a full re-extraction,
+                # so only incremental follow-ups are coalesced.
+                if incremental:
+                    coalesce.trigger(extract_summary, verification_id)
+                else:
+                    extract_summary.apply_async(
+                        args=[verification_id, False],
+                        countdown=settings.task_coalesce_window_seconds,
+                    )
+                results[verification_id] = "deferred"
+            else:
+                tokens[verification_id] = token
+        if not tokens:
+            continue
+        db = SessionLocal()
+        try:
+            results.update(_extract_summaries(db, list(tokens), incremental))
+        finally:
+            db.close()
+            for verification_id, token in tokens.items():
+                coalesce.release(extract_summary, verification_id, token)
+
+    counts: dict[str, int] = {}
+    for status in results.values():
+        counts[status] = counts.get(status, 0) + 1
+    return {"total": len(results), "statuses": counts}
+
+
+@celery_app.task(bind=True, base=PolicyTask, max_retries=3)
 def generate_report(self, verification_id: str) -> str:
     db = SessionLocal()
     try:
@@ -222,7 +779,7 @@ def generate_report(self, verification_id: str) -> str:
         db.close()
 
 
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+@celery_app.task(bind=True, base=PolicyTask, max_retries=3)
 def classify_intake_item(self, intake_id: str) -> str:
     db = SessionLocal()
     try:
@@ -267,7 +824,7 @@ def classify_intake_item(self, intake_id: str) -> str:
         db.close()
 
 
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+@celery_app.task(bind=True, base=PolicyTask, max_retries=3)
 def process_prior_auth(self, pa_id: str) -> str:
     from datetime import datetime
     db = SessionLocal()
@@ -301,7 +858,7 @@ def process_prior_auth(self, pa_id: str) -> str:
         db.close()
 
 
-@celery_app.task(bind=True, autoretry_for=(Exception,), retry_backoff=True, max_retries=3)
+@celery_app.task(bind=True, base=PolicyTask, max_retries=3)
 def process_referral(self, referral_id: str) -> str:
     db = SessionLocal()
     try:
@@ -332,3 +889,88 @@ def process_referral(self, referral_id: str) -> str:
         return "qualified"
     finally:
         db.close()
+
+
+@celery_app.task(bind=True)
+def purge_extracted_text_cache(self, extractor_version: Optional[str] = None) -> int:
+    db = SessionLocal()
+    try:
+        if extractor_version:
+            return text_cache.invalidate(db, extractor_version=extractor_version)
+        return text_cache.invalidate(db, stale_only=True)
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True)
+def rebuild_metric_rollups(self, tenant_id: Optional[str] = None) -> int:
+    db = SessionLocal()
+    try:
+        return metrics_rollup.rebuild(db, uuid.UUID(tenant_id) if tenant_id else None)
+    finally:
+        db.close()
+
+
+@celery_app.task(bind=True)
+def compress_artifact_text(self, batch_size: int = 500, decompress: bool = False) -> int:
+    """Backfill: move artifact text into (or, with decompress, out of) text_content_zstd.
+
+    Connector text copies in object storage are rewritten as ``.zst`` objects
+    alongside, so DB and object-store copies use the same codec. Keys held by a
+    blob row are left alone: other artifacts may share them.
+    """
+    if not decompress and not settings.text_compression_enabled:
+        return 0
+    source_column = (
+        models.Artifact.text_content_zstd if decompress else models.Artifact.text_content_raw
+    )
+    db = SessionLocal()
+    converted = 0
+    last_id = None
+    try:
+        while True:
+            query = (
+                db.query(models.Artifact)
+                .options(undefer_group("text"))
+                .filter(source_column.isnot(None))
+            )
+            if last_id is not None:
+                query = query.filter(models.Artifact.id > last_id)
+            batch = query.order_by(models.Artifact.id).limit(batch_size).all()
+            if not batch:
+                return converted
+
+            shared_keys = {
+                key
+                for (key,) in db.query(models.Blob.storage_key).filter(
+                    models.Blob.storage_key.in_(
+                        [artifact.storage_key for artifact in batch if artifact.storage_key]
+                    )
+                )
+            }
+            replaced_keys = []
+            for artifact in batch:
+                text = artifact.text_content
+                if decompress:
+                    artifact.text_content_raw = text
+                    artifact.text_content_zstd = None
+                    continue
+                artifact.text_content = text
+                if (
+                    artifact.source == "connector"
+                    and artifact.storage_key
+                    and artifact.storage_key not in shared_keys
+                    and text
+                ):
+                    new_key = upload_text(artifact.storage_key, text)
+                    if new_key != artifact.storage_key:
+                        replaced_keys.append(artifact.storage_key)
+                        artifact.storage_key = new_key
+            db.commit()
+            for key in replaced_keys:
+                delete_object(key)
+            converted += len(batch)
+            last_id = batch[-1].id
+            db.expunge_all()
+    finally:
+        db.close()
@@ -0,0 +1,63 @@
+"""Drive eligibility checks through the connector engine and report latency.
+
+    python scripts/load_test_connectors.py --requests 2000 --payers Aetna,Cigna
+
+Uses whichever connector ELIGIBILITY_CONNECTOR selects; with "simulator" no
+network is needed. Requests are submitted at once, so the engine's per-payer
+limits decide how many are in flight.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import as_completed
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.connector_engine import get_engine  # noqa: E402
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--payers", default="Aetna")
+    parser.add_argument("--service-category", default="Physical Therapy")
+    args = parser.parse_args()
+
+    payers = [payer.strip() for payer in args.payers.split(",") if payer.strip()]
+    engine = get_engine()
+    started = time.monotonic()
+    submitted_at = {}
+    for index in range(args.requests):
+        payload = {
+            "payer_name": payers[index % len(payers)],
+            "member_id": f"LT{index:08d}",
+            "patient_name": "Load Test",
+            "date_of_birth": "1980-01-01",
+            "service_category": args.service_category,
+        }
+        submitted_at[engine.submit(payload)] = time.monotonic()
+
+    latencies: list[float] = []
+    outcomes: Counter = Counter()
+    for future in as_completed(submitted_at):
+        latencies.append(time.monotonic() - submitted_at[future])
+        result = future.result()
+        outcomes["ok" if result.success else result.failure_reason] += 1
+    elapsed = time.monotonic() - started
+
+    print(f"{args.requests} checks in {elapsed:.1f}s ({args.requests / elapsed:.0f}/s)")
+    for fraction in (0.5, 0.95, 0.99):
+        print(f"  p{int(fraction * 100)}: {percentile(latencies, fraction) * 1000:.0f} ms")
+    for outcome, count in outcomes.most_common():
+        print(f"  {outcome}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Serve the payer simulator over HTTP.
+
+    python scripts/run_payer_simulator.py [--port 9100]
+
+Point ELIGIBILITY_CONNECTOR=simulator_http and PAYER_SIMULATOR_URL at it.
+Profiles come from PAYER_SIMULATOR_PROFILES, e.g.
+'{"default": {"latency_median_ms": 800, "latency_p99_ms": 25000},
+  "aetna": {"error_rate": 0.02, "rate_limit_per_second": 50, "response_format": "x12"}}'.
+"""
+import argparse
+import os
+import sys
+
+import uvicorn
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.payer_simulator import create_app  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9100)
+    args = parser.parse_args()
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
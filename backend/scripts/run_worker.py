@@ -0,0 +1,32 @@
+"""Start a Celery worker for one of the configured worker profiles.
+
+    python scripts/run_worker.py cpu|connectors|light [extra celery worker args]
+
+Profiles (pool, concurrency, prefetch, queues) come from CELERY_WORKER_PROFILES
+and routing from CELERY_TASK_QUEUES; see app/core/config.py for the defaults.
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.workers.profiles import profile_for, worker_argv  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("profile")
+    parser.add_argument("--loglevel", default="info")
+    parser.add_argument("--dry-run", action="store_true", help="Print the command only")
+    args, extra = parser.parse_known_args()
+
+    argv = worker_argv(profile_for(args.profile), args.loglevel) + extra
+    if args.dry_run:
+        print(" ".join(argv))
+        return
+    os.execvp(argv[0], argv)
+
+
+if __name__ == "__main__":
+    main()
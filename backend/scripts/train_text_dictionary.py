@@ -0,0 +1,71 @@
+"""Train the zstd dictionary used to compress artifact text.
+
+    python scripts/train_text_dictionary.py --name payer-responses-v2 [--synthetic]
+
+Samples connector and manual artifact text from the database (or synthetic
+mock-connector responses with --synthetic) and writes
+app/utils/zstd_dicts/<name>.dict. Point TEXT_COMPRESSION_DICTIONARY at the new
+name to start using it; older dictionaries must stay in the directory for as
+long as rows compressed with them exist.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import models  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.connectors import MockEligibilityConnector  # noqa: E402
+from app.utils.compression import DICTIONARY_DIR, train_dictionary  # noqa: E402
+
+PAYERS = ["Aetna", "Cigna", "UnitedHealthcare", "Humana", "Blue Cross Blue Shield", "Medicare"]
+
+
+def synthetic_samples(count: int) -> list[str]:
+    connector = MockEligibilityConnector()
+    rng = random.Random(0)
+    samples = []
+    for _ in range(count):
+        member_id = "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789") for _ in range(10))
+        result = asyncio.run(
+            connector.get_eligibility({"payer_name": rng.choice(PAYERS), "member_id": member_id})
+        )
+        samples.append(result.raw_text or "")
+    return samples
+
+
+def database_samples(count: int) -> list[str]:
+    db = SessionLocal()
+    try:
+        artifacts = (
+            db.query(models.Artifact)
+            .filter(models.Artifact.type == "text")
+            .order_by(models.Artifact.created_at.desc())
+            .limit(count)
+            .all()
+        )
+        return [artifact.text_content for artifact in artifacts if artifact.text_content]
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--name", required=True)
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=16 * 1024)
+    parser.add_argument("--synthetic", action="store_true")
+    args = parser.parse_args()
+
+    samples = synthetic_samples(args.samples) if args.synthetic else database_samples(args.samples)
+    data = train_dictionary(samples, args.size)
+    path = DICTIONARY_DIR / f"{args.name}.dict"
+    path.write_bytes(data)
+    print(f"Wrote {path} ({len(data)} bytes from {len(samples)} samples)")
+
+
+if __name__ == "__main__":
+    main()
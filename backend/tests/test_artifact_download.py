@@ -0,0 +1,129 @@
+import sys
+import uuid
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import zstandard
+from fastapi import HTTPException
+from sqlalchemy import JSON, create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.main import app  # noqa: E402
+from app.api.routes import artifacts as artifact_routes  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db import models  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.services import storage  # noqa: E402
+from app.utils.compression import compress_text, decompress_text  # noqa: E402
+
+RESPONSE = "EB*1*IND*30**Gold PPO~\nEB*B*IND*98***23*20~\n" * 20
+
+
+def test_dictionary_frames_need_the_server_side_dictionary(monkeypatch):
+    monkeypatch.setattr(settings, "text_compression_dictionary", "payer-responses-v1")
+    data = compress_text(RESPONSE)
+
+    assert zstandard.get_frame_parameters(data).dict_id != 0
+    assert decompress_text(data) == RESPONSE
+    with pytest.raises(zstandard.ZstdError):
+        zstandard.ZstdDecompressor().decompress(data)
+
+
+@pytest.fixture
+def stored(tmp_path, monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    for table in Base.metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, JSONB):
+                column.type = JSON()
+    for table in [
+        models.Tenant.__table__,
+        models.User.__table__,
+        models.Verification.__table__,
+        models.Artifact.__table__,
+    ]:
+        table.create(bind=engine, checkfirst=True)
+    monkeypatch.setattr(settings, "text_compression_enabled", True)
+    monkeypatch.setattr(storage, "_backend", storage.LocalBackend(str(tmp_path)))
+
+    db = sessionmaker(bind=engine)()
+    tenant = models.Tenant(name="Test Tenant")
+    db.add(tenant)
+    db.flush()
+    user = models.User(tenant_id=tenant.id, email="u@test.com", password_hash="x", role="admin")
+    db.add(user)
+    db.flush()
+    verification = models.Verification(
+        tenant_id=tenant.id,
+        status="pending",
+        payer_name="Aetna",
+        service_category="PT",
+        created_by=user.id,
+    )
+    db.add(verification)
+    db.flush()
+    artifact_id = uuid.uuid4()
+    key = storage.upload_text(f"artifacts/{tenant.id}/{artifact_id}.txt", RESPONSE)
+    artifact = models.Artifact(
+        id=artifact_id,
+        tenant_id=tenant.id,
+        verification_id=verification.id,
+        type="text",
+        source="connector",
+        storage_key=key,
+        text_content=RESPONSE,
+        sha256="0" * 64,
+    )
+    db.add(artifact)
+    db.commit()
+    yield db, artifact, user
+    db.close()
+
+
+def _request():
+    return Request(
+        {
+            "type": "http",
+            "app": app,
+            "router": app.router,
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "path": "/",
+            "root_path": "",
+            "headers": [],
+            "query_string": b"",
+        }
+    )
+
+
+def test_compressed_connector_text_downloads_as_plain_text(stored):
+    db, artifact, user = stored
+    assert artifact.storage_key.endswith(".txt.zst")
+
+    link = artifact_routes.download_artifact(artifact.id, _request(), db=db, user=user)
+    url = urlsplit(link["download_url"])
+    query = {name: values[0] for name, values in parse_qs(url.query).items()}
+    assert url.path == f"/artifacts/{artifact.id}/text-file"
+
+    response = artifact_routes.read_compressed_artifact(
+        artifact.id, int(query["expires"]), query["signature"], db=db
+    )
+    assert response.body.decode("utf-8") == RESPONSE
+    assert response.media_type.startswith("text/plain")
+    assert response.headers["content-disposition"].endswith(f"{artifact.id}.txt")
+
+    with pytest.raises(HTTPException) as forged:
+        artifact_routes.read_compressed_artifact(
+            artifact.id, int(query["expires"]), "0" * 64, db=db
+        )
+    assert forged.value.status_code == 403
@@ -0,0 +1,152 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import JSON, create_engine, event, inspect
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.api.pagination import ListParams, TextRange  # noqa: E402
+from app.api.routes import artifacts as artifact_routes  # noqa: E402
+from app.api.routes import summary as summary_routes  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db import models  # noqa: E402
+from app.db.base import Base  # noqa: E402
+
+TEXT = "Copay: $20\nCoinsurance: 30%\nDeductible: $500\n"
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    for table in Base.metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, JSONB):
+                column.type = JSON()
+    for table in [
+        models.Tenant.__table__,
+        models.User.__table__,
+        models.Verification.__table__,
+        models.Artifact.__table__,
+        models.DraftSummary.__table__,
+    ]:
+        table.create(bind=engine, checkfirst=True)
+    monkeypatch.setattr(settings, "text_compression_enabled", False)
+
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    tenant = models.Tenant(name="Test Tenant")
+    db.add(tenant)
+    db.flush()
+    user = models.User(tenant_id=tenant.id, email="u@test.com", password_hash="x", role="admin")
+    db.add(user)
+    db.flush()
+    verification = models.Verification(
+        tenant_id=tenant.id,
+        status="pending",
+        payer_name="Aetna",
+        service_category="PT",
+        created_by=user.id,
+    )
+    db.add(verification)
+    db.flush()
+    artifact = models.Artifact(
+        tenant_id=tenant.id,
+        verification_id=verification.id,
+        type="text",
+        source="manual_entry",
+        filename="notes.txt",
+        text_content=TEXT,
+        sha256="0" * 64,
+    )
+    draft = models.DraftSummary(
+        verification_id=verification.id,
+        llm_model_name="mock",
+        raw_llm_output_json={"copay": {"value": {"amount": 20.0}}},
+    )
+    db.add_all([artifact, draft])
+    db.commit()
+    db.expunge_all()
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    yield db, user, verification.id, artifact.id, draft.id, statements
+    db.close()
+
+
+def _params(fields=None):
+    return ListParams(cursor=None, page_size=50, descending=True, fields=fields)
+
+
+def test_artifact_list_does_not_load_text(reads):
+    db, user, verification_id, artifact_id, _, statements = reads
+
+    rows = artifact_routes.list_artifacts(
+        verification_id, Response(), params=_params(), db=db, user=user
+    )
+
+    assert [row.id for row in rows] == [artifact_id]
+    assert {"text_content_raw", "text_content_zstd"} <= inspect(rows[0]).unloaded
+    assert not any("text_content" in statement for statement in statements)
+
+
+def test_artifact_list_projects_requested_fields(reads):
+    db, user, verification_id, artifact_id, _, statements = reads
+
+    response = artifact_routes.list_artifacts(
+        verification_id, Response(), params=_params(["id", "filename"]), db=db, user=user
+    )
+
+    assert json.loads(response.body) == [{"id": str(artifact_id), "filename": "notes.txt"}]
+    [select] = [statement for statement in statements if "FROM artifacts" in statement]
+    assert "artifacts.type" not in select and "text_content" not in select
+    with pytest.raises(HTTPException) as error:
+        artifact_routes.list_artifacts(
+            verification_id, Response(), params=_params(["text_content"]), db=db, user=user
+        )
+    assert error.value.status_code == 400
+
+
+def test_artifact_text_is_read_in_windows(reads):
+    db, user, _, artifact_id, _, _ = reads
+    offset, pieces = 0, []
+
+    while offset is not None:
+        window = artifact_routes.get_artifact_text(
+            artifact_id, TextRange(offset=offset, length=16), db=db, user=user
+        )
+        assert window["total_length"] == len(TEXT)
+        assert window["length"] <= 16
+        pieces.append(window["text"])
+        offset = window["next_offset"]
+
+    assert "".join(pieces) == TEXT
+    assert len(pieces) == -(-len(TEXT) // 16)
+
+
+def test_draft_list_defers_raw_output_to_its_own_endpoint(reads):
+    db, user, verification_id, _, draft_id, statements = reads
+
+    drafts = summary_routes.list_drafts(verification_id, db=db, user=user)
+
+    assert [draft.id for draft in drafts] == [draft_id]
+    assert "raw_llm_output_json" in inspect(drafts[0]).unloaded
+    assert not any("raw_llm_output_json" in statement for statement in statements)
+
+    window = summary_routes.get_draft_raw_output(
+        verification_id, draft_id, TextRange(offset=0, length=10_000), db=db, user=user
+    )
+    assert json.loads(window["text"]) == {"copay": {"value": {"amount": 20.0}}}
+    assert window["next_offset"] is None
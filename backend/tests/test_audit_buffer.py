@@ -0,0 +1,112 @@
+import json
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import JSON, create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core import redis as app_redis  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db import models  # noqa: E402
+from app.services import audit  # noqa: E402
+
+
+class _DeadLetters:
+    def __init__(self):
+        self.lists = {}
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    table = models.AuditEvent.__table__
+    monkeypatch.setattr(table.c.diff_json, "type", JSON())
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    table.create(bind=engine)
+    monkeypatch.setattr(audit, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.setattr(audit.metrics_rollup, "apply_events", lambda db, rows: None)
+    monkeypatch.setattr(app_redis, "_client", _DeadLetters())
+    buffer = audit.AuditBuffer(max_events=100, flush_interval=3600)
+    monkeypatch.setattr(audit, "_buffer", buffer)
+    monkeypatch.setattr(settings, "audit_buffered", True)
+    buffer.engine = engine
+    return buffer
+
+
+def _log(diff_json):
+    return audit.log_event(
+        None,
+        tenant_id=uuid.uuid4(),
+        actor_type="user",
+        actor_id=None,
+        event_type="verification_updated",
+        entity_type="verification",
+        entity_id=uuid.uuid4(),
+        diff_json=diff_json,
+    )
+
+
+def _stored(buffer):
+    with buffer.engine.connect() as conn:
+        return [row.diff_json for row in conn.execute(models.AuditEvent.__table__.select())]
+
+
+def test_diffs_with_datetimes_are_stored_as_json(buffer):
+    scheduled_at = datetime(2026, 3, 1, 9, 30, tzinfo=timezone.utc)
+    _log({"scheduled_at": scheduled_at, "user": uuid.UUID(int=1)})
+
+    assert audit.flush() == 1
+    assert _stored(buffer) == [
+        {"scheduled_at": "2026-03-01T09:30:00+00:00", "user": str(uuid.UUID(int=1))}
+    ]
+
+
+def test_rejected_row_is_dead_lettered_without_blocking_the_rest(buffer):
+    _log({"n": 1})
+    poison = _log({"n": 2})
+    buffer._rows[1]["diff_json"] = {"n": object()}
+    _log({"n": 3})
+
+    assert audit.flush() == 2
+    assert sorted(diff["n"] for diff in _stored(buffer)) == [1, 3]
+    [dead] = app_redis._client.lists[audit.DEAD_LETTER_KEY]
+    assert json.loads(dead)["id"] == str(poison.id)
+    assert buffer._rows == []
+
+    _log({"n": 4})
+    assert audit.flush() == 1
+
+
+def test_rows_survive_a_database_outage_until_the_next_flush(buffer, monkeypatch):
+    write_committed = audit._write_committed
+    calls = []
+
+    def flaky(rows):
+        calls.append(len(rows))
+        if len(calls) == 1:
+            raise OperationalError("INSERT", {}, Exception("connection refused"))
+        write_committed(rows)
+
+    monkeypatch.setattr(audit, "_write_committed", flaky)
+    for n in range(3):
+        _log({"n": n})
+
+    assert audit.flush() == 0
+    assert len(buffer._rows) == 3
+    _log({"n": 3})
+    assert audit.flush() == 4
+    assert sorted(diff["n"] for diff in _stored(buffer)) == [0, 1, 2, 3]
+    assert audit.DEAD_LETTER_KEY not in app_redis._client.lists
@@ -0,0 +1,42 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.config import settings  # noqa: E402
+from app.services.connector_engine import PayerGate, PayerLimits, limits_for  # noqa: E402
+
+
+def test_limits_for_applies_payer_override(monkeypatch):
+    monkeypatch.setattr(settings, "connector_payer_limits", {"aetna": {"concurrency": 3}})
+
+    assert limits_for(" Aetna ").concurrency == 3
+    assert limits_for("Aetna").rate_per_second == settings.connector_default_rate_per_second
+    assert limits_for("Cigna").concurrency == settings.connector_default_concurrency
+
+
+def test_payer_gate_caps_concurrency_and_rate():
+    gate = PayerGate(PayerLimits(concurrency=2, rate_per_second=50, burst=2))
+    in_flight = peak = 0
+
+    async def call() -> None:
+        nonlocal in_flight, peak
+        async with gate:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    async def run() -> float:
+        started = time.monotonic()
+        await asyncio.gather(*(call() for _ in range(7)))
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(run())
+    assert peak == 2
+    # Two calls ride the burst; the other five wait 20ms each for a token.
+    assert elapsed >= 0.09
@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.config import settings  # noqa: E402
+from app.services.eligibility_cache import cache_key, ttl_for  # noqa: E402
+
+
+def test_cache_key_normalizes_lookup_fields():
+    payload = {
+        "tenant_id": "7f9c2d4e-1b3a-4c5d-8e6f-0a1b2c3d4e5f",
+        "payer_name": "Aetna",
+        "member_id": "W123-456",
+        "date_of_birth": "1980-02-01",
+        "service_category": "Physical  Therapy",
+    }
+    same = {
+        "tenant_id": "7f9c2d4e-1b3a-4c5d-8e6f-0a1b2c3d4e5f",
+        "payer_name": " aetna ",
+        "member_id": "w123456",
+        "date_of_birth": "1980-02-01",
+        "service_category": "physical therapy",
+        "patient_name": "Ignored",
+    }
+
+    assert cache_key(payload) == cache_key(same)
+    assert "W123" not in cache_key(payload)
+    assert cache_key({**payload, "service_category": "Dental"}) != cache_key(payload)
+    assert cache_key({**payload, "member_id": None}) is None
+
+
+def test_cache_key_is_scoped_to_tenant():
+    payload = {
+        "tenant_id": "7f9c2d4e-1b3a-4c5d-8e6f-0a1b2c3d4e5f",
+        "payer_name": "Aetna",
+        "member_id": "W123456",
+        "date_of_birth": "1980-02-01",
+        "service_category": "Physical Therapy",
+    }
+
+    other_tenant = {**payload, "tenant_id": "0c8e6a42-5d1f-4b7e-9a3c-2e4f6a8b0c1d"}
+    assert cache_key(payload) != cache_key(other_tenant)
+    assert cache_key({**payload, "tenant_id": None}) is None
+
+
+def test_ttl_uses_payer_override(monkeypatch):
+    monkeypatch.setattr(settings, "eligibility_cache_payer_ttl_seconds", {"medicaid": 0})
+
+    assert ttl_for("Medicaid") == 0
+    assert ttl_for("Aetna") == settings.eligibility_cache_ttl_seconds
@@ -0,0 +1,136 @@
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import JSON, create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.config import settings  # noqa: E402
+from app.db import models  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.services import metrics_rollup  # noqa: E402
+from app.workers import tasks  # noqa: E402
+
+
+@pytest.fixture
+def db(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    for table in Base.metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, JSONB):
+                column.type = JSON()
+    for table in [
+        models.Tenant.__table__,
+        models.User.__table__,
+        models.Verification.__table__,
+        models.Artifact.__table__,
+        models.ArtifactPage.__table__,
+        models.DraftSummary.__table__,
+        models.SummaryField.__table__,
+        models.AuditEvent.__table__,
+    ]:
+        table.create(bind=engine, checkfirst=True)
+    monkeypatch.setattr(settings, "llm_provider", "mock")
+    monkeypatch.setattr(settings, "text_compression_enabled", False)
+    monkeypatch.setattr(metrics_rollup, "apply_events", lambda db, rows: None)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+def _verification(db):
+    tenant = models.Tenant(name="Test Tenant")
+    db.add(tenant)
+    db.flush()
+    user = models.User(tenant_id=tenant.id, email="u@test.com", password_hash="x", role="admin")
+    db.add(user)
+    db.flush()
+    verification = models.Verification(
+        tenant_id=tenant.id,
+        status="pending",
+        payer_name="Aetna",
+        service_category="PT",
+        created_by=user.id,
+    )
+    db.add(verification)
+    db.commit()
+    return verification
+
+
+def _add_text(db, verification, text):
+    db.add(
+        models.Artifact(
+            tenant_id=verification.tenant_id,
+            verification_id=verification.id,
+            type="text",
+            source="manual_entry",
+            text_content=text,
+            sha256=str(len(text)),
+        )
+    )
+    db.commit()
+
+
+def test_incremental_runs_keep_one_draft_whose_raw_output_matches_the_fields(db):
+    verification = _verification(db)
+
+    _add_text(db, verification, "Copay: $20\n")
+    tasks._extract_summaries(db, [verification.id], incremental=True)
+    _add_text(db, verification, "Coinsurance: 30%\n")
+    tasks._extract_summaries(db, [verification.id], incremental=True)
+
+    drafts = db.query(models.DraftSummary).filter_by(verification_id=verification.id).all()
+    fields = {
+        field.field_name: field.value_json
+        for field in db.query(models.SummaryField).filter_by(verification_id=verification.id)
+    }
+    assert len(drafts) == 1
+    raw = drafts[0].raw_llm_output_json
+    assert fields["copay"] == {"amount": 20.0, "currency": "USD"}
+    assert fields["coinsurance"] == {"percent": 30.0}
+    # The second run only saw the coinsurance artifact; the copay entry that
+    # backs the merged field is still the first run's.
+    assert raw["copay"]["value"] == fields["copay"]
+    assert raw["coinsurance"]["value"] == fields["coinsurance"]
+    assert set(raw) >= set(fields)
+
+
+def test_finalized_verifications_are_not_re_extracted(db):
+    verification = _verification(db)
+    verification.status = "finalized"
+    db.commit()
+    _add_text(db, verification, "Copay: $20\n")
+
+    results = tasks._extract_summaries(db, [verification.id], incremental=False)
+
+    assert results == {str(verification.id): "already_finalized"}
+    assert db.query(models.DraftSummary).count() == 0
+    assert db.query(models.SummaryField).count() == 0
+
+
+@pytest.mark.parametrize("incremental", [True, False])
+def test_batch_hands_locked_verifications_a_follow_up_with_its_mode(monkeypatch, incremental):
+    triggered, queued = [], []
+    monkeypatch.setattr(tasks.coalesce, "acquire", lambda task, entity_id: None)
+    monkeypatch.setattr(
+        tasks.coalesce, "trigger", lambda task, *args, **kwargs: triggered.append(args)
+    )
+    monkeypatch.setattr(
+        tasks.extract_summary, "apply_async", lambda args, **kwargs: queued.append(args)
+    )
+
+    tasks.extract_summary_batch(["v1"], incremental)
+
+    if incremental:
+        assert triggered == [("v1",)] and queued == []
+    else:
+        # A full re-extraction must not fold into a pending incremental run.
+        assert triggered == [] and queued == [["v1", False]]
@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.services.extraction import FIELD_NAMES, mock_extract  # noqa: E402
+
+CONNECTOR_TEXT = (
+    "Eligibility status: active\n"
+    "Member ID: W123456782\n"
+    "Effective: 2024-01-01 to 2024-12-31\n"
+    "Copay: $25\n"
+    "Coinsurance: 20%\n"
+    "Deductible individual total: $500 remaining: $200\n"
+    "OOP max individual total: $2000 remaining: $1500\n"
+    "Visit limit: 12 visits per year\n"
+    "Payer: Aetna\n"
+)
+
+
+def _fields(result):
+    return {field.field_name: field for field in result.fields}
+
+
+def test_mock_extract_reports_every_field_with_spans():
+    result = mock_extract([{"id": "a1", "text": CONNECTOR_TEXT}])
+    fields = _fields(result)
+
+    assert sorted(fields) == sorted(FIELD_NAMES)
+    assert result.needs_review is False
+    assert fields["eligibility_status"].value == "active"
+    assert fields["eligibility_status"].evidence.text_span == [0, 26]
+    assert fields["effective_from"].value == "2024-01-01"
+    assert fields["effective_to"].evidence is fields["effective_from"].evidence
+    assert fields["copay"].value == {"amount": 25.0, "currency": "USD"}
+    assert fields["coinsurance"].value == {"percent": 20.0}
+    assert fields["deductible_remaining_individual"].value == {"amount": 200.0, "currency": "USD"}
+    assert fields["deductible_total_family"].value == "unknown"
+    assert fields["limitations"].value == "12 visits per year\nPayer"
+
+    start, end = fields["copay"].evidence.text_span
+    assert CONNECTOR_TEXT[start:end] == "Copay: $25"
+
+
+def test_mock_extract_prefers_first_artifact_and_finds_overlapping_matches():
+    artifacts = [
+        {"id": "a1", "text": "Visit limit: Copay: $10\n"},
+        {"id": "a2", "text": "ELIGIBILITY STATUS: Inactive\nCopay: $99\n"},
+    ]
+    fields = _fields(mock_extract(artifacts))
+
+    assert fields["limitations"].value == "Copay"
+    assert fields["copay"].value == {"amount": 10.0, "currency": "USD"}
+    assert fields["copay"].evidence.artifact_id == "a1"
+    assert fields["copay"].evidence.text_span == [13, 23]
+    assert fields["eligibility_status"].value == "inactive"
+    assert fields["eligibility_status"].evidence.artifact_id == "a2"
+
+
+def test_mock_extract_without_matches_needs_review():
+    result = mock_extract([{"id": "a1", "text": "Copay: $"}, {"id": "a2", "text": ""}])
+
+    assert result.needs_review is True
+    assert all(field.value == "unknown" and field.evidence is None for field in result.fields)
+
+
+def test_mock_extract_reports_evidence_page():
+    pages = ["Payer: Aetna\n", "Member ID: W1\n", "Copay: $25\n"]
+    artifact = {"id": "a1", "text": "".join(pages), "page_offsets": [0, 13, 27]}
+    fields = _fields(mock_extract([artifact, {"id": "a2", "text": "Coinsurance: 20%"}]))
+
+    assert fields["copay"].evidence.page == 3
+    assert fields["copay"].evidence.text_span == [27, 37]
+    assert fields["coinsurance"].evidence.page == 1
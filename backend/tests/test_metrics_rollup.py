@@ -0,0 +1,88 @@
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.services.metrics_rollup import approximate_median, rollup_deltas  # noqa: E402
+
+
+def _event(tenant_id, verification_id, event_type, created_at, diff_json=None):
+    return {
+        "tenant_id": tenant_id,
+        "event_type": event_type,
+        "entity_type": "verification",
+        "entity_id": verification_id,
+        "diff_json": diff_json,
+        "created_at": created_at,
+    }
+
+
+def test_rollup_deltas_counts_statuses_durations_and_failures():
+    tenant_id = uuid.uuid4()
+    verification_id = uuid.uuid4()
+    created = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+    rows = [
+        _event(tenant_id, verification_id, "verification_created", created, {"status": "pending"}),
+        _event(
+            tenant_id,
+            verification_id,
+            "extraction_completed",
+            created + timedelta(minutes=4),
+            {"status": "draft_ready"},
+        ),
+        _event(tenant_id, verification_id, "verification_failed", created, {"reason": "timeout"}),
+        _event(tenant_id, verification_id, "verification_updated", created),
+    ]
+
+    deltas = rollup_deltas(rows, {verification_id: created})
+    day = created.date()
+
+    assert deltas[(tenant_id, day, "verifications_created", "")] == [1, 0.0]
+    assert deltas[(tenant_id, day, "status_entered", "pending")][0] == 1
+    assert deltas[(tenant_id, day, "status_entered", "draft_ready")][0] == 1
+    assert deltas[(tenant_id, day, "status_entered", "blocked_needs_evidence")][0] == 1
+    assert deltas[(tenant_id, day, "failure_reason", "timeout")][0] == 1
+    assert deltas[(tenant_id, day, "draft_outcome", "draft_ready")][0] == 1
+    assert deltas[(tenant_id, day, "time_to_draft", "5")] == [1, 4.0]
+    assert len(deltas) == 7
+
+
+def test_rollup_deltas_counts_draft_outcome_once_per_verification():
+    tenant_id = uuid.uuid4()
+    verification_id = uuid.uuid4()
+    created = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+    rows = [
+        _event(
+            tenant_id,
+            verification_id,
+            "extraction_completed",
+            created + timedelta(minutes=4),
+            {"status": "needs_human_review", "first_draft": True},
+        ),
+        _event(
+            tenant_id,
+            verification_id,
+            "extraction_completed",
+            created + timedelta(minutes=90),
+            {"status": "draft_ready", "first_draft": False},
+        ),
+    ]
+
+    deltas = rollup_deltas(rows, {verification_id: created})
+    day = created.date()
+
+    assert deltas[(tenant_id, day, "draft_outcome", "needs_human_review")][0] == 1
+    assert (tenant_id, day, "draft_outcome", "draft_ready") not in deltas
+    assert deltas[(tenant_id, day, "status_entered", "draft_ready")][0] == 1
+    assert deltas[(tenant_id, day, "time_to_draft", "5")] == [1, 4.0]
+    assert len(deltas) == 4
+
+
+def test_approximate_median_interpolates_within_bucket():
+    assert approximate_median({}) is None
+    assert approximate_median({"10": (2, 16.0)}) == 7.5
+    assert approximate_median({"1": (1, 0.5), "inf": (3, 60000.0)}) == 20000.0
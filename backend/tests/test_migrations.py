@@ -0,0 +1,110 @@
+import importlib.util
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import sqlalchemy as sa
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.db import models  # noqa: E402,F401
+from app.db.base import Base  # noqa: E402
+
+VERSIONS = ROOT / "alembic" / "versions"
+
+
+class _RecordingOp:
+    """Stands in for ``alembic.op`` and replays schema changes into plain sets."""
+
+    def __init__(self):
+        self.columns: dict[str, dict[str, sa.Column]] = {}
+        self.primary_keys: dict[str, set[str]] = {}
+
+    def create_table(self, name, *items, **kwargs):
+        self.columns[name] = {item.name: item for item in items if isinstance(item, sa.Column)}
+        keys = {item.name for item in items if isinstance(item, sa.Column) and item.primary_key}
+        for item in items:
+            if isinstance(item, sa.PrimaryKeyConstraint):
+                keys |= set(item._pending_colargs)
+        self.primary_keys[name] = keys
+
+    def drop_table(self, name, **kwargs):
+        self.columns.pop(name, None)
+
+    def add_column(self, table, column, **kwargs):
+        self.columns[table][column.name] = column
+
+    def drop_column(self, table, name, **kwargs):
+        self.columns[table].pop(name)
+
+    def get_context(self):
+        recorder = self
+
+        class _Context:
+            @contextmanager
+            def autocommit_block(self):
+                yield recorder
+
+        return _Context()
+
+    def __getattr__(self, name):
+        # Indexes, constraints and data backfills do not change the column set.
+        return lambda *args, **kwargs: None
+
+
+def _load_revisions():
+    revisions = {}
+    for path in VERSIONS.glob("*.py"):
+        spec = importlib.util.spec_from_file_location(f"migration_{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        revisions[module.revision] = module
+    return revisions
+
+
+def _chain(revisions):
+    by_parent = {module.down_revision: module for module in revisions.values()}
+    chain, parent = [], None
+    while parent in by_parent:
+        module = by_parent[parent]
+        chain.append(module)
+        parent = module.revision
+    return chain
+
+
+def test_migrations_form_one_linear_chain():
+    revisions = _load_revisions()
+    parents = [module.down_revision for module in revisions.values()]
+
+    assert len(parents) == len(set(parents))
+    assert len(_chain(revisions)) == len(revisions)
+    # alembic_version.version_num is VARCHAR(32).
+    assert all(len(revision) <= 32 for revision in revisions)
+
+
+def test_migrations_build_the_columns_the_models_declare():
+    op = _RecordingOp()
+    for module in _chain(_load_revisions()):
+        module.op = op
+        module.upgrade()
+
+    for table in Base.metadata.sorted_tables:
+        assert table.name in op.columns, f"no migration creates {table.name}"
+        assert set(op.columns[table.name]) == set(table.columns.keys()), table.name
+        if table.name in op.primary_keys and op.primary_keys[table.name]:
+            assert op.primary_keys[table.name] == {column.name for column in table.primary_key}
+
+
+def test_extracted_text_cache_is_keyed_by_content_and_extractor():
+    op = _RecordingOp()
+    for module in _chain(_load_revisions()):
+        module.op = op
+        module.upgrade()
+
+    assert op.primary_keys["extracted_text_cache"] == {"sha256", "extractor_version"}
+    assert {column.name for column in models.ExtractedTextCache.__table__.primary_key} == {
+        "sha256",
+        "extractor_version",
+    }
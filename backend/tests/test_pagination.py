@@ -0,0 +1,66 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.api.pagination import estimate_count, plan_rows  # noqa: E402
+from app.db import models  # noqa: E402
+
+PLAN = [{"Plan": {"Node Type": "Index Only Scan", "Plan Rows": 1234, "Total Cost": 88.1}}]
+
+
+class _ExplainConnection:
+    def __init__(self, plan):
+        self.plan = plan
+        self.calls = []
+
+    def exec_driver_sql(self, sql, params):
+        self.calls.append((sql, params))
+        return SimpleNamespace(scalar=lambda: self.plan)
+
+
+class _PostgresSession:
+    """Just enough of a Session for estimate_count to compile and EXPLAIN a query."""
+
+    def __init__(self, plan):
+        self.conn = _ExplainConnection(plan)
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=postgresql.dialect())
+
+    def connection(self):
+        return self.conn
+
+
+def test_plan_rows_reads_decoded_and_text_plans():
+    assert plan_rows(PLAN) == 1234
+    assert plan_rows(json.dumps(PLAN)) == 1234
+    assert plan_rows(json.dumps(PLAN).encode()) == 1234
+
+
+def test_estimate_count_explains_the_compiled_query_on_postgres():
+    query = Session().query(models.Verification.id).filter(
+        models.Verification.payer_name == "Aetna"
+    )
+    db = _PostgresSession(PLAN)
+
+    assert estimate_count(db, query) == 1234
+    sql, params = db.conn.calls[0]
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT verifications.id")
+    assert "%(payer_name_1)s" in sql
+    assert params == {"payer_name_1": "Aetna"}
+
+
+def test_estimate_count_is_skipped_off_postgres():
+    db = Session(bind=create_engine("sqlite://"))
+    query = db.query(models.Verification.id)
+
+    assert estimate_count(db, query) is None
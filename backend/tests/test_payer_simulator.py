@@ -0,0 +1,79 @@
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.config import settings  # noqa: E402
+from app.services.connectors import SimulatorConnector  # noqa: E402
+from app.services import x12  # noqa: E402
+from app.services.payer_simulator import PayerProfile, profile_for, render_x12  # noqa: E402
+
+PAYLOAD = {
+    "payer_name": "Aetna",
+    "member_id": "W12",
+    "patient_name": "Jane Doe",
+    "date_of_birth": "1980-02-01",
+    "service_category": "Physical Therapy",
+}
+
+
+def test_render_x12_builds_multi_plan_271():
+    body = render_x12(PAYLOAD, PayerProfile(plan_count=3, benefit_loops_per_plan=40))
+    segments = [segment.strip() for segment in body.split("~") if segment.strip()]
+    transaction = segments[segments.index("ST*271*0001*005010X279A1") :]
+    se = next(segment for segment in transaction if segment.startswith("SE*"))
+
+    assert segments[0].startswith("ISA*") and segments[-1].startswith("IEA*")
+    assert int(se.split("*")[1]) == transaction.index(se) + 1
+    assert "NM1*IL*1*DOE*JANE****MI*W12" in segments
+    assert sum(1 for segment in segments if segment.startswith("EB*1*IND*PT*")) == 3
+    assert sum(1 for segment in segments if segment.startswith("EB*")) == 3 * (12 + 40)
+    assert render_x12(PAYLOAD, PayerProfile()).split("EB*")[1:] == render_x12(
+        PAYLOAD, PayerProfile()
+    ).split("EB*")[1:]
+
+
+def test_simulator_connector_reports_throttling(monkeypatch):
+    monkeypatch.setattr(
+        settings,
+        "payer_simulator_profiles",
+        {"default": {"latency_median_ms": 1, "latency_p99_ms": 1}, "aetna": {"throttle_rate": 1}},
+    )
+
+    assert profile_for(" AETNA ").throttle_rate == 1
+    throttled = asyncio.run(SimulatorConnector().get_eligibility(PAYLOAD))
+    ok = asyncio.run(SimulatorConnector().get_eligibility({**PAYLOAD, "payer_name": "Cigna"}))
+
+    assert throttled.success is False and throttled.failure_reason == "payer throttled"
+    assert ok.success is True and "Eligibility status: active" in ok.raw_text
+
+
+def test_batched_270_round_trips_through_simulator(monkeypatch):
+    profiles = {"default": {"latency_median_ms": 1, "latency_p99_ms": 1}}
+    monkeypatch.setattr(settings, "payer_simulator_profiles", profiles)
+    inquiries = [
+        {**PAYLOAD, "trace": "a1"},
+        {**PAYLOAD, "member_id": "W13", "patient_name": "John Roe", "trace": "b2"},
+        {**PAYLOAD, "member_id": "", "trace": "c3"},
+    ]
+    interchange = x12.build_270("Aetna", inquiries, "000000042")
+
+    sent = list(x12.iter_270(x12.chunked(interchange, 64)))
+    assert [inquiry["trace"] for inquiry in sent] == ["a1", "b2", "c3"]
+    assert sent[1]["patient_name"] == "JOHN ROE" and sent[1]["member_id"] == "W13"
+    assert sent[0]["service_category"] == "physical therapy"
+
+    result = asyncio.run(SimulatorConnector().submit_batch(interchange))
+    assert result.success is True and x12.interchange_control(result.raw_text) == "000000042"
+
+    replies = dict(x12.split_271(x12.chunked(result.raw_text, 100)))
+    assert list(replies) == ["a1", "b2", "c3"]
+    active = x12.parse_271([replies["a1"]], "physical therapy")
+    inactive = x12.parse_271([replies["b2"]], "physical therapy")
+    assert active.fields["eligibility_status"].value == "active"
+    assert inactive.fields["eligibility_status"].value == "inactive"
+    assert x12.parse_271([replies["c3"]]).rejections == ["72"]
+    assert replies["a1"].count("HL*") == 3 and "MI*W13" not in replies["a1"]
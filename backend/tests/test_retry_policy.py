@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import httpx
+from botocore.exceptions import ClientError, EndpointConnectionError
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.config import settings  # noqa: E402
+from app.services.x12 import X12Error  # noqa: E402
+from app.workers.retry import (  # noqa: E402
+    FatalError,
+    PayerUnavailable,
+    backoff_seconds,
+    is_retryable,
+)
+
+
+def _client_error(status: int, code: str) -> ClientError:
+    response = {"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}
+    return ClientError(response, "PutObject")
+
+
+def test_is_retryable_separates_transient_from_deterministic_failures():
+    request = httpx.Request("POST", "http://payer/eligibility")
+
+    assert is_retryable(PayerUnavailable("Aetna", "payer throttled"))
+    assert is_retryable(httpx.ConnectTimeout("timed out", request=request))
+    assert is_retryable(OperationalError("SELECT 1", {}, Exception("server closed")))
+    assert is_retryable(EndpointConnectionError(endpoint_url="http://minio:9000"))
+    assert is_retryable(_client_error(503, "SlowDown"))
+    assert is_retryable(ConnectionResetError())
+
+    assert not is_retryable(_client_error(404, "NoSuchKey"))
+    assert not is_retryable(IntegrityError("INSERT", {}, Exception("duplicate key")))
+    assert not is_retryable(X12Error("Missing ISA header"))
+    assert not is_retryable(KeyError("member_id"))
+    assert not is_retryable(FatalError("verification not found"))
+
+
+def test_backoff_is_jittered_and_capped(monkeypatch):
+    monkeypatch.setattr(settings, "task_retry_backoff_base_seconds", 2.0)
+    monkeypatch.setattr(settings, "task_retry_backoff_max_seconds", 60.0)
+
+    first = [backoff_seconds(0) for _ in range(200)]
+    late = [backoff_seconds(10) for _ in range(200)]
+
+    assert all(1.0 <= delay <= 2.0 for delay in first)
+    assert len(set(first)) > 1
+    assert all(30.0 <= delay <= 60.0 for delay in late)
@@ -0,0 +1,45 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.services.storage import LocalBackend, sign_key, verify_signed_key  # noqa: E402
+
+
+def test_local_backend_round_trip_uses_sharded_paths(tmp_path):
+    backend = LocalBackend(str(tmp_path))
+    key = "artifacts/t1/v1/a1-../../escape.pdf"
+    backend.put(key, b"%PDF-1.4 data")
+
+    path = backend.path_for(key)
+    assert path.parent.parent.parent == tmp_path
+    assert backend.get(key) == b"%PDF-1.4 data"
+    with backend.local_file(key) as local_path:
+        assert Path(local_path).read_bytes() == b"%PDF-1.4 data"
+    assert not [name for name in os.listdir(path.parent) if name.startswith(".upload-")]
+
+
+def test_local_multipart_abort_leaves_no_object(tmp_path):
+    backend = LocalBackend(str(tmp_path))
+    upload = backend.start_multipart("intake/t1/fax.pdf")
+    upload.upload_part(b"partial")
+    upload.abort()
+
+    path = backend.path_for("intake/t1/fax.pdf")
+    assert not path.exists()
+    assert os.listdir(path.parent) == []
+    with pytest.raises(FileNotFoundError):
+        with backend.local_file("intake/t1/fax.pdf"):
+            pass
+
+
+def test_signed_keys_expire_and_reject_tampering():
+    signature = sign_key("a/b.pdf", 4102444800)
+    assert verify_signed_key("a/b.pdf", 4102444800, signature)
+    assert not verify_signed_key("a/c.pdf", 4102444800, signature)
+    assert not verify_signed_key("a/b.pdf", 1, sign_key("a/b.pdf", 1))
@@ -0,0 +1,88 @@
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import redis
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core import redis as app_redis  # noqa: E402
+from app.services import storage  # noqa: E402
+
+
+class _Hash:
+    def __init__(self):
+        self.values = {}
+        self.pipelines = 0
+        self.down = False
+
+    def pipeline(self, transaction=True):
+        self.pipelines += 1
+        return _Pipeline(self)
+
+    def hgetall(self, key):
+        return {field: str(value) for field, value in self.values.get(key, {}).items()}
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def hincrby(self, key, field, amount):
+        self.commands.append((key, field, amount))
+
+    hincrbyfloat = hincrby
+
+    def execute(self):
+        if self.client.down:
+            raise redis.ConnectionError("redis is down")
+        for key, field, amount in self.commands:
+            fields = self.client.values.setdefault(key, {})
+            fields[field] = fields.get(field, 0) + amount
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = _Hash()
+    monkeypatch.setattr(app_redis, "_client", client)
+    monkeypatch.setattr(storage, "_stats", storage._StatsBuffer(flush_interval=3600))
+    return client
+
+
+def _call(operation, error=False, sent=0, received=0):
+    context = {"storage_started": time.perf_counter(), "storage_bytes_sent": sent}
+    storage._record(operation, context, error, received)
+
+
+def test_recorded_calls_reach_redis_in_one_flush(client):
+    _call("PutObject", sent=100)
+    _call("PutObject", sent=50)
+    _call("GetObject", error=True, received=10)
+
+    assert client.pipelines == 0
+    counts = storage.stats()
+
+    assert client.pipelines == 1
+    assert counts["bytes_sent"] == 150
+    assert counts["bytes_received"] == 10
+    assert counts["operations"]["PutObject"]["calls"] == 2
+    assert "errors" not in counts["operations"]["PutObject"]
+    assert counts["operations"]["GetObject"]["errors"] == 1
+    assert counts["operations"]["GetObject"]["seconds"] >= 0
+
+
+def test_counts_from_a_failed_flush_are_kept(client):
+    _call("PutObject", sent=100)
+    client.down = True
+    storage.flush_stats()
+    client.down = False
+    _call("PutObject", sent=1)
+
+    counts = storage.stats()
+
+    assert counts["operations"]["PutObject"]["calls"] == 2
+    assert counts["bytes_sent"] == 101
@@ -0,0 +1,96 @@
+import sys
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import JSON, create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core import redis as app_redis  # noqa: E402
+from app.db import models  # noqa: E402
+from app.services import text_cache  # noqa: E402
+from app.utils.text_extraction import PDF_EXTRACTOR_VERSION  # noqa: E402
+from app.workers import tasks  # noqa: E402
+
+
+class _Counters:
+    def __init__(self):
+        self.values = {}
+
+    def incrby(self, key, amount):
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def mget(self, *keys):
+        return [self.values.get(key) for key in keys]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(app_redis, "_client", _Counters())
+    table = models.ExtractedTextCache.__table__
+    monkeypatch.setattr(table.c.page_texts, "type", JSON())
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    table.create(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def test_lookup_counts_hits_and_misses_unless_asked_not_to(db):
+    db.add(
+        models.ExtractedTextCache(
+            sha256="a" * 64, extractor_version=PDF_EXTRACTOR_VERSION, page_texts=["p1", "p2"]
+        )
+    )
+    db.commit()
+    hit = ("a" * 64, PDF_EXTRACTOR_VERSION)
+    miss = ("b" * 64, PDF_EXTRACTOR_VERSION)
+
+    assert text_cache.lookup(db, [hit, miss]) == {hit: ["p1", "p2"]}
+    assert text_cache.stats() == {"hits": 1, "misses": 1}
+    assert text_cache.lookup(db, [hit, miss], count=False) == {hit: ["p1", "p2"]}
+    assert text_cache.stats() == {"hits": 1, "misses": 1}
+    # Another extractor version is a different entry.
+    assert text_cache.lookup(db, [("a" * 64, "pdfminer-old")]) == {}
+
+
+def test_load_artifact_texts_only_parses_uncached_content(monkeypatch):
+    cached_sha, new_sha = "c" * 64, "d" * 64
+    artifacts = [
+        SimpleNamespace(
+            id=uuid.uuid4(), type="pdf", text_content=None, storage_key="k1", sha256=cached_sha
+        ),
+        SimpleNamespace(
+            id=uuid.uuid4(), type="pdf", text_content=None, storage_key="k2", sha256=new_sha
+        ),
+        SimpleNamespace(
+            id=uuid.uuid4(), type="text", text_content="typed", storage_key=None, sha256="e" * 64
+        ),
+    ]
+    parsed, stored = [], {}
+    monkeypatch.setattr(
+        tasks.text_cache,
+        "lookup",
+        lambda db, keys: {(cached_sha, PDF_EXTRACTOR_VERSION): ["cached "]},
+    )
+    monkeypatch.setattr(tasks.text_cache, "store", lambda db, entries: stored.update(entries))
+    monkeypatch.setattr(
+        tasks,
+        "_extract_artifact_pages",
+        lambda source: parsed.append(source["storage_key"]) or ["fresh ", "pages"],
+    )
+
+    payloads = tasks._load_artifact_texts(None, artifacts)
+
+    assert parsed == ["k2"]
+    assert stored == {(new_sha, PDF_EXTRACTOR_VERSION): ["fresh ", "pages"]}
+    assert [payload["text"] for payload in payloads] == ["cached ", "fresh pages", "typed"]
+    assert payloads[1]["page_offsets"] == [0, 6]
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.config import settings  # noqa: E402
+from app.utils import text_extraction  # noqa: E402
+
+
+class _NoChildrenPool:
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).created += 1
+
+    def submit(self, *args, **kwargs):
+        raise AssertionError("daemonic processes are not allowed to have children")
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+
+def _fake_pdf(monkeypatch, page_count):
+    monkeypatch.setattr(text_extraction, "count_pdf_pages", lambda path: page_count)
+    monkeypatch.setattr(
+        text_extraction,
+        "_extract_page_range",
+        lambda path, start, stop: [f"page {page}\f" for page in range(start, stop)],
+    )
+
+
+def test_pdf_pool_failure_falls_back_once_and_is_remembered(monkeypatch):
+    _fake_pdf(monkeypatch, 5)
+    monkeypatch.setattr(settings, "pdf_extraction_workers", 4)
+    monkeypatch.setattr(settings, "pdf_pages_per_chunk", 2)
+    monkeypatch.setattr(text_extraction, "_is_daemonic", lambda: False)
+    monkeypatch.setattr(text_extraction, "ProcessPoolExecutor", _NoChildrenPool)
+    monkeypatch.setattr(text_extraction, "_pdf_pool_failed_pid", None)
+    text_extraction._reset_pdf_pool()
+
+    first = text_extraction.extract_pdf_pages("doc.pdf")
+    second = text_extraction.extract_pdf_pages("doc.pdf")
+
+    assert first.pages == [f"page {page}\f" for page in range(5)]
+    assert second.pages == first.pages
+    assert _NoChildrenPool.created == 1
+
+
+def test_pdf_pool_is_not_built_in_daemonic_process(monkeypatch):
+    _fake_pdf(monkeypatch, 3)
+    monkeypatch.setattr(settings, "pdf_extraction_workers", 4)
+    monkeypatch.setattr(settings, "pdf_pages_per_chunk", 1)
+    monkeypatch.setattr(text_extraction, "_is_daemonic", lambda: True)
+    monkeypatch.setattr(text_extraction, "_pdf_pool_failed_pid", None)
+
+    def no_pool(*args, **kwargs):
+        raise RuntimeError("pool must not be created")
+
+    monkeypatch.setattr(text_extraction, "ProcessPoolExecutor", no_pool)
+    text_extraction._reset_pdf_pool()
+
+    assert text_extraction.extract_pdf_pages("doc.pdf").text == "page 0\fpage 1\fpage 2\f"
@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.api.uploads import stream_upload  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.services import storage  # noqa: E402
+
+BOUNDARY = "upload-boundary"
+PART_SIZE = 64
+
+
+class _RecordingBackend(storage.LocalBackend):
+    """Local backend that notes every write and the thread it ran on."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.calls = []
+
+    def _note(self, name, size=0):
+        self.calls.append((name, size, threading.current_thread().name))
+
+    def ensure_ready(self):
+        self._note("ensure_ready")
+        super().ensure_ready()
+
+    def put(self, key, data, content_type=None):
+        self._note("put", len(data))
+        super().put(key, data, content_type)
+
+    def start_multipart(self, key, content_type=None):
+        self._note("start_multipart")
+        upload = super().start_multipart(key, content_type)
+        upload_part, abort = upload.upload_part, upload.abort
+        upload.upload_part = lambda data: self._note("upload_part", len(data)) or upload_part(data)
+        upload.abort = lambda: self._note("abort") or abort()
+        return upload
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    backend = _RecordingBackend(str(tmp_path))
+    monkeypatch.setattr(storage, "_backend", backend)
+    monkeypatch.setattr(settings, "upload_part_size_bytes", PART_SIZE)
+    return backend
+
+
+def _body(content, filename="scan.pdf"):
+    return (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="note"\r\n\r\n'
+        "hello\r\n"
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _request(body, chunk_size=10):
+    chunks = [body[start : start + chunk_size] for start in range(0, len(body), chunk_size)]
+
+    async def receive():
+        chunk = chunks.pop(0) if chunks else b""
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    return Request({"type": "http", "method": "POST", "headers": headers}, receive)
+
+
+def _stream(body, **kwargs):
+    return asyncio.run(
+        stream_upload(_request(body), lambda filename: f"uploads/{filename}", **kwargs)
+    )
+
+
+def test_large_file_is_hashed_and_stored_part_by_part(backend):
+    content = bytes(range(256)) * 3 + b"tail"
+
+    upload = _stream(_body(content))
+
+    assert upload.filename == "scan.pdf"
+    assert upload.content_type == "application/pdf"
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+    assert upload.size == len(content)
+    assert backend.get("uploads/scan.pdf") == content
+    part_sizes = [size for name, size, _ in backend.calls if name == "upload_part"]
+    assert part_sizes[:-1] == [PART_SIZE] * (len(content) // PART_SIZE)
+    assert sum(part_sizes) == len(content)
+
+
+def test_small_file_matching_existing_content_is_not_written_again(backend):
+    content = b"%PDF-1.4 small"
+    digests = []
+
+    def existing_key_for(digest):
+        digests.append(digest)
+        return "blobs/already-there"
+
+    upload = _stream(_body(content), existing_key_for=existing_key_for)
+
+    assert digests == [hashlib.sha256(content).hexdigest()]
+    assert upload.storage_key == "blobs/already-there"
+    assert upload.written is False
+    assert backend.calls == []
+
+
+def test_truncated_body_aborts_the_multipart_upload(backend):
+    body = _body(bytes(PART_SIZE * 3))
+    truncated = body[: -len(f"\r\n--{BOUNDARY}--\r\n")]
+
+    with pytest.raises(HTTPException) as error:
+        _stream(truncated)
+
+    assert error.value.status_code == 400
+    assert [name for name, _, _ in backend.calls][-1] == "abort"
+    assert not backend.path_for("uploads/scan.pdf").exists()
+
+
+def test_body_without_the_file_field_is_rejected(backend):
+    body = (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="note"\r\n\r\n'
+        f"hello\r\n--{BOUNDARY}--\r\n"
+    ).encode()
+
+    with pytest.raises(HTTPException) as error:
+        _stream(body)
+
+    assert error.value.detail == "Missing file"
+    assert backend.calls == []
+
+
+def test_storage_writes_run_on_the_storage_pool(backend):
+    loop_thread = threading.current_thread().name
+
+    _stream(_body(bytes(PART_SIZE * 2 + 1)))
+
+    assert backend.calls
+    assert all(thread.startswith("storage-io") for _, _, thread in backend.calls)
+    assert all(thread != loop_thread for _, _, thread in backend.calls)
+
+
+def test_blocking_storage_call_leaves_the_event_loop_free():
+    release = threading.Event()
+    ticks = []
+
+    async def other_request():
+        while not release.is_set():
+            ticks.append(1)
+            await asyncio.sleep(0.001)
+
+    async def main():
+        ticker = asyncio.create_task(other_request())
+        await storage.run_io(release.wait, 0.2)
+        release.set()
+        await ticker
+
+    asyncio.run(main())
+
+    # The loop kept serving the other coroutine while the call blocked.
+    assert len(ticks) > 5
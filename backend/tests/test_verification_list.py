@@ -0,0 +1,104 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import JSON, create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.main import app  # noqa: E402
+from app.db import models  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import get_db  # noqa: E402
+from app.api import deps  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    for table in Base.metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, JSONB):
+                column.type = JSON()
+    for tbl in [
+        models.Tenant.__table__,
+        models.User.__table__,
+        models.Verification.__table__,
+        models.PatientInfo.__table__,
+    ]:
+        tbl.create(bind=engine, checkfirst=True)
+
+    db = TestingSessionLocal()
+    tenant = models.Tenant(name="Test Tenant")
+    db.add(tenant)
+    db.flush()
+    user = models.User(
+        tenant_id=tenant.id, email="user@test.com", password_hash="hashed", role="admin"
+    )
+    db.add(user)
+    db.flush()
+    base = datetime(2026, 1, 1, 9, 0)
+    for minute in range(5):
+        db.add(
+            models.Verification(
+                tenant_id=tenant.id,
+                status="pending",
+                payer_name="Aetna",
+                service_category="PT",
+                created_by=user.id,
+                created_at=base + timedelta(minutes=minute),
+            )
+        )
+    db.commit()
+    db.refresh(user)
+    db.close()
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[deps.get_current_user] = lambda: user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_list_verifications_legacy_page_offsets_after_ordering(client):
+    first = client.get("/verifications", params={"page": 1, "page_size": 2})
+    second = client.get("/verifications", params={"page": 2, "page_size": 2})
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    first_ids = [item["id"] for item in first.json()]
+    second_ids = [item["id"] for item in second.json()]
+    assert len(first_ids) == 2
+    assert len(second_ids) == 2
+    assert not set(first_ids) & set(second_ids)
+
+    cursor_page = client.get(
+        "/verifications", params={"cursor": first.headers["X-Next-Cursor"], "page_size": 2}
+    )
+    assert [item["id"] for item in cursor_page.json()] == second_ids
+
+
+def test_list_verifications_rejects_oversized_page(client):
+    assert client.get("/verifications", params={"page_size": 201}).status_code == 422
@@ -0,0 +1,104 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import JSON, create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.api.routes import verifications as verification_routes  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db import models  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.services import metrics_rollup  # noqa: E402
+from app.workers import tasks  # noqa: E402
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    for table in Base.metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, JSONB):
+                column.type = JSON()
+    for table in [
+        models.Tenant.__table__,
+        models.User.__table__,
+        models.EligibilityBatch.__table__,
+        models.Verification.__table__,
+        models.AuditEvent.__table__,
+    ]:
+        table.create(bind=engine, checkfirst=True)
+    monkeypatch.setattr(settings, "audit_buffered", False)
+    monkeypatch.setattr(metrics_rollup, "apply_events", lambda db, rows: None)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _seed(session_factory):
+    db = session_factory()
+    tenant = models.Tenant(name="Test Tenant")
+    db.add(tenant)
+    db.flush()
+    user = models.User(
+        tenant_id=tenant.id, email="user@test.com", password_hash="hashed", role="admin"
+    )
+    db.add(user)
+    db.flush()
+    ids = {}
+    for state in ["pending", "queued"]:
+        verification = models.Verification(
+            tenant_id=tenant.id,
+            status=state,
+            payer_name="Aetna",
+            service_category="PT",
+            created_by=user.id,
+        )
+        db.add(verification)
+        db.flush()
+        ids[state] = verification.id
+    db.commit()
+    db.refresh(user)
+    db.close()
+    return user, ids
+
+
+def test_single_run_of_a_batched_verification_is_refused(session_factory, monkeypatch):
+    user, ids = _seed(session_factory)
+    queued_runs = []
+    monkeypatch.setattr(
+        verification_routes.run_verification,
+        "delay",
+        lambda verification_id, **kwargs: queued_runs.append(verification_id)
+        or SimpleNamespace(id="job-1"),
+    )
+    db = session_factory()
+
+    with pytest.raises(HTTPException) as refused:
+        verification_routes.run_verification_job(ids["queued"], refresh=False, db=db, user=user)
+    accepted = verification_routes.run_verification_job(
+        ids["pending"], refresh=False, db=db, user=user
+    )
+    db.close()
+
+    assert refused.value.status_code == 409
+    assert accepted == {"job_id": "job-1"}
+    assert queued_runs == [str(ids["pending"])]
+
+
+def test_run_claimed_by_a_batch_after_it_was_requested_is_skipped(session_factory, monkeypatch):
+    _, ids = _seed(session_factory)
+    monkeypatch.setattr(tasks, "SessionLocal", session_factory)
+
+    assert tasks.run_verification(ids["queued"]) == "queued_in_batch"
+    db = session_factory()
+    assert db.get(models.Verification, ids["queued"]).status == "queued"
+    db.close()
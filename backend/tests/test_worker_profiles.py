@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.core.config import settings  # noqa: E402
+from app.workers import tasks  # noqa: F401,E402
+from app.workers.celery_app import celery_app  # noqa: E402
+from app.workers.profiles import profile_for, worker_argv  # noqa: E402
+
+
+def test_every_routed_task_exists_and_has_a_worker():
+    consumed = {
+        queue for name in settings.celery_worker_profiles for queue in profile_for(name).queues
+    }
+    router = celery_app.amqp.router
+
+    for task_name, queue in settings.celery_task_queues.items():
+        assert task_name in celery_app.tasks
+        assert router.route({}, task_name)["queue"].name == queue
+        assert queue in consumed
+    assert settings.celery_default_queue in consumed
+
+
+def test_cpu_profile_can_start_the_pdf_pool():
+    # Prefork children are daemonic and cannot start child processes.
+    assert profile_for("cpu").pool != "prefork"
+
+
+def test_worker_argv_follows_profile(monkeypatch):
+    monkeypatch.setattr(
+        settings,
+        "celery_worker_profiles",
+        {
+            "cpu": {"pool": "prefork", "prefetch_multiplier": 1, "max_tasks_per_child": 50},
+            "io": {"pool": "threads", "concurrency": 64, "queues": ["connectors", "light"]},
+            "bad": {"pool": "fork-bomb"},
+        },
+    )
+
+    cpu = worker_argv(profile_for("cpu"))
+    io = worker_argv(profile_for("io"))
+
+    assert cpu[cpu.index("-Q") + 1] == "cpu" and "-c" not in cpu
+    assert cpu[cpu.index("--prefetch-multiplier") + 1] == "1"
+    assert cpu[cpu.index("--max-tasks-per-child") + 1] == "50"
+    assert io[io.index("-Q") + 1] == "connectors,light"
+    assert io[io.index("-P") + 1] == "threads" and io[io.index("-c") + 1] == "64"
+    assert "--max-tasks-per-child" not in io
+    with pytest.raises(ValueError):
+        profile_for("bad")
+    with pytest.raises(ValueError):
+        profile_for("missing")
@@ -0,0 +1,107 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from app.services import extraction, x12  # noqa: E402
+
+ISA = (
+    "ISA*00*          *00*          *ZZ*AETNA          *ZZ*EBCOPILOT      "
+    "*240101*1200*^*00501*000000001*0*P*:~\n"
+)
+RESPONSE = ISA + "\n".join(
+    [
+        "GS*HB*AETNA*EBCOPILOT*20240101*1200*1*X*005010X279A1~",
+        "ST*271*0001*005010X279A1~",
+        "HL*1**20*1~",
+        "NM1*PR*2*AETNA*****PI*60054~",
+        "EB*B*IND*30*PR**27*999~",
+        "HL*3*2*22*0~",
+        "NM1*IL*1*DOE*JANE****MI*W12~",
+        "DTP*346*D8*20240101~",
+        "EB*1*IND*30^PT*PR*GOLD PPO~",
+        "EB*B*IND*30*PR**27*40~",
+        "EB*B*IND*PT*PR**27*25~",
+        "LS*2120~",
+        "EB*B*IND*PT*PR**27*1~",
+        "LE*2120~",
+        "EB*A*IND*PT*PR****0.2~",
+        "EB*C*IND*30*PR**23*500~",
+        "EB*C*IND*30*PR**29*125.50~",
+        "EB*F*IND*PT*PR*****VS*20~",
+        "MSG*20 VISITS PER CALENDAR YEAR~",
+        "SE*20*0001~",
+        "GE*1*1~",
+        "IEA*1*000000001~",
+    ]
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 13, x12.CHUNK_SIZE])
+def test_parse_271_maps_patient_benefits(chunk_size):
+    result = x12.parse_271(x12.chunked(RESPONSE, chunk_size), "Physical Therapy")
+    values = {name: field.value for name, field in result.fields.items()}
+
+    assert result.segment_count == 23
+    assert values["eligibility_status"] == "active"
+    assert values["effective_from"] == "2024-01-01"
+    # The PT-specific copay outranks the plan-wide one; info-source and
+    # related-entity loops are ignored.
+    assert values["copay"] == {"amount": 25.0, "currency": "USD"}
+    assert values["coinsurance"] == {"percent": 20.0}
+    assert values["deductible_remaining_individual"] == {"amount": 125.5, "currency": "USD"}
+    assert values["limitations"] == "20 VISITS PER CALENDAR YEAR"
+    start, end = result.fields["copay"].span
+    assert RESPONSE[start:end] == "EB*B*IND*PT*PR**27*25"
+
+
+@pytest.mark.parametrize("loop", [["HL*3*2*23*0~"], ["LS*2120~", "LE*2120~"]])
+def test_parse_271_limitation_ends_at_next_loop(loop):
+    response = ISA + "\n".join(
+        [
+            "GS*HB*AETNA*EBCOPILOT*20240101*1200*1*X*005010X279A1~",
+            "ST*271*0001*005010X279A1~",
+            "HL*2*1*22*1~",
+            "EB*F*IND*PT*PR*****VS*20~",
+            *loop,
+            "MSG*CALL PROVIDER SERVICES~",
+            "SE*8*0001~",
+        ]
+    )
+
+    result = x12.parse_271(x12.chunked(response), "Physical Therapy")
+
+    assert result.fields["limitations"].value == "20 visits"
+
+
+def test_parse_271_requires_isa_header():
+    with pytest.raises(x12.X12Error):
+        x12.parse_271(["GS*HB*AETNA~"])
+
+
+def test_extract_fields_skips_llm_for_answered_fields(monkeypatch):
+    calls = []
+    real = extraction.extract_with_llm
+    monkeypatch.setattr(
+        extraction, "extract_with_llm", lambda artifacts: calls.append(artifacts) or real(artifacts)
+    )
+    note = {"id": "n1", "text": "OOP max individual total: $3000 remaining: $100\n"}
+
+    result = extraction.extract_fields(
+        [{"id": "x1", "text": RESPONSE, "page_offsets": [0]}, note], "Physical Therapy"
+    )
+    fields = {field.field_name: field for field in result.fields}
+
+    assert calls == [[note]]
+    assert fields["copay"].evidence.artifact_id == "x1"
+    assert fields["oop_max_total_individual"].evidence.artifact_id == "n1"
+    assert result.raw_output["copay"]["source"] == "x12"
+    assert result.needs_review is False
+
+    calls.clear()
+    extraction.extract_fields([{"id": "x1", "text": RESPONSE}])
+    assert calls == []
@@ -113,3 +113,20 @@ export const GlassCard = ({ children, className, title, subtitle }: { children:
         </div>
     )
 }
+
+// --- LoadMoreButton (cursor-paged lists) ---
+export const LoadMoreButton = ({ hasMore, loading, onClick, className }: { hasMore: boolean, loading: boolean, onClick: () => void, className?: string }) => {
+    if (!hasMore) return null
+    return (
+        <div className={cn("flex justify-center pt-4", className)}>
+            <button
+                onClick={onClick}
+                disabled={loading}
+                className="px-6 py-2.5 bg-white border border-slate-200 rounded-xl text-sm font-bold text-slate-600 hover:text-primary hover:border-primary/40 transition-all shadow-sm disabled:opacity-50 flex items-center gap-2"
+            >
+                {loading && <Loader2 className="w-4 h-4 animate-spin" />}
+                {loading ? "Loading..." : "Load more"}
+            </button>
+        </div>
+    )
+}
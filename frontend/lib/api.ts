@@ -61,6 +61,25 @@ async function apiFetch(path: string, init?: RequestInit) {
   return res
 }
 
+export type Page<T = any> = {
+  items: T[]
+  nextCursor: string | null
+  totalEstimate: number | null
+}
+
+// List endpoints return one page at a time; pass nextCursor back for the next one.
+async function fetchPage(path: string, errorMessage: string, cursor?: string | null): Promise<Page> {
+  const sep = path.includes("?") ? "&" : "?"
+  const res = await apiFetch(cursor ? `${path}${sep}cursor=${encodeURIComponent(cursor)}` : path)
+  if (!res.ok) throw new Error(errorMessage)
+  const estimate = res.headers.get("X-Total-Estimate")
+  return {
+    items: await res.json(),
+    nextCursor: res.headers.get("X-Next-Cursor"),
+    totalEstimate: estimate === null ? null : Number(estimate),
+  }
+}
+
 export async function fetchWorklist(params = "") {
   const res = await apiFetch(`/verifications${params}`)
   if (!res.ok) throw new Error("Failed to load worklist")
@@ -83,16 +102,14 @@ export async function fetchVerification(id: string) {
   return res.json()
 }
 
-export async function runVerification(id: string) {
-  const res = await apiFetch(`/verifications/${id}/run`, { method: "POST" })
+export async function runVerification(id: string, refresh = false) {
+  const res = await apiFetch(`/verifications/${id}/run${refresh ? "?refresh=true" : ""}`, { method: "POST" })
   if (!res.ok) throw new Error("Failed to run verification")
   return res.json()
 }
 
-export async function fetchArtifacts(id: string) {
-  const res = await apiFetch(`/verifications/${id}/artifacts`)
-  if (!res.ok) throw new Error("Failed to load artifacts")
-  return res.json()
+export async function fetchArtifacts(id: string, cursor?: string | null) {
+  return fetchPage(`/verifications/${id}/artifacts`, "Failed to load artifacts", cursor)
 }
 
 export async function uploadArtifact(id: string, file: File) {
@@ -151,10 +168,8 @@ export async function fetchAuditEvents(id: string) {
 }
 
 // Cases (multi-workflow)
-export async function fetchCases(params = "") {
-  const res = await apiFetch(`/cases${params}`)
-  if (!res.ok) throw new Error("Failed to load cases")
-  return res.json()
+export async function fetchCases(params = "", cursor?: string | null) {
+  return fetchPage(`/cases${params}`, "Failed to load cases", cursor)
 }
 
 export async function createCase(payload: any) {
@@ -168,10 +183,8 @@ export async function createCase(payload: any) {
 }
 
 // Intake
-export async function fetchIntakeItems(params = "") {
-  const res = await apiFetch(`/intake${params}`)
-  if (!res.ok) throw new Error("Failed to load intake items")
-  return res.json()
+export async function fetchIntakeItems(params = "", cursor?: string | null) {
+  return fetchPage(`/intake${params}`, "Failed to load intake items", cursor)
 }
 
 export async function createIntakeText(payload: { text_content: string; source?: string; case_id?: string; filename?: string }) {
@@ -217,10 +230,8 @@ export async function triggerIntakeClassify(id: string) {
 }
 
 // Prior Auth
-export async function fetchPriorAuths() {
-  const res = await apiFetch(`/prior-auth/`)
-  if (!res.ok) throw new Error("Failed to load prior auths")
-  return res.json()
+export async function fetchPriorAuths(params = "", cursor?: string | null) {
+  return fetchPage(`/prior-auth/${params}`, "Failed to load prior auths", cursor)
 }
 
 export async function createPriorAuth(payload: any) {
@@ -240,10 +251,8 @@ export async function runPriorAuth(id: string) {
 }
 
 // Referrals
-export async function fetchReferrals() {
-  const res = await apiFetch(`/referrals/`)
-  if (!res.ok) throw new Error("Failed to load referrals")
-  return res.json()
+export async function fetchReferrals(params = "", cursor?: string | null) {
+  return fetchPage(`/referrals/${params}`, "Failed to load referrals", cursor)
 }
 
 export async function createReferral(payload: any) {
@@ -0,0 +1,30 @@
+import { useState } from "react"
+import type { Page } from "./api"
+
+// Rows fetched so far plus the cursor for the next page; reload() starts over.
+export function usePagedList<T = any>(fetchPage: (cursor?: string | null) => Promise<Page<T>>) {
+  const [items, setItems] = useState<T[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+
+  const reload = async () => {
+    const page = await fetchPage()
+    setItems(page.items)
+    setNextCursor(page.nextCursor)
+    return page
+  }
+
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return
+    setLoadingMore(true)
+    try {
+      const page = await fetchPage(nextCursor)
+      setItems((prev) => [...prev, ...page.items])
+      setNextCursor(page.nextCursor)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
+  return { items, hasMore: nextCursor !== null, loadingMore, reload, loadMore }
+}
@@ -1,25 +1,25 @@
 import { useEffect, useState } from "react"
 import Link from "next/link"
 import { createCase, fetchCases, createIntakeText, uploadIntakeFile, fetchIntakeItems, updateIntakeItem } from "../../lib/api"
+import { usePagedList } from "../../lib/usePagedList"
 
 const emptyCase = { type: "intake", status: "pending", title: "", summary: "" }
 
 export default function CasesPage() {
-  const [cases, setCases] = useState<any[]>([])
-  const [intakeItems, setIntakeItems] = useState<any[]>([])
   const [form, setForm] = useState({ ...emptyCase })
   const [caseIdForIntake, setCaseIdForIntake] = useState<string>("")
   const [intakeText, setIntakeText] = useState("")
   const [loading, setLoading] = useState(true)
+  const casePages = usePagedList((cursor) => fetchCases("", cursor))
+  const intakePages = usePagedList((cursor) =>
+    fetchIntakeItems(caseIdForIntake ? `?case_id=${caseIdForIntake}` : "", cursor)
+  )
+  const cases = casePages.items
+  const intakeItems = intakePages.items
 
   const load = async () => {
     setLoading(true)
-    const [caseData, intakeData] = await Promise.all([
-      fetchCases(""),
-      fetchIntakeItems(caseIdForIntake ? `?case_id=${caseIdForIntake}` : ""),
-    ])
-    setCases(caseData)
-    setIntakeItems(intakeData)
+    await Promise.all([casePages.reload(), intakePages.reload()])
     setLoading(false)
   }
 
@@ -153,6 +153,11 @@ export default function CasesPage() {
             </tbody>
           </table>
         )}
+        {!loading && intakePages.hasMore && (
+          <button className="ghost" style={{ marginTop: 12 }} disabled={intakePages.loadingMore} onClick={intakePages.loadMore}>
+            {intakePages.loadingMore ? "Loading..." : "Load more"}
+          </button>
+        )}
       </section>
 
       <section className="card">
@@ -181,6 +186,11 @@ export default function CasesPage() {
             </tbody>
           </table>
         )}
+        {!loading && casePages.hasMore && (
+          <button className="ghost" style={{ marginTop: 12 }} disabled={casePages.loadingMore} onClick={casePages.loadMore}>
+            {casePages.loadingMore ? "Loading..." : "Load more"}
+          </button>
+        )}
       </section>
     </main>
   )
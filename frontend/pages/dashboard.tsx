@@ -1,11 +1,15 @@
 import { useEffect, useState } from "react"
-import { fetchWorklist, fetchPriorAuths, fetchReferrals, fetchIntakeItems } from "../lib/api"
+import { fetchWorklist, fetchPriorAuths, fetchReferrals, fetchIntakeItems, Page } from "../lib/api"
 import { MetricCard, GlassCard } from "../components/ModernUI"
 import { FileCheck, Clock, Activity, CheckCircle2, TrendingUp, Zap, ArrowRight, Inbox, Users } from "lucide-react"
 import Link from "next/link"
 
+// Planner estimate when the API sends one; otherwise what the first page shows.
+const countOf = (page: Page) =>
+    page.totalEstimate ?? (page.nextCursor ? `${page.items.length}+` : page.items.length)
+
 export default function Dashboard() {
-    const [stats, setStats] = useState({
+    const [stats, setStats] = useState<Record<string, number | string>>({
         verifications: 0,
         pa: 0,
         referrals: 0,
@@ -18,15 +22,15 @@ export default function Dashboard() {
             try {
                 const [v, p, r, i] = await Promise.all([
                     fetchWorklist(),
-                    fetchPriorAuths(),
-                    fetchReferrals(),
-                    fetchIntakeItems()
+                    fetchPriorAuths("?fields=id"),
+                    fetchReferrals("?fields=id"),
+                    fetchIntakeItems("?status=pending&fields=id")
                 ])
                 setStats({
                     verifications: v.length,
-                    pa: p.length,
-                    referrals: r.length,
-                    intake: i.filter((x: any) => x.status === "pending").length
+                    pa: countOf(p),
+                    referrals: countOf(r),
+                    intake: countOf(i)
                 })
             } catch (e) {
                 console.error(e)
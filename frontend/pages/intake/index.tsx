@@ -1,13 +1,15 @@
 import { useEffect, useState, useRef } from "react"
 import { fetchIntakeItems, uploadIntakeFile, triggerIntakeClassify, bridgeIntakeToCase } from "../../lib/api"
-import { StatusBadge, GlassCard } from "../../components/ModernUI"
+import { StatusBadge, GlassCard, LoadMoreButton } from "../../components/ModernUI"
 import { Inbox, Zap, ArrowRight, RefreshCw, FileText, Search, ExternalLink, CheckCircle2, Upload } from "lucide-react"
 import { cn } from "../../lib/utils"
+import { usePagedList } from "../../lib/usePagedList"
 import { useRouter } from "next/router"
 import { toast } from "sonner"
 
 export default function IntakePage() {
-    const [items, setItems] = useState<any[]>([])
+    const pages = usePagedList((cursor) => fetchIntakeItems("", cursor))
+    const items = pages.items
     const [loading, setLoading] = useState(true)
     const [isSimulating, setIsSimulating] = useState(false)
     const router = useRouter()
@@ -16,8 +18,7 @@ export default function IntakePage() {
     const loadData = async () => {
         setLoading(true)
         try {
-            const data = await fetchIntakeItems()
-            setItems(data)
+            await pages.reload()
         } catch (e) {
             console.error(e)
         } finally {
@@ -246,6 +247,7 @@ export default function IntakePage() {
                         ))}
                     </tbody>
                 </table>
+                <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={pages.loadMore} className="pb-4" />
             </GlassCard>
         </div>
     )
@@ -2,13 +2,15 @@ import { useEffect, useState } from "react"
 import { useRouter } from "next/router"
 import { fetchPriorAuths, createPriorAuth, runPriorAuth, fetchWorklist } from "../../lib/api"
 import { validatePriorAuthForm, getFieldError, ValidationError } from "../../lib/validation"
-import { StatusBadge, GlassCard } from "../../components/ModernUI"
+import { StatusBadge, GlassCard, LoadMoreButton } from "../../components/ModernUI"
+import { usePagedList } from "../../lib/usePagedList"
 import { FileCheck, Activity, Zap, Plus, X, ArrowRight, ClipboardCheck, Pill, Hash } from "lucide-react"
 import { toast } from "sonner"
 
 export default function PriorAuthPage() {
     const router = useRouter()
-    const [items, setItems] = useState<any[]>([])
+    const pages = usePagedList((cursor) => fetchPriorAuths("", cursor))
+    const items = pages.items
     const [loading, setLoading] = useState(true)
     const [verifications, setVerifications] = useState<any[]>([])
     const [showCreate, setShowCreate] = useState(false)
@@ -18,8 +20,7 @@ export default function PriorAuthPage() {
     const loadData = async () => {
         setLoading(true)
         try {
-            const [paData, vData] = await Promise.all([fetchPriorAuths(), fetchWorklist()])
-            setItems(paData)
+            const [, vData] = await Promise.all([pages.reload(), fetchWorklist()])
             setVerifications(vData)
         } catch (e) {
             console.error(e)
@@ -214,6 +215,7 @@ export default function PriorAuthPage() {
                         ))}
                     </tbody>
                 </table>
+                <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={pages.loadMore} className="pb-4" />
             </GlassCard>
         </div>
     )
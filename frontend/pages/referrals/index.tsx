@@ -1,13 +1,15 @@
 import { useEffect, useState } from "react"
 import { fetchReferrals, createReferral, runReferral, updateReferral } from "../../lib/api"
 import { validateReferralForm, getFieldError, ValidationError } from "../../lib/validation"
-import { StatusBadge, GlassCard } from "../../components/ModernUI"
+import { StatusBadge, GlassCard, LoadMoreButton } from "../../components/ModernUI"
+import { usePagedList } from "../../lib/usePagedList"
 import { Users, UserPlus, Zap, ArrowRight, X, Phone, Mail, MapPin, Search, RefreshCw, Calendar } from "lucide-react"
 import { cn } from "../../lib/utils"
 import { toast } from "sonner"
 
 export default function ReferralsPage() {
-    const [items, setItems] = useState<any[]>([])
+    const pages = usePagedList((cursor) => fetchReferrals("", cursor))
+    const items = pages.items
     const [loading, setLoading] = useState(true)
     const [showCreate, setShowCreate] = useState(false)
     const [newRef, setNewRef] = useState({ patient_name: "", referring_provider: "", target_specialty: "", clinical_urgency: "routine" })
@@ -37,8 +39,7 @@ export default function ReferralsPage() {
     const loadData = async () => {
         setLoading(true)
         try {
-            const data = await fetchReferrals()
-            setItems(data)
+            await pages.reload()
         } catch (e) {
             console.error(e)
         } finally {
@@ -258,6 +259,7 @@ export default function ReferralsPage() {
                         ))}
                     </tbody>
                 </table>
+                <LoadMoreButton hasMore={pages.hasMore} loading={pages.loadingMore} onClick={pages.loadMore} className="pb-4" />
             </GlassCard>
 
 
@@ -13,7 +13,8 @@ import {
   uploadArtifact,
 } from "../../lib/api"
 import { cn } from "../../lib/utils"
-import { StatusBadge, GlassCard } from "../../components/ModernUI"
+import { StatusBadge, GlassCard, LoadMoreButton } from "../../components/ModernUI"
+import { usePagedList } from "../../lib/usePagedList"
 import {
   ChevronLeft, Zap, CheckCircle2, FileText, ClipboardList,
   History, ShieldAlert, Upload, Plus, Download, ArrowRight,
@@ -33,7 +34,6 @@ export default function VerificationDetailPage() {
   const { id } = router.query
   const [activeTab, setActiveTab] = useState("decision")
   const [verification, setVerification] = useState<any | null>(null)
-  const [artifacts, setArtifacts] = useState<any[]>([])
   const [summary, setSummary] = useState<any | null>(null)
   const [auditEvents, setAuditEvents] = useState<any[]>([])
   const [reportUrl, setReportUrl] = useState<string | null>(null)
@@ -45,19 +45,20 @@ export default function VerificationDetailPage() {
   >({})
 
   const verificationId = useMemo(() => (typeof id === "string" ? id : ""), [id])
+  const artifactPages = usePagedList((cursor) => fetchArtifacts(verificationId, cursor))
+  const artifacts = artifactPages.items
 
   const loadAll = async () => {
     if (!verificationId) return
     setLoading(true)
     try {
-      const [verificationData, artifactData, summaryData, auditData] = await Promise.all([
+      const [verificationData, , summaryData, auditData] = await Promise.all([
         fetchVerification(verificationId),
-        fetchArtifacts(verificationId),
+        artifactPages.reload(),
         fetchSummary(verificationId),
         fetchAuditEvents(verificationId),
       ])
       setVerification(verificationData)
-      setArtifacts(artifactData)
       setSummary(summaryData)
       setAuditEvents(auditData)
 
@@ -198,6 +199,11 @@ export default function VerificationDetailPage() {
             </div>
             <h1 className="text-4xl font-bold text-slate-900 tracking-tight font-display">{verification.patient_info?.patient_name}</h1>
             <p className="text-slate-500 font-medium">{verification.payer_name} · {verification.service_category}</p>
+            {verification.eligibility_from_cache && verification.eligibility_fetched_at && (
+              <p className="text-[10px] font-bold text-amber-600 uppercase tracking-widest mt-1">
+                Cached payer response · fetched {new Date(verification.eligibility_fetched_at).toLocaleString()}
+              </p>
+            )}
           </div>
         </div>
         <div className="flex items-center gap-4">
@@ -475,6 +481,7 @@ export default function VerificationDetailPage() {
                       ))
                     )}
                   </div>
+                  <LoadMoreButton hasMore={artifactPages.hasMore} loading={artifactPages.loadingMore} onClick={artifactPages.loadMore} />
                 </GlassCard>
               </div>
             )}